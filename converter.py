@@ -6,14 +6,24 @@ from openai import OpenAI
 from dotenv import load_dotenv
 import re
 
+from converters.response_cache import get_response_cache, make_cache_key
+from converters.resilience import ProviderHealth, is_failover_error
+
+# Bump when the prompts below change so cached responses are not reused
+PROMPT_VERSION = '1'
+ANTHROPIC_MODEL = "claude-3-opus-20240229"
+OPENAI_MODEL = "gpt-4o"
+PROVIDER_NAMES = {'anthropic': 'Anthropic', 'openai': 'OpenAI'}
+PROVIDER_MODELS = {'anthropic': ANTHROPIC_MODEL, 'openai': OPENAI_MODEL}
+
 class NewsConverter:
-    def __init__(self, api_provider='anthropic'):
+    def __init__(self, api_provider='anthropic', hedge=None):
         load_dotenv()
         self.api_provider = api_provider.lower()
         self.anthropic_client = None
         self.openai_client = None
         
-        if self.api_provider == 'anthropic':
+        if self.api_provider == 'anthropic' or os.getenv('ANTHROPIC_API_KEY'):
             self.anthropic_client = anthropic.Anthropic(
                 api_key=os.getenv('ANTHROPIC_API_KEY')
             )
@@ -23,6 +33,19 @@ class NewsConverter:
             )
         self.output_dir = Path('converted_articles')
         self.output_dir.mkdir(exist_ok=True)
+        self.response_cache = get_response_cache()
+        
+        # Per-provider circuit breakers; with hedging, the fallback provider is also
+        # called once the primary runs past its rolling p95 latency (LLM_HEDGE=1).
+        # Key/model errors (401/403/404/429) also fail over, but only outages trip the breakers
+        if hedge is None:
+            hedge = os.getenv('LLM_HEDGE', '').lower() in ('1', 'true', 'yes')
+        self.provider_health = ProviderHealth(
+            ['anthropic', 'openai'],
+            hedge=hedge,
+            default_hedge_delay=float(os.getenv('LLM_HEDGE_DELAY', 15)),
+            failover=is_failover_error
+        )
 
     def read_txt_file(self, file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -55,45 +78,56 @@ class NewsConverter:
         text = text.replace('\\n', '\n')
         return text.strip()
 
+    def _cache_key(self, provider, prompt, max_tokens, temperature):
+        """Response cache key for the provider (and its model) that answers the prompt"""
+        return make_cache_key(
+            provider, PROVIDER_MODELS[provider], PROMPT_VERSION,
+            {'max_tokens': max_tokens, 'temperature': temperature}, prompt
+        )
+
     def call_api(self, prompt, max_tokens=2000, temperature=0):
-        """Call the appropriate API based on provider, fallback to OpenAI if Anthropic fails"""
-        # Try Anthropic first if selected
-        if self.api_provider == 'anthropic' and self.anthropic_client:
-            try:
-                message = self.anthropic_client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                )
-                print("[INFO] Used Anthropic API.")
-                return message.content[0]
-            except Exception as e:
-                print(f"[WARN] Anthropic API failed: {e}\nFalling back to OpenAI API...")
-                if not self.openai_client:
-                    raise RuntimeError("OpenAI API key not set. Cannot fallback.")
-                # Fallback to OpenAI
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                )
-                print("[INFO] Used OpenAI API (fallback).")
-                return response.choices[0].message.content
-        elif self.api_provider == 'openai' and self.openai_client:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
+        """Call the API, serving repeated prompts from the response cache"""
+        cached = self.response_cache.get(self._cache_key(self.api_provider, prompt, max_tokens, temperature))
+        if cached is not None:
+            print("[INFO] Used cached response.")
+            return cached
+        
+        provider, response = self._call_provider(prompt, max_tokens, temperature)
+        response = str(response)
+        # Cache under the provider that actually answered, so a fallback response is
+        # never served later as if the primary model had produced it
+        self.response_cache.set(self._cache_key(provider, prompt, max_tokens, temperature), response)
+        return response
+
+    def _call_provider(self, prompt, max_tokens=2000, temperature=0):
+        """
+        Call the selected provider, failing over to the other one when it is unhealthy
+        or rejects the request (bad key, retired model, rate limit)
+
+        Returns (provider that answered, response).
+        """
+        clients = {'anthropic': self.anthropic_client, 'openai': self.openai_client}
+        order = [self.api_provider] + [p for p in ('anthropic', 'openai') if p != self.api_provider]
+        candidates = [
+            (provider, lambda provider=provider: self._request(provider, prompt, max_tokens, temperature))
+            for provider in order if clients.get(provider)
+        ]
+        if not candidates:
+            raise RuntimeError("No valid API client available.")
+        
+        provider, response = self.provider_health.call(candidates)
+        name = PROVIDER_NAMES[provider]
+        if provider == self.api_provider:
+            print(f"[INFO] Used {name} API.")
+        else:
+            print(f"[INFO] Used {name} API (fallback).")
+        return provider, response
+
+    def _request(self, provider, prompt, max_tokens, temperature):
+        """Send one request to the given provider"""
+        if provider == 'anthropic':
+            message = self.anthropic_client.messages.create(
+                model=ANTHROPIC_MODEL,
                 max_tokens=max_tokens,
                 temperature=temperature,
                 messages=[
@@ -103,10 +137,20 @@ class NewsConverter:
                     }
                 ]
             )
-            print("[INFO] Used OpenAI API.")
-            return response.choices[0].message.content
-        else:
-            raise RuntimeError("No valid API client available.")
+            return message.content[0]
+        
+        response = self.openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        )
+        return response.choices[0].message.content
 
     def extract_keywords(self, content):
         """Extract keywords from content using selected API"""
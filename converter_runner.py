@@ -17,6 +17,8 @@ current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 from converters.factory import create_converter, print_converter_status, get_available_converters
+from converters.batch import BatchRunner, create_batch_transport
+from converters.llm_converter import LLMConverter
 
 
 def setup_directories():
@@ -51,7 +53,7 @@ def find_txt_files(path: str) -> List[Path]:
             return []
     
     elif path_obj.is_dir():
-        txt_files = list(path_obj.glob('*.txt'))
+        txt_files = sorted(path_obj.glob('*.txt'))
         if not txt_files:
             print(f"❌ {path} 디렉토리에서 TXT 파일을 찾을 수 없습니다.")
         return txt_files
@@ -61,7 +63,9 @@ def find_txt_files(path: str) -> List[Path]:
         return []
 
 
-def convert_files(input_path: str, converter_type: Optional[str] = None, output_dir: str = 'converted_articles'):
+def convert_files(input_path: str, converter_type: Optional[str] = None, output_dir: str = 'converted_articles',
+                  workers: int = 1, batch: bool = False, batch_base_url: Optional[str] = None,
+                  poll_interval: float = 30.0):
     """
     파일 변환 실행
     
@@ -69,6 +73,10 @@ def convert_files(input_path: str, converter_type: Optional[str] = None, output_
         input_path: 입력 파일 또는 디렉토리 경로
         converter_type: 변환기 타입 ('anthropic', 'openai', 'local', None)
         output_dir: 출력 디렉토리
+        workers: 동시에 변환할 최대 파일 수
+        batch: 배치 API로 한 번에 제출할지 여부 (API 변환기에서만 사용)
+        batch_base_url: 배치 API 기본 URL (로컬 대역 서버 테스트용)
+        poll_interval: 배치 상태 조회 간격 (초)
     """
     print(f"🔄 변환 시작: {input_path}")
     
@@ -86,24 +94,61 @@ def convert_files(input_path: str, converter_type: Optional[str] = None, output_
         print(f"❌ 변환기 생성 실패: {str(e)}")
         return
     
-    # 파일별 변환 실행
-    success_count = 0
-    error_count = 0
+    file_paths = [str(txt_file) for txt_file in txt_files]
     
-    for txt_file in txt_files:
-        try:
-            print(f"\n🔄 처리 중: {txt_file.name}")
-            converter.process_file(str(txt_file))
-            success_count += 1
-        except Exception as e:
-            print(f"❌ 변환 실패 ({txt_file.name}): {str(e)}")
-            error_count += 1
+    if batch and not isinstance(converter, LLMConverter):
+        print("⚠️  배치 모드는 API 변환기에서만 지원되어 일반 모드로 변환합니다.")
+        batch = False
+    
+    if batch:
+        # 배치 API로 일괄 제출 (실패 항목만 재제출)
+        runner = BatchRunner(
+            converter,
+            create_batch_transport(converter, batch_base_url),
+            poll_interval=poll_interval
+        )
+        results = runner.run(file_paths)
+    else:
+        # 파일별 변환 실행 (파일별 오류는 격리되어 None으로 반환됨)
+        results = converter.process_files(file_paths, workers)
+    
+    success_count = sum(1 for result in results if result is not None)
+    error_count = len(results) - success_count
     
     # 결과 요약
     print(f"\n✅ 변환 완료!")
     print(f"   성공: {success_count}개")
     print(f"   실패: {error_count}개")
     print(f"   출력 디렉토리: {output_dir}")
+    
+    response_cache = getattr(converter, 'response_cache', None)
+    if response_cache is not None:
+        stats = response_cache.stats()
+        print(f"   응답 캐시: 히트 {stats['memory_hits'] + stats['disk_hits']}회, "
+              f"미스 {stats['misses']}회 (히트율 {stats['hit_rate']:.0%})")
+
+    usage_stats = getattr(converter, 'usage_stats', None)
+    if usage_stats is not None:
+        usage = usage_stats()
+        print(f"   토큰 사용량: 입력 {usage['input_tokens']:,} / 출력 {usage['output_tokens']:,} "
+              f"(프롬프트 캐시 읽기 {usage['cache_read_tokens']:,}, "
+              f"쓰기 {usage['cache_creation_tokens']:,}, "
+              f"캐시 비율 {usage['cache_read_ratio']:.0%})")
+        print(f"   입력 토큰 로컬 계산: {usage['estimated_input_tokens']:,}")
+        if usage['truncated_articles']:
+            print(f"   입력 한도로 잘린 기사: {usage['truncated_articles']}개 "
+                  f"({usage['truncated_tokens']:,} 토큰 제외)")
+        if usage['compressed_articles']:
+            print(f"   본문 추출 압축: {usage['compressed_articles']}개 "
+                  f"(입력 {usage['compression_saved_tokens']:,} 토큰 절감)")
+    
+    concurrency = getattr(converter, 'concurrency', None)
+    if concurrency is not None:
+        stats = concurrency.stats()
+        print(f"   동시 요청 한도: {stats['limit']} (요청 한도 오류 {stats['rate_limited']}회, "
+              f"재시도 {stats['retries']}회)")
+    
+    converter.close()
 
 
 def interactive_mode():
@@ -185,6 +230,9 @@ def main():
   python converter_runner.py -t anthropic article.txt  # Anthropic API 사용
   python converter_runner.py -t openai article.txt     # OpenAI API 사용
   python converter_runner.py -t local article.txt      # 로컬 변환기 사용
+  python converter_runner.py -w 8 extracted_articles/  # 8개 파일 동시 변환
+  python converter_runner.py -t anthropic --batch extracted_articles/  # 배치 API로 일괄 변환
+  python converter_runner.py --no-reuse extracted_articles/  # 유사 기사 결과 재사용 없이 변환
   python converter_runner.py --status                  # 변환기 상태 확인
         """
     )
@@ -207,6 +255,37 @@ def main():
         help='출력 디렉토리 (기본값: converted_articles)'
     )
     
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='동시에 변환할 최대 파일 수 (기본값: 1)'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='배치 API로 일괄 제출 (지연 대신 비용/처리량 우선, API 변환기 전용)'
+    )
+    
+    parser.add_argument(
+        '--batch-base-url',
+        help='배치 API 기본 URL (로컬 대역 서버 테스트용)'
+    )
+    
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=30.0,
+        help='배치 상태 조회 간격 초 (기본값: 30)'
+    )
+    
+    parser.add_argument(
+        '--no-reuse',
+        action='store_true',
+        help='유사 기사 변환 결과를 재사용하지 않고 모두 다시 변환 (DUPLICATE_INDEX=off와 같음)'
+    )
+    
     parser.add_argument(
         '--status',
         action='store_true',
@@ -221,6 +300,10 @@ def main():
     
     args = parser.parse_args()
     
+    # 중복 인덱스 끄기 (변환기 생성 전에 설정)
+    if args.no_reuse:
+        os.environ['DUPLICATE_INDEX'] = 'off'
+    
     # 상태 확인만 하고 종료
     if args.status:
         print_converter_status()
@@ -232,7 +315,8 @@ def main():
         return
     
     # 직접 변환 모드
-    convert_files(args.input_path, args.type, args.output)
+    convert_files(args.input_path, args.type, args.output, args.workers,
+                  args.batch, args.batch_base_url, args.poll_interval)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,185 @@
+"""
+기사 분석 결과 공유
+
+한 기사의 정제 본문, 소문자 텍스트, 단어와 단어 빈도, 문장, 토픽 점수, 언급된 상장사를
+처음 필요할 때 한 번만 계산해 두고, 변환기의 보조 메서드(clean_content, detect_topic,
+extract_keywords, 핵심 문장 추출, format_stock_symbols)가 같은 결과를 함께 씁니다.
+"""
+
+import re
+from collections import Counter
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from text_utils.keyword_matcher import KeywordMatcher
+
+if TYPE_CHECKING:
+    from .base_converter import BaseConverter
+
+# 문장 구분자
+_SENTENCE_DELIMITERS = re.compile(r'[.!?。]+')
+# 키워드 추출 전처리 (영문/숫자/한글/공백 이외 문자 제거)
+_NON_KEYWORD_CHARS = re.compile(r'[^\w\s가-힣]')
+# 여러 단어 키워드를 한 단어로 이을 때 쓰는 문자 ('artificial intelligence' → 'artificial_intelligence')
+PHRASE_JOINER = '_'
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    텍스트를 문장으로 분리 (10자 이하 문장 제외)
+
+    Args:
+        text: 분리할 텍스트
+
+    Returns:
+        문장 리스트
+    """
+    sentences = []
+    for sentence in _SENTENCE_DELIMITERS.split(text):
+        sentence = sentence.strip()
+        if len(sentence) > 10:
+            sentences.append(sentence)
+    return sentences
+
+
+def join_phrases(text: str, phrases: Optional[KeywordMatcher]) -> str:
+    """
+    여러 단어 키워드를 PHRASE_JOINER로 이어 한 단어로 만듦 (공백 단위 토큰화 전에 사용)
+
+    Args:
+        text: 소문자로 바꾼 텍스트
+        phrases: 여러 단어 키워드 사전
+
+    Returns:
+        키워드가 한 단어로 이어진 텍스트
+    """
+    if not phrases:
+        return text
+    return phrases.sub(text, lambda _, keyword: keyword.replace(' ', PHRASE_JOINER))
+
+
+def keyword_tokens(text: str, phrases: Optional[KeywordMatcher] = None) -> List[str]:
+    """
+    키워드 추출용 단어 리스트 (소문자, 특수문자 제거, 공백 단위)
+
+    Args:
+        text: 분석할 텍스트
+        phrases: 한 단어로 볼 여러 단어 키워드 사전
+
+    Returns:
+        단어 리스트
+    """
+    return join_phrases(_NON_KEYWORD_CHARS.sub(' ', text.lower()), phrases).split()
+
+
+def score_topics(text: str, topic_keywords: Dict[str, List[str]],
+                 matcher: KeywordMatcher) -> Dict[str, int]:
+    """
+    토픽별 키워드 등장 횟수 (단어 경계 기준, 사전 전체를 한 번에 탐색)
+
+    Args:
+        text: 분석할 텍스트
+        topic_keywords: 토픽 → 키워드 리스트
+        matcher: topic_keywords의 모든 키워드로 만든 사전
+
+    Returns:
+        토픽 → 점수 딕셔너리
+    """
+    counts = matcher.counts(text)
+    return {
+        topic: sum(counts[keyword.lower()] for keyword in keywords)
+        for topic, keywords in topic_keywords.items()
+    }
+
+
+def pick_topic(scores: Dict[str, int]) -> str:
+    """점수가 가장 높은 토픽 (모두 0이면 'default', 같은 점수는 앞 토픽 우선)"""
+    if not any(scores.values()):
+        return 'default'
+    return max(scores.items(), key=lambda x: x[1])[0]
+
+
+class ArticleAnalysis:
+    """
+    기사 하나의 분석 결과 (각 항목은 처음 접근할 때 한 번만 계산)
+
+    BaseConverter.analyze로 만들며, 필요한 항목만 계산하므로 정제 본문만 쓰는
+    API 변환기와 모든 항목을 쓰는 로컬 변환기가 같은 객체를 씁니다.
+    """
+
+    def __init__(self, data: Dict[str, str], converter: 'BaseConverter',
+                 cleaned: Optional[str] = None):
+        """
+        Args:
+            data: 구조화된 뉴스 데이터 (title, description, content)
+            converter: 정제 함수와 토픽/회사명/키워드 사전을 제공하는 변환기
+            cleaned: 이미 정제한 본문 (있으면 clean_content를 호출하지 않음)
+        """
+        self.title = data['title']
+        self.description = data['description']
+        self.content = data['content']
+        self._converter = converter
+        if cleaned is not None:
+            self.__dict__['cleaned'] = cleaned
+
+    @cached_property
+    def cleaned(self) -> str:
+        """기자 정보, 메타데이터, 중복 문단을 제거한 본문"""
+        return self._converter.clean_content(self.content)
+
+    @cached_property
+    def cleaned_lower(self) -> str:
+        """소문자로 바꾼 정제 본문"""
+        return self.cleaned.lower()
+
+    @cached_property
+    def text_lower(self) -> str:
+        """소문자로 바꾼 제목, 설명, 정제 본문 (토픽 감지용)"""
+        return f"{self.title.lower()} {self.description.lower()} {self.cleaned_lower}"
+
+    @cached_property
+    def content_terms(self) -> Counter:
+        """정제 본문의 공백 단위 단어 빈도 (소문자)"""
+        return Counter(self.cleaned_lower.split())
+
+    @cached_property
+    def keyword_tokens(self) -> List[str]:
+        """제목, 설명, 원본 본문의 키워드 추출용 단어"""
+        return keyword_tokens(f"{self.title}\n{self.description}\n{self.content}",
+                              self._converter.keyword_phrases)
+
+    @cached_property
+    def keyword_terms(self) -> Counter:
+        """키워드 추출용 단어 빈도 (처음 등장한 순서 유지)"""
+        return Counter(self.keyword_tokens)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """정제 본문의 문장"""
+        return split_sentences(self.cleaned)
+
+    @cached_property
+    def sentences_lower(self) -> List[str]:
+        """소문자로 바꾼 문장"""
+        return [sentence.lower() for sentence in self.sentences]
+
+    @cached_property
+    def sentence_tokens(self) -> List[List[str]]:
+        """문장별 공백 단위 단어 (소문자)"""
+        return [sentence.split() for sentence in self.sentences_lower]
+
+    @cached_property
+    def topic_scores(self) -> Dict[str, int]:
+        """토픽별 키워드 등장 횟수"""
+        return score_topics(self.text_lower, self._converter.topic_keywords,
+                            self._converter.topic_matcher)
+
+    @cached_property
+    def topic(self) -> str:
+        """감지된 토픽"""
+        return pick_topic(self.topic_scores)
+
+    @cached_property
+    def tickers(self) -> List[str]:
+        """정제 본문에 언급된 회사의 주식 심볼 (처음 언급된 순서)"""
+        return self._converter.ticker_linker.mentions(self.cleaned)
@@ -6,16 +6,41 @@
 
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
+from tqdm import tqdm
+
+from text_utils.keyword_matcher import KeywordMatcher
+from text_utils.simhash import dedupe_near_duplicates, simhash_many, DEFAULT_MAX_DISTANCE
+from text_utils.ticker_linker import TickerLinker
+from .analysis import ArticleAnalysis, pick_topic, score_topics
+from .duplicate_index import DuplicateIndex
+
+# 실제 제목이 아닌 줄 (저자, 날짜, 읽기 시간, 광고 위젯)
+_NON_TITLE_LINES = KeywordMatcher(['sarah e.', 'fri,', 'min read', 'by taboola'])
+
+# 본문에서 제거할 메타데이터 줄 (시세 심볼 조각 등이 단어 안에 붙어 나오므로 단어 경계 없이 매칭)
+_UNWANTED_LINES = KeywordMatcher([
+    'usd=x', '^spx', 'terms and privacy', 'privacy dashboard',
+    'fri,', 'min read', 'in this article', 'reporting by', 'editing by',
+    'subscribe', 'newsletter', 'follow us', 'download app'
+], word_boundary=False)
 
 
 class BaseConverter(ABC):
     """뉴스 변환기 베이스 클래스"""
     
+    # 이미 변환된 유사 기사 결과를 재사용할지 여부 (API 비용이 드는 변환기에서 사용)
+    use_duplicate_index = False
+    
+    # 프롬프트 템플릿 버전 (프롬프트를 바꾸면 올려서 이전 응답 캐시를 무효화)
+    prompt_version = '1'
+    
     def __init__(self, output_dir: str = 'data/generated'):
         """
         베이스 변환기 초기화
@@ -29,6 +54,17 @@ class BaseConverter(ABC):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # 유사 중복 문단 판정 해밍 거리 (0이면 정규화 후 일치만, None이면 SimHash 없이 똑같은 문단만 제거)
+        self.near_duplicate_distance: Optional[int] = DEFAULT_MAX_DISTANCE
+        
+        # 기사 간 유사 중복 인덱스 (통신사 기사 재변환 방지, DUPLICATE_INDEX=off로 끔)
+        self.duplicate_index: Optional[DuplicateIndex] = None
+        if (self.use_duplicate_index
+                and os.getenv('DUPLICATE_INDEX', 'on').lower() not in ('off', '0', 'false', 'no')):
+            self.duplicate_index = DuplicateIndex(
+                os.getenv('DUPLICATE_INDEX_PATH', 'data/duplicate_index.db')
+            )
+        
         # 공통 이모지 매핑
         self.emoji_mapping = {
             'market': '📈',
@@ -42,20 +78,28 @@ class BaseConverter(ABC):
             'default': '📰'
         }
         
-        # 주식 심볼 매핑
-        self.company_symbols = {
-            'Apple': 'AAPL',
-            'Microsoft': 'MSFT',
-            'Amazon': 'AMZN',
-            'Google': 'GOOGL',
-            'Tesla': 'TSLA',
-            'Meta': 'META',
-            'Netflix': 'NFLX',
-            'Nvidia': 'NVDA',
-            'Samsung': '005930',
-            'SK하이닉스': '000660',
-            'LG전자': '066570'
+        # 토픽 감지 키워드
+        self.topic_keywords = {
+            'market': ['market', 'stock', 'trading', 'index', 'equity', 'shares', '주식', '증시', '시장'],
+            'finance': ['bank', 'finance', 'investment', 'fund', 'money', 'dollar', '은행', '투자', '자금'],
+            'tech': ['technology', 'tech', 'ai', 'digital', 'software', 'innovation', '기술', '혁신', '소프트웨어'],
+            'policy': ['policy', 'regulation', 'law', 'government', 'bill', 'tax', '정책', '규제', '법률'],
+            'trade': ['trade', 'tariff', 'export', 'import', 'deal', 'agreement', '무역', '수출', '수입'],
+            'energy': ['oil', 'gas', 'energy', 'fuel', 'crude', 'petroleum', '에너지', '석유', '가스']
         }
+        self.topic_matcher = KeywordMatcher(
+            [keyword for keywords in self.topic_keywords.values() for keyword in keywords],
+            plurals=True
+        )
+        
+        # 한 단어로 볼 여러 단어 키워드 (키워드 추출을 쓰는 변환기에서 설정)
+        self.keyword_phrases: Optional[KeywordMatcher] = None
+        
+        # 스레드별 마지막 기사 분석 결과 (prepare_file과 변환 단계가 같은 분석을 재사용)
+        self._analysis_cache = threading.local()
+        
+        # 회사명 → 주식 심볼 연결기 (함께 배포되는 상장사 표, 프로세스에서 한 번만 불러옴)
+        self.ticker_linker = TickerLinker.default()
         
     def read_txt_file(self, file_path: str) -> Dict[str, str]:
         """
@@ -95,7 +139,7 @@ class BaseConverter(ABC):
                 real_title = ""
                 for line in lines[:5]:  # 처음 5줄만 확인
                     line = line.strip()
-                    if line and len(line) > 20 and not any(skip in line.lower() for skip in ['sarah e.', 'fri,', 'min read', 'by taboola']):
+                    if line and len(line) > 20 and not _NON_TITLE_LINES.search(line):
                         real_title = line
                         break
                 
@@ -122,31 +166,93 @@ class BaseConverter(ABC):
         Returns:
             정리된 내용
         """
+        filtered_lines = self._filter_lines(content)
+        
+        # 중복 제거 (조금씩 다른 반복 문단 포함)
+        if self.near_duplicate_distance is None:
+            unique_lines = list(dict.fromkeys(filtered_lines))
+        else:
+            unique_lines = dedupe_near_duplicates(filtered_lines, self.near_duplicate_distance)
+        
+        return '\n'.join(unique_lines)
+    
+    def analyze(self, data: Dict[str, str], cleaned: Optional[str] = None) -> ArticleAnalysis:
+        """
+        기사 분석 객체 (같은 스레드에서 같은 기사를 다시 분석하면 이전 객체를 재사용)
+        
+        Args:
+            data: 구조화된 뉴스 데이터
+            cleaned: 이미 정제한 본문 (일괄 정제 결과 등)
+            
+        Returns:
+            정제 본문, 단어 빈도, 문장, 토픽 등을 한 번만 계산하는 ArticleAnalysis
+        """
+        cached = getattr(self._analysis_cache, 'analysis', None)
+        if (cached is not None and cached.content is data['content']
+                and cached.title == data['title'] and cached.description == data['description']):
+            return cached
+        
+        analysis = ArticleAnalysis(data, self, cleaned=cleaned)
+        self._analysis_cache.analysis = analysis
+        return analysis
+    
+    def clean_contents(self, contents: List[str]) -> List[str]:
+        """
+        여러 기사의 불필요한 내용 제거 (clean_content와 같은 결과)
+        
+        모든 기사의 문단 지문을 simhash_many로 한 번에 계산한 뒤 기사별로 중복을 제거합니다.
+        near_duplicate_distance가 None이면 지문 없이 똑같은 문단만 제거합니다.
+        
+        Args:
+            contents: 원본 내용 리스트
+            
+        Returns:
+            입력 순서의 정리된 내용 리스트
+        """
+        line_lists = [self._filter_lines(content) for content in contents]
+        if self.near_duplicate_distance is None:
+            return ['\n'.join(dict.fromkeys(lines)) for lines in line_lists]
+        fingerprints = simhash_many([line for lines in line_lists for line in lines])
+        
+        cleaned = []
+        offset = 0
+        for lines in line_lists:
+            unique_lines = dedupe_near_duplicates(
+                lines, self.near_duplicate_distance,
+                fingerprints=fingerprints[offset:offset + len(lines)]
+            )
+            offset += len(lines)
+            cleaned.append('\n'.join(unique_lines))
+        return cleaned
+    
+    def _filter_lines(self, content: str) -> List[str]:
+        """
+        기자 정보, 메타데이터, 짧은 줄을 제거한 문단 리스트
+        
+        Args:
+            content: 원본 내용
+            
+        Returns:
+            남은 문단 리스트 (중복 제거 전)
+        """
         # 기자 정보 제거
         content = re.sub(r'By\s+[\w\s]+\n', '', content)
         content = re.sub(r'Kevin Buckland.*?\n', '', content, flags=re.IGNORECASE)
-        content = re.sub(r'\w+@\w+\.\w+', '', content)  # 이메일 제거
+        if '@' in content:
+            content = re.sub(r'\w+@\w+\.\w+', '', content)  # 이메일 제거
         
         # 메타데이터 제거
-        unwanted_patterns = [
-            'usd=x', '^spx', 'terms and privacy', 'privacy dashboard',
-            'fri,', 'min read', 'in this article', 'reporting by', 'editing by',
-            'subscribe', 'newsletter', 'follow us', 'download app'
-        ]
-        
         lines = content.split('\n')
         filtered_lines = []
         
         for line in lines:
             line = line.strip()
-            if (line and len(line) > 20 and 
-                not any(pattern in line.lower() for pattern in unwanted_patterns)):
+            if len(line) <= 20:
+                continue
+            if not _UNWANTED_LINES.search(line):
                 filtered_lines.append(line)
         
-        # 중복 제거
-        unique_lines = list(dict.fromkeys(filtered_lines))
-        
-        return '\n'.join(unique_lines)
+        return filtered_lines
     
     def detect_topic(self, text: str) -> str:
         """
@@ -158,44 +264,20 @@ class BaseConverter(ABC):
         Returns:
             감지된 토픽
         """
-        text_lower = text.lower()
-        
-        topic_keywords = {
-            'market': ['market', 'stock', 'trading', 'index', 'equity', 'shares', '주식', '증시', '시장'],
-            'finance': ['bank', 'finance', 'investment', 'fund', 'money', 'dollar', '은행', '투자', '자금'],
-            'tech': ['technology', 'tech', 'ai', 'digital', 'software', 'innovation', '기술', '혁신', '소프트웨어'],
-            'policy': ['policy', 'regulation', 'law', 'government', 'bill', 'tax', '정책', '규제', '법률'],
-            'trade': ['trade', 'tariff', 'export', 'import', 'deal', 'agreement', '무역', '수출', '수입'],
-            'energy': ['oil', 'gas', 'energy', 'fuel', 'crude', 'petroleum', '에너지', '석유', '가스']
-        }
-        
-        scores = {topic: 0 for topic in topic_keywords.keys()}
-        
-        for topic, keywords in topic_keywords.items():
-            for keyword in keywords:
-                scores[topic] += text_lower.count(keyword)
-        
-        if not any(scores.values()):
-            return 'default'
-        
-        return max(scores.items(), key=lambda x: x[1])[0]
+        return pick_topic(score_topics(text, self.topic_keywords, self.topic_matcher))
     
-    def format_stock_symbols(self, text: str) -> str:
+    def format_stock_symbols(self, text: str, seen: Optional[Set[str]] = None) -> str:
         """
-        주식 심볼 포맷팅 ($SYMBOL 형식으로 변환)
+        주식 심볼 포맷팅 (처음 언급된 회사 이름 뒤에 $SYMBOL 추가)
         
         Args:
             text: 원본 텍스트
+            seen: 이미 심볼을 붙인 회사 (기사를 문장별로 나눠 포맷팅할 때 공유)
             
         Returns:
             포맷팅된 텍스트
         """
-        formatted = text
-        for company, symbol in self.company_symbols.items():
-            if company in formatted:
-                formatted = formatted.replace(company, f"{company} ${symbol}")
-        
-        return formatted
+        return self.ticker_linker.link(text, seen)
     
     def generate_output_filename(self, input_path: str, suffix: str = "") -> Path:
         """
@@ -257,55 +339,185 @@ class BaseConverter(ABC):
         """
         pass
     
-    def process_file(self, file_path: str) -> None:
+    def convert_with_keywords(self, data: Dict[str, str]) -> Tuple[str, str]:
+        """
+        마크다운 변환과 키워드 추출 (API 변환기는 한 번의 호출로 처리하도록 재정의)
+        
+        Args:
+            data: 구조화된 뉴스 데이터
+            
+        Returns:
+            (마크다운, 해시태그 문자열) 튜플
+        """
+        markdown_content = self.convert_to_markdown(data)
+        keywords = self.extract_keywords(
+            f"{data['title']}\n{data['description']}\n{data['content']}"
+        )
+        return markdown_content, keywords
+    
+    def prepare_file(self, file_path: str) -> Tuple[Dict[str, str], Path, str]:
+        """
+        변환 준비 (파일 읽기, 출력 경로와 중복 인덱스 키 계산)
+        
+        Args:
+            file_path: 처리할 파일 경로
+            
+        Returns:
+            (구조화된 뉴스 데이터, 출력 경로, 중복 인덱스 키) 튜플 - 인덱스를 쓰지 않으면 키는 빈 문자열
+        """
+        data = self.read_txt_file(file_path)
+        
+        output_path = self.generate_output_filename(
+            file_path, 
+            suffix=self.__class__.__name__.lower().replace('converter', '')
+        )
+        
+        index_key = self.analyze(data).cleaned if self.duplicate_index else ''
+        return data, output_path, index_key
+    
+    def duplicate_namespace(self) -> str:
+        """
+        중복 인덱스 네임스페이스 (같은 네임스페이스에서 만든 결과만 재사용)
+        
+        Returns:
+            변환기 클래스와 프롬프트 버전 문자열
+        """
+        return f"{self.__class__.__name__}:{self.prompt_version}"
+    
+    def reuse_duplicate(self, index_key: str, output_path: Path) -> bool:
+        """
+        이미 변환된 유사 기사가 있으면 그 결과를 출력 경로에 복사
+        
+        Args:
+            index_key: prepare_file이 반환한 중복 인덱스 키
+            output_path: 출력 경로
+            
+        Returns:
+            결과를 재사용했는지 여부
+        """
+        if not index_key:
+            return False
+        
+        match = self.duplicate_index.find(index_key, self.duplicate_namespace())
+        if not match or not Path(match['output_path']).exists():
+            return False
+        
+        print(f"♻️  유사 기사 변환 결과 재사용 (유사도 {match['similarity']:.0%}): "
+              f"{match['output_path']}")
+        with open(match['output_path'], 'r', encoding='utf-8') as f:
+            self.save_markdown(f.read(), output_path)
+        return True
+    
+    def save_result(self, markdown_content: str, keywords: str, output_path: Path,
+                    index_key: str = '') -> None:
+        """
+        변환 결과 저장 및 중복 인덱스 등록
+        
+        Args:
+            markdown_content: 마크다운 본문
+            keywords: 해시태그 문자열
+            output_path: 출력 경로
+            index_key: prepare_file이 반환한 중복 인덱스 키
+        """
+        self.save_markdown(f"{markdown_content}\n\n{keywords}", output_path)
+        
+        if index_key:
+            self.duplicate_index.add(index_key, str(output_path), self.duplicate_namespace())
+    
+    def process_file(self, file_path: str) -> Optional[Path]:
         """
         파일 처리 (공통 워크플로우)
         
         Args:
             file_path: 처리할 파일 경로
+            
+        Returns:
+            생성된 마크다운 파일 경로 (실패 시 None)
         """
         print(f"🔄 Processing: {file_path}")
         
         try:
             # 1. 파일 읽기
-            data = self.read_txt_file(file_path)
+            data, output_path, index_key = self.prepare_file(file_path)
             
-            # 2. 마크다운 변환
-            markdown_content = self.convert_to_markdown(data)
+            # 이미 변환된 유사 기사가 있으면 결과 재사용
+            if self.reuse_duplicate(index_key, output_path):
+                return output_path
             
-            # 3. 키워드 추출
-            keywords = self.extract_keywords(
-                f"{data['title']}\n{data['description']}\n{data['content']}"
-            )
+            # 2. 마크다운 변환 및 3. 키워드 추출
+            markdown_content, keywords = self.convert_with_keywords(data)
             
-            # 4. 최종 조합
-            final_content = f"{markdown_content}\n\n{keywords}"
+            # 4. 최종 조합 및 5. 파일 저장
+            self.save_result(markdown_content, keywords, output_path, index_key)
             
-            # 5. 파일 저장
-            output_path = self.generate_output_filename(
-                file_path, 
-                suffix=self.__class__.__name__.lower().replace('converter', '')
-            )
-            self.save_markdown(final_content, output_path)
+            return output_path
             
         except Exception as e:
             print(f"❌ Error processing {file_path}: {str(e)}")
+            return None
     
-    def process_directory(self, directory_path: str) -> None:
+    def process_files(self, file_paths: List[str], workers: int = 1) -> List[Optional[Path]]:
+        """
+        여러 파일 처리 (workers > 1이면 스레드 풀로 병렬 처리)
+        
+        파일별 오류는 process_file 안에서 처리되므로 한 파일의 실패가
+        다른 파일에 영향을 주지 않습니다.
+        
+        Args:
+            file_paths: 처리할 파일 경로 리스트
+            workers: 동시에 처리할 최대 파일 수
+            
+        Returns:
+            입력 순서와 같은 순서의 결과 경로 리스트 (실패한 파일은 None)
+        """
+        workers = max(1, min(workers, len(file_paths)))
+        
+        if workers == 1:
+            return [self.process_file(path) for path in file_paths]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map은 입력 순서대로 결과를 돌려주므로 출력 순서가 결정적
+            return list(tqdm(
+                executor.map(self.process_file, file_paths),
+                total=len(file_paths),
+                desc=f"🔄 Converting ({workers} workers)",
+                unit="file"
+            ))
+    
+    def process_directory(self, directory_path: str, workers: int = 1) -> List[Optional[Path]]:
         """
         디렉토리 내 모든 TXT 파일 처리
         
         Args:
             directory_path: 처리할 디렉토리 경로
+            workers: 동시에 처리할 최대 파일 수
+            
+        Returns:
+            파일명 순서의 결과 경로 리스트 (실패한 파일은 None)
         """
         directory = Path(directory_path)
-        txt_files = list(directory.glob('*.txt'))
+        txt_files = sorted(directory.glob('*.txt'))
         
         if not txt_files:
             print(f"❌ No TXT files found in {directory_path}")
-            return
+            return []
         
         print(f"📁 Processing {len(txt_files)} files in {directory_path}")
         
-        for txt_file in txt_files:
-            self.process_file(str(txt_file)) 
\ No newline at end of file
+        return self.process_files([str(txt_file) for txt_file in txt_files], workers)
+    
+    def close(self) -> None:
+        """
+        변환기가 보유한 리소스 해제 (중복 인덱스 연결 등)
+        
+        여러 기사를 처리하는 동안 변환기를 재사용하고, 더 이상 쓰지 않을 때 한 번 호출합니다.
+        """
+        if self.duplicate_index is not None:
+            self.duplicate_index.close()
+            self.duplicate_index = None
+    
+    def __enter__(self) -> 'BaseConverter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,365 @@
+"""
+배치 API 변환
+
+야간 대량 변환처럼 지연 시간보다 비용과 처리량이 중요한 경우, 모든 기사를
+Anthropic Message Batches 또는 OpenAI Batch 작업 하나로 제출하고 완료될 때까지
+폴링한 뒤 결과를 save_markdown으로 저장합니다. 실패한 항목과 형식 검증을 통과하지 못한
+응답은 개별 API 호출로 대체하지 않고 다음 배치에 다시 제출하며, 검증을 통과한 응답만
+응답 캐시에 저장합니다.
+
+전송 계층(BatchTransport)은 교체할 수 있으며, base_url을 지정하면 로컬 대역 서버를
+대상으로 테스트할 수 있습니다.
+"""
+
+import io
+import json
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .llm_converter import LLMConverter
+
+# 작업 종료 상태
+ANTHROPIC_ENDED = 'ended'
+OPENAI_TERMINAL = frozenset(['completed', 'failed', 'expired', 'cancelled'])
+
+
+class BatchTransport(ABC):
+    """배치 작업 제출/조회 전송 계층"""
+
+    @abstractmethod
+    def submit(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        배치 작업 제출
+
+        Args:
+            requests: (custom_id, 요청 파라미터) 리스트
+
+        Returns:
+            배치 작업 ID
+        """
+        pass
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> Tuple[bool, str]:
+        """
+        배치 작업 상태 조회
+
+        Args:
+            batch_id: 배치 작업 ID
+
+        Returns:
+            (종료 여부, 진행 상황 설명) 튜플
+        """
+        pass
+
+    @abstractmethod
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        종료된 배치 작업의 항목별 결과 조회
+
+        Args:
+            batch_id: 배치 작업 ID
+
+        Returns:
+            custom_id별 {'response': 응답 객체 또는 None, 'error': 오류 메시지 또는 None}
+            (결과가 없는 항목은 포함되지 않음)
+        """
+        pass
+
+    def cancel(self, batch_id: str) -> None:
+        """배치 작업 취소 (대기 시간 초과 시 중복 과금을 막기 위해 호출)"""
+        pass
+
+
+class AnthropicBatchTransport(BatchTransport):
+    """Anthropic Message Batches API 전송 계층"""
+
+    def __init__(self, client):
+        """
+        Args:
+            client: anthropic.Anthropic 클라이언트
+        """
+        messages = client.messages
+        # 정식 API 이전 SDK는 beta 네임스페이스에 배치 API가 있음
+        self.batches = getattr(messages, 'batches', None) or client.beta.messages.batches
+
+    def submit(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        batch = self.batches.create(requests=[
+            {'custom_id': custom_id, 'params': params} for custom_id, params in requests
+        ])
+        return batch.id
+
+    def poll(self, batch_id: str) -> Tuple[bool, str]:
+        batch = self.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        summary = (f"{batch.processing_status} - 처리 중 {counts.processing}, "
+                   f"성공 {counts.succeeded}, 오류 {counts.errored}, "
+                   f"만료 {counts.expired}, 취소 {counts.canceled}")
+        return batch.processing_status == ANTHROPIC_ENDED, summary
+
+    def cancel(self, batch_id: str) -> None:
+        self.batches.cancel(batch_id)
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        outcomes = {}
+        for entry in self.batches.results(batch_id):
+            result = entry.result
+            if result.type == 'succeeded':
+                outcomes[entry.custom_id] = {'response': result.message, 'error': None}
+            else:
+                error = getattr(result, 'error', None)
+                detail = getattr(getattr(error, 'error', None), 'message', None) or str(error or '')
+                outcomes[entry.custom_id] = {
+                    'response': None,
+                    'error': f"{result.type}: {detail}" if detail else result.type
+                }
+        return outcomes
+
+
+class OpenAIBatchTransport(BatchTransport):
+    """OpenAI Batch API 전송 계층 (JSONL 파일 업로드 방식)"""
+
+    endpoint = '/v1/chat/completions'
+    completion_window = '24h'
+
+    def __init__(self, client):
+        """
+        Args:
+            client: openai.OpenAI 클라이언트
+        """
+        self.client = client
+
+    def submit(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        lines = [
+            json.dumps({'custom_id': custom_id, 'method': 'POST', 'url': self.endpoint, 'body': params},
+                       ensure_ascii=False)
+            for custom_id, params in requests
+        ]
+        payload = ('\n'.join(lines) + '\n').encode('utf-8')
+        input_file = self.client.files.create(
+            file=('batch_requests.jsonl', io.BytesIO(payload)), purpose='batch'
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.endpoint,
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> Tuple[bool, str]:
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        summary = batch.status
+        if counts is not None:
+            summary += f" - 완료 {counts.completed}/{counts.total}, 실패 {counts.failed}"
+        return batch.status in OPENAI_TERMINAL, summary
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.batches.cancel(batch_id)
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        outcomes = {}
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                # 응답 본문을 속성 접근이 가능한 객체로 바꿔 동기 호출 응답과 같은 방식으로 파싱
+                entry = json.loads(line, object_hook=lambda d: SimpleNamespace(**d))
+                response = getattr(entry, 'response', None)
+                status_code = getattr(response, 'status_code', None)
+                if response is not None and status_code == 200:
+                    outcomes[entry.custom_id] = {'response': response.body, 'error': None}
+                else:
+                    error = getattr(entry, 'error', None)
+                    body_error = getattr(getattr(response, 'body', None), 'error', None)
+                    detail = getattr(error or body_error, 'message', None) or f"HTTP {status_code}"
+                    outcomes[entry.custom_id] = {'response': None, 'error': detail}
+
+        return outcomes
+
+
+def create_batch_transport(converter: LLMConverter, base_url: Optional[str] = None) -> BatchTransport:
+    """
+    변환기 제공자에 맞는 배치 전송 계층 생성
+
+    Args:
+        converter: API 변환기
+        base_url: API 기본 URL (로컬 대역 서버 테스트용, 없으면 변환기 클라이언트 설정 사용)
+
+    Returns:
+        배치 전송 계층
+    """
+    client = converter.client
+    if base_url:
+        client = client.with_options(base_url=base_url)
+
+    if converter.provider == 'anthropic':
+        return AnthropicBatchTransport(client)
+    if converter.provider == 'openai':
+        return OpenAIBatchTransport(client)
+    raise ValueError(f"Batch mode is not supported for provider: {converter.provider}")
+
+
+class BatchRunner:
+    """배치 API 기반 대량 변환 실행기"""
+
+    def __init__(self, converter: LLMConverter, transport: Optional[BatchTransport] = None,
+                 poll_interval: float = 30.0, max_attempts: int = 3, timeout: float = 24 * 3600):
+        """
+        배치 실행기 초기화
+
+        Args:
+            converter: API 변환기 (요청 생성, 응답 후처리, 저장에 사용)
+            transport: 배치 전송 계층 (없으면 변환기 제공자에 맞게 생성)
+            poll_interval: 상태 조회 간격 (초)
+            max_attempts: 실패 항목을 포함한 최대 제출 횟수
+            timeout: 제출 한 번당 최대 대기 시간 (초)
+        """
+        self.converter = converter
+        self.transport = transport or create_batch_transport(converter)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+
+    def run(self, file_paths: List[str]) -> List[Optional[Path]]:
+        """
+        파일 목록을 배치로 변환
+
+        중복 기사 재사용과 응답 캐시 적중 항목은 제출하지 않고 바로 저장합니다.
+        (캐시된 응답이 형식 검증을 통과하지 못하면 배치에 제출합니다.)
+
+        Args:
+            file_paths: 처리할 파일 경로 리스트
+
+        Returns:
+            입력 순서와 같은 순서의 결과 경로 리스트 (실패한 파일은 None)
+        """
+        converter = self.converter
+        results: List[Optional[Path]] = [None] * len(file_paths)
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        for position, file_path in enumerate(file_paths):
+            try:
+                data, output_path, index_key = converter.prepare_file(file_path)
+                if converter.reuse_duplicate(index_key, output_path):
+                    results[position] = output_path
+                    continue
+
+                request = converter.combined_request(data)
+                item = {
+                    'position': position,
+                    'file_path': file_path,
+                    'data': data,
+                    'output_path': output_path,
+                    'index_key': index_key,
+                    'request': request,
+                    'cache_key': converter.cache_key(**request)
+                }
+
+                cached = converter.response_cache.get(item['cache_key'])
+                if cached is not None:
+                    try:
+                        converted = converter.finish_combined(data, cached, fallback=False)
+                    except ValueError as e:
+                        print(f"⚠️  캐시된 응답 검증 실패, 배치에 제출합니다 ({file_path}): {str(e)}")
+                    else:
+                        self._save(item, converted, results)
+                        continue
+
+                pending[f"article-{position}"] = item
+            except Exception as e:
+                print(f"❌ Error preparing {file_path}: {str(e)}")
+
+        attempt = 0
+        while pending and attempt < self.max_attempts:
+            attempt += 1
+            print(f"📦 배치 제출 {attempt}/{self.max_attempts}: {len(pending)}건")
+
+            outcomes = self._run_batch(pending)
+            failed = {}
+            for custom_id, item in pending.items():
+                outcome = outcomes.get(custom_id)
+                if outcome is None or outcome['response'] is None:
+                    error = outcome['error'] if outcome else 'no result returned'
+                    print(f"⚠️  배치 항목 실패 ({item['file_path']}): {error}")
+                    failed[custom_id] = item
+                    continue
+
+                try:
+                    text, usage = converter.parse_response(outcome['response'], json_mode=True)
+                    converter.record_usage(usage)
+                    # 형식 검증을 통과한 응답만 캐시에 저장 (실패하면 다음 배치에 다시 제출)
+                    converted = converter.finish_combined(item['data'], text, fallback=False)
+                except Exception as e:
+                    print(f"⚠️  배치 응답 처리 실패 ({item['file_path']}): {str(e)}")
+                    failed[custom_id] = item
+                    continue
+
+                converter.response_cache.set(item['cache_key'], text)
+                self._save(item, converted, results)
+
+            pending = failed
+
+        for item in pending.values():
+            print(f"❌ Error processing {item['file_path']}: batch request failed "
+                  f"after {self.max_attempts} attempts")
+
+        return results
+
+    def _run_batch(self, pending: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """배치 하나를 제출하고 종료될 때까지 기다린 뒤 결과 반환"""
+        requests = [
+            (custom_id, self.converter.build_request_params(**item['request']))
+            for custom_id, item in pending.items()
+        ]
+
+        try:
+            batch_id = self.transport.submit(requests)
+        except Exception as e:
+            print(f"❌ 배치 제출 실패: {str(e)}")
+            return {}
+
+        print(f"⏳ 배치 작업 {batch_id} 대기 중 (조회 간격 {self.poll_interval:g}초)")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                done, summary = self.transport.poll(batch_id)
+            except Exception as e:
+                # 일시적인 조회 오류는 다음 주기에 다시 시도
+                done, summary = False, f"조회 실패: {str(e)}"
+            print(f"   {batch_id}: {summary}")
+            if done:
+                break
+            if time.monotonic() >= deadline:
+                print(f"❌ 배치 작업 {batch_id} 대기 시간 초과, 취소 요청")
+                try:
+                    self.transport.cancel(batch_id)
+                except Exception as e:
+                    print(f"⚠️  배치 취소 실패: {str(e)}")
+                return {}
+            time.sleep(self.poll_interval)
+
+        try:
+            return self.transport.results(batch_id)
+        except Exception as e:
+            print(f"❌ 배치 결과 조회 실패: {str(e)}")
+            return {}
+
+    def _save(self, item: Dict[str, Any], converted: Tuple[str, str],
+              results: List[Optional[Path]]) -> None:
+        """검증된 (마크다운, 해시태그 문자열)을 저장하고 결과 목록에 기록"""
+        try:
+            markdown_content, keywords = converted
+            self.converter.save_result(
+                markdown_content, keywords, item['output_path'], item['index_key']
+            )
+            results[item['position']] = item['output_path']
+        except Exception as e:
+            print(f"❌ Error processing {item['file_path']}: {str(e)}")
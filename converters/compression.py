@@ -0,0 +1,201 @@
+"""
+기사 본문 추출 압축
+
+LLM에 보내기 전에 본문 문장의 중요도를 매겨 토큰 예산 안에서 상위 문장만 원래 순서대로
+남깁니다. 숫자, 인용구, 주식 심볼이 든 문장은 먼저 남기고, 문장은 고치지 않고 그대로
+옮기므로 수치나 발언이 바뀌지 않습니다.
+
+점수는 LocalConverter._extract_key_sentences와 같은 단어 빈도 방식에 다음을 더했습니다.
+- 문장 길이로 나누는 대신 서로 다른 단어 수의 제곱근으로 나눠 짧은 문장 편향 완화
+- 기사 앞부분과 문단 첫 문장, 제목과 겹치는 단어에 가중치
+- 이미 고른 문장과 단어가 많이 겹치는 문장은 건너뜀
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Set, Tuple
+
+from .tokenizer import count_tokens
+
+# 문장 끝 (마침표/물음표/느낌표와 닫는 따옴표 뒤 공백)
+_SENTENCE_END = re.compile(r'(?<=[.!?。…])\s+|(?<=[.!?。…]["\'”’)])\s+')
+# 문장 끝으로 보지 않는 약어 (마지막 단어가 이 중 하나면 다음 조각과 이어 붙임)
+_ABBREVIATIONS = {
+    'u.s.', 'u.k.', 'e.u.', 'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'inc.', 'corp.', 'co.',
+    'ltd.', 'jr.', 'sr.', 'st.', 'vs.', 'e.g.', 'i.e.', 'etc.', 'no.', 'approx.',
+    'jan.', 'feb.', 'mar.', 'apr.', 'jun.', 'jul.', 'aug.', 'sep.', 'sept.', 'oct.', 'nov.', 'dec.'
+}
+
+_TERM = re.compile(r'[가-힣]{2,}|[A-Za-z][A-Za-z\'-]+|\d+(?:[.,]\d+)*')
+_NUMBER = re.compile(r'\d')
+_QUOTE = re.compile(r'["“”「」『』]|\'[^\']{4,}\'')
+_TICKER = re.compile(r'\$[A-Z]{1,5}\b|\((?:NASDAQ|NYSE|KRX|KOSPI|KOSDAQ|TSX|LSE)\s*:\s*[A-Z0-9.]{1,10}\)|\b[A-Z]{2,5}\.(?:KS|KQ|T|HK|L)\b')
+
+# 점수 계산에서 빼는 흔한 단어
+STOPWORDS = {
+    '있다', '없다', '되다', '하다', '한다', '했다', '그리고', '또한', '하지만', '그러나', '따라서',
+    '이에', '이와', '같이', '때문에', '위해', '통해', '관련', '대한', '대해', '위한', '이번',
+    '그것', '이것', '저것', '지금', '오늘', '내일', '어제', '요즘', '최근', '현재', '것으로',
+    '밝혔다', '말했다', '전했다', '있는', '있었다', '했다고', '한다고',
+    'the', 'and', 'for', 'that', 'with', 'this', 'from', 'was', 'are', 'has', 'have', 'had',
+    'will', 'would', 'said', 'says', 'its', 'their', 'they', 'but', 'not', 'been', 'were',
+    'which', 'about', 'into', 'than', 'also', 'more', 'after', 'over'
+}
+
+# 점수 가중치
+LEAD_SENTENCES = 3
+LEAD_BONUS = 0.5
+PARAGRAPH_START_BONUS = 0.2
+TITLE_TERM_BONUS = 0.3
+MAX_OVERLAP = 0.7
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """
+    본문을 (문단 번호, 문장) 리스트로 분리
+
+    소수점(3.5%)은 뒤에 공백이 없어 나누지 않고, U.S. 같은 약어 뒤에서도 나누지 않습니다.
+
+    Args:
+        text: 기사 본문
+
+    Returns:
+        본문 순서의 (문단 번호, 문장) 리스트
+    """
+    sentences: List[Tuple[int, str]] = []
+    for paragraph_index, paragraph in enumerate(p for p in text.split('\n') if p.strip()):
+        pending = ''
+        for piece in _SENTENCE_END.split(paragraph.strip()):
+            pending = f"{pending} {piece}" if pending else piece
+            words = pending.rstrip('"\'”’) ').split()
+            if words and words[-1].lower() in _ABBREVIATIONS:
+                continue
+            sentences.append((paragraph_index, pending.strip()))
+            pending = ''
+        if pending.strip():
+            sentences.append((paragraph_index, pending.strip()))
+    return sentences
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in (t.lower() for t in _TERM.findall(text)) if term not in STOPWORDS]
+
+
+def is_protected(sentence: str) -> bool:
+    """숫자, 인용구, 주식 심볼이 든 문장인지 여부 (압축할 때 먼저 남김)"""
+    return bool(_NUMBER.search(sentence) or _QUOTE.search(sentence) or _TICKER.search(sentence))
+
+
+def score_sentences(sentences: List[Tuple[int, str]], title: str = '') -> List[float]:
+    """
+    문장 중요도 점수
+
+    Args:
+        sentences: split_sentences 결과
+        title: 기사 제목 (제목과 겹치는 단어에 가중치)
+
+    Returns:
+        문장별 점수 (sentences와 같은 순서)
+    """
+    sentence_terms = [_terms(sentence) for _, sentence in sentences]
+    frequency = Counter(term for terms in sentence_terms for term in set(terms))
+    title_terms = set(_terms(title))
+
+    scores = []
+    previous_paragraph = -1
+    for index, ((paragraph, _), terms) in enumerate(zip(sentences, sentence_terms)):
+        distinct = set(terms)
+        score = 0.0
+        if distinct:
+            # 여러 문장에 나온 단어일수록 기사 주제에 가까움 (한 번만 나온 단어는 0)
+            score = sum(math.log(frequency[term]) for term in distinct) / math.sqrt(len(distinct))
+            score += TITLE_TERM_BONUS * len(distinct & title_terms)
+        if index < LEAD_SENTENCES:
+            score += LEAD_BONUS * (LEAD_SENTENCES - index)
+        if paragraph != previous_paragraph:
+            score += PARAGRAPH_START_BONUS
+        previous_paragraph = paragraph
+        scores.append(score)
+    return scores
+
+
+def _overlap(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def compress_content(content: str, max_tokens: int, model: str = '',
+                     title: str = '') -> Tuple[str, Dict[str, Any]]:
+    """
+    토큰 예산 안에서 중요한 문장만 남기기 (추출 압축)
+
+    첫 문장과 숫자/인용구/주식 심볼이 든 문장을 먼저, 그 안에서는 점수 순으로 예산이 찰 때까지 고르고
+    원래 순서와 문단 구분을 유지해 다시 이어 붙입니다.
+
+    Args:
+        content: 정제된 기사 본문
+        max_tokens: 압축 후 최대 토큰 수
+        model: 토큰 계산에 쓸 모델 이름
+        title: 기사 제목
+
+    Returns:
+        (압축된 본문, 통계) 튜플 - 통계는 original_tokens, compressed_tokens, saved_tokens,
+        ratio(압축 후/전), sentences_total, sentences_kept
+    """
+    original_tokens = count_tokens(content, model)
+    sentences = split_sentences(content)
+    stats: Dict[str, Any] = {
+        'original_tokens': original_tokens,
+        'compressed_tokens': original_tokens,
+        'saved_tokens': 0,
+        'ratio': 1.0,
+        'sentences_total': len(sentences),
+        'sentences_kept': len(sentences)
+    }
+    if original_tokens <= max_tokens or len(sentences) <= 1:
+        return content, stats
+
+    scores = score_sentences(sentences, title)
+    costs = [count_tokens(sentence, model) + 1 for _, sentence in sentences]
+    # 첫 문장(리드)과 숫자/인용구/주식 심볼이 든 문장을 먼저 고름
+    order = sorted(range(len(sentences)),
+                   key=lambda i: (i == 0 or is_protected(sentences[i][1]), scores[i]), reverse=True)
+
+    selected: List[int] = []
+    selected_terms: List[Set[str]] = []
+    used = 0
+    for index in order:
+        if used + costs[index] > max_tokens:
+            continue
+        terms = set(_terms(sentences[index][1]))
+        if any(_overlap(terms, other) > MAX_OVERLAP for other in selected_terms):
+            continue
+        selected.append(index)
+        selected_terms.append(terms)
+        used += costs[index]
+
+    if not selected:
+        return content, stats
+
+    # 원래 순서로, 같은 문단의 문장은 한 줄로 이어 붙임
+    lines: List[str] = []
+    last_paragraph = None
+    for index in sorted(selected):
+        paragraph, sentence = sentences[index]
+        if paragraph == last_paragraph:
+            lines[-1] = f"{lines[-1]} {sentence}"
+        else:
+            lines.append(sentence)
+        last_paragraph = paragraph
+
+    compressed = '\n'.join(lines)
+    compressed_tokens = count_tokens(compressed, model)
+    stats.update({
+        'compressed_tokens': compressed_tokens,
+        'saved_tokens': original_tokens - compressed_tokens,
+        'ratio': compressed_tokens / original_tokens if original_tokens else 1.0,
+        'sentences_kept': len(selected)
+    })
+    return compressed, stats
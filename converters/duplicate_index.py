@@ -0,0 +1,159 @@
+"""
+기사 간 유사 중복 인덱스
+
+여러 매체에 거의 같은 본문으로 실리는 통신사 기사(Reuters, AP, Bloomberg 등)를
+다시 변환하지 않도록, 변환이 끝난 기사 본문의 MinHash 서명을 SQLite에 저장하고
+새 기사와 유사한 기사가 이미 변환되었는지 LSH 밴드 키로 조회합니다.
+
+항목은 네임스페이스(변환기·제공자·모델·프롬프트 버전)별로 나뉘므로, 프롬프트를 바꾸거나
+다른 모델로 변환하면 이전 결과를 재사용하지 않습니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from text_utils.minhash import (
+    minhash_signature, estimate_jaccard, lsh_band_keys,
+    DEFAULT_NUM_PERM, DEFAULT_NUM_BANDS
+)
+from text_utils.simhash import normalize_text
+
+
+class DuplicateIndex:
+    """MinHash LSH 기반 변환 결과 재사용 인덱스"""
+
+    def __init__(self, db_path: str = 'data/duplicate_index.db', threshold: float = 0.8,
+                 num_perm: int = DEFAULT_NUM_PERM, num_bands: int = DEFAULT_NUM_BANDS):
+        """
+        인덱스 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            threshold: 중복으로 판단할 최소 자카드 유사도
+            num_perm: MinHash 순열 수
+            num_bands: LSH 밴드 수
+        """
+        if num_perm % num_bands != 0:
+            raise ValueError("num_perm must be divisible by num_bands")
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL UNIQUE,
+                signature BLOB NOT NULL,
+                output_path TEXT NOT NULL,
+                namespace TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                band_key INTEGER NOT NULL,
+                article_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bands_lookup ON bands (band, band_key);
+        """)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(articles)')}
+        if 'namespace' not in columns:
+            # 네임스페이스 이전 인덱스: 기존 항목은 빈 네임스페이스로 남아 더 이상 매칭되지 않음
+            self._conn.execute("ALTER TABLE articles ADD COLUMN namespace TEXT NOT NULL DEFAULT ''")
+        self._conn.commit()
+
+    @staticmethod
+    def _content_hash(content: str, namespace: str = '') -> str:
+        """네임스페이스와 정규화된 본문의 SHA-256 해시 (완전 일치 조회용)"""
+        key = f"{namespace}\0{normalize_text(content)}" if namespace else normalize_text(content)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def find(self, content: str, namespace: str = '') -> Optional[Dict[str, object]]:
+        """
+        이미 변환된 유사 기사 조회
+
+        Args:
+            content: 정제된 기사 본문
+            namespace: 결과를 만든 변환기·모델·프롬프트 버전 (같은 네임스페이스에서만 매칭)
+
+        Returns:
+            {'output_path', 'similarity'} 딕셔너리 (없으면 None)
+        """
+        content_hash = self._content_hash(content, namespace)
+        signature = minhash_signature(content, self.num_perm)
+        keys = lsh_band_keys(signature, self.num_bands)
+        placeholders = ' OR '.join(['(band = ? AND band_key = ?)'] * len(keys))
+        params = [namespace] + [value for band, key in enumerate(keys) for value in (band, key)]
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT output_path FROM articles WHERE content_hash = ?', (content_hash,)
+            ).fetchone()
+            if row:
+                return {'output_path': row[0], 'similarity': 1.0}
+
+            candidates = self._conn.execute(
+                f'SELECT a.output_path, a.signature FROM articles a '
+                f'WHERE a.namespace = ? AND a.id IN (SELECT article_id FROM bands WHERE {placeholders})',
+                params
+            ).fetchall()
+
+        best = None
+        for output_path, blob in candidates:
+            similarity = estimate_jaccard(signature, np.frombuffer(blob, dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best['similarity']):
+                best = {'output_path': output_path, 'similarity': similarity}
+
+        return best
+
+    def add(self, content: str, output_path: str, namespace: str = '') -> None:
+        """
+        변환된 기사 등록
+
+        Args:
+            content: 정제된 기사 본문
+            output_path: 변환 결과 파일 경로
+            namespace: 결과를 만든 변환기·모델·프롬프트 버전
+        """
+        content_hash = self._content_hash(content, namespace)
+        signature = minhash_signature(content, self.num_perm)
+        keys = lsh_band_keys(signature, self.num_bands)
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id FROM articles WHERE content_hash = ?', (content_hash,)
+            ).fetchone()
+            if row:
+                # 같은 본문이 다시 변환된 경우 최신 결과 경로로 갱신
+                self._conn.execute(
+                    'UPDATE articles SET output_path = ? WHERE id = ?', (str(output_path), row[0])
+                )
+                self._conn.commit()
+                return
+
+            cursor = self._conn.execute(
+                'INSERT INTO articles (content_hash, signature, output_path, namespace) '
+                'VALUES (?, ?, ?, ?)',
+                (content_hash, signature.tobytes(), str(output_path), namespace)
+            )
+            article_id = cursor.lastrowid
+            self._conn.executemany(
+                'INSERT INTO bands (band, band_key, article_id) VALUES (?, ?, ?)',
+                [(band, key, article_id) for band, key in enumerate(keys)]
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -5,13 +5,14 @@ API 키 상태에 따라 적절한 변환기를 자동으로 선택하는 팩토
 """
 
 import os
-from typing import Type, Optional
+from typing import Optional
 from dotenv import load_dotenv
 
 from .base_converter import BaseConverter
 from .anthropic_converter import AnthropicConverter
 from .openai_converter import OpenAIConverter
 from .local_converter import LocalConverter
+from .key_validation import get_key_validation_cache
 
 
 class ConverterFactory:
@@ -25,6 +26,9 @@ class ConverterFactory:
         """
         API 키 유효성 검사
         
+        형식 확인 후 키 해시별로 캐시된 검증 결과를 사용하며, 처음 보는 키만
+        과금되지 않는 모델 목록 조회로 확인합니다.
+        
         Args:
             api_key: 테스트할 API 키
             api_type: API 타입 ('anthropic' 또는 'openai')
@@ -35,42 +39,17 @@ class ConverterFactory:
         if not api_key or len(api_key) < 10:
             return False
         
-        try:
-            if api_type == 'anthropic':
-                # Anthropic API 키 형식 확인
-                if not api_key.startswith('sk-ant-'):
-                    return False
-                # 간단한 API 호출 테스트
-                import anthropic
-                client = anthropic.Anthropic(api_key=api_key)
-                # 매우 짧은 테스트 요청
-                response = client.messages.create(
-                    model="claude-3-haiku-20240307",  # 빠른 모델 사용
-                    max_tokens=10,
-                    messages=[{"role": "user", "content": "Hi"}]
-                )
-                return True
-                
-            elif api_type == 'openai':
-                # OpenAI API 키 형식 확인
-                if not api_key.startswith('sk-'):
-                    return False
-                # 간단한 API 호출 테스트
-                from openai import OpenAI
-                client = OpenAI(api_key=api_key)
-                # 매우 짧은 테스트 요청
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",  # 빠른 모델 사용
-                    max_tokens=10,
-                    messages=[{"role": "user", "content": "Hi"}]
-                )
-                return True
-                
-        except Exception as e:
-            print(f"⚠️  API 키 테스트 실패 ({api_type}): {str(e)}")
+        # API 키 형식 확인
+        if api_type == 'anthropic':
+            if not api_key.startswith('sk-ant-'):
+                return False
+        elif api_type == 'openai':
+            if not api_key.startswith('sk-'):
+                return False
+        else:
             return False
         
-        return False
+        return get_key_validation_cache().check(api_type, api_key)
     
     def get_available_converters(self) -> dict:
         """
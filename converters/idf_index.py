@@ -0,0 +1,229 @@
+"""
+코퍼스 문서 빈도(DF) 인덱스
+
+변환한 기사의 단어별 문서 빈도를 누적해 TF-IDF/BM25 가중치의 IDF와 평균 문서 길이를
+제공합니다. 단어는 처음 등장한 순서의 정수 ID로 저장하고, 기사 하나를 추가하는 비용은
+그 기사의 서로 다른 단어 수에 비례합니다.
+
+디렉토리 구성:
+- terms.txt: 한 줄에 단어 하나 (줄 번호 = 단어 ID, 새 단어만 뒤에 추가)
+- df.npy: 단어 ID별 문서 빈도 (int32, 불러올 때 copy-on-write 메모리 맵)
+- meta.json: 문서 수와 전체 문서 길이
+- documents.bin: 추가한 문서의 내용 해시 (uint64, 같은 기사를 다시 변환해도 한 번만 셈)
+- lock: 쓰기 잠금 파일 (한 프로세스만 인덱스를 갱신하고, 나머지는 읽기 전용으로 불러옴)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 사용
+    fcntl = None
+
+
+def document_hash(text: str) -> int:
+    """
+    문서 중복 판별용 내용 해시
+
+    Args:
+        text: 문서 텍스트
+
+    Returns:
+        64비트 정수 해시
+    """
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class IdfIndex:
+    """증분 갱신되는 단어별 문서 빈도 인덱스"""
+
+    def __init__(self, path: str = 'data/idf_index', flush_every: int = 1000):
+        """
+        인덱스 불러오기 (없으면 빈 인덱스)
+
+        Args:
+            path: 인덱스 디렉토리 경로
+            flush_every: 이 수만큼 문서가 추가될 때마다 디스크에 저장
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+
+        self._lock = threading.Lock()
+        # 다른 프로세스가 이미 쓰고 있으면 읽기 전용 (갱신은 메모리에만 반영하고 저장하지 않음)
+        self.writable = True
+        self._lock_file = None
+        if fcntl is not None:
+            self._lock_file = open(self.path / 'lock', 'a')
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self.writable = False
+
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        terms_path = self.path / 'terms.txt'
+        if terms_path.exists():
+            with open(terms_path, 'r', encoding='utf-8') as f:
+                self._terms = f.read().split('\n')[:-1]
+            self._ids = {term: term_id for term_id, term in enumerate(self._terms)}
+        self._saved_terms = len(self._terms)
+
+        # 문서 빈도는 메모리 맵으로 불러오고, 갱신은 메모리에만 반영 (mode='c')했다가 save에서 기록
+        df_path = self.path / 'df.npy'
+        self._df = np.load(df_path, mmap_mode='c') if df_path.exists() else np.zeros(0, dtype=np.int32)
+        self._size = len(self._terms)
+        if len(self._df) < self._size:
+            # 단어 목록만 저장되고 중단된 경우
+            self._df = np.concatenate([self._df, np.zeros(self._size - len(self._df), dtype=np.int32)])
+
+        self.documents = 0
+        self.total_length = 0
+        meta_path = self.path / 'meta.json'
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.documents = int(meta.get('documents', 0))
+            self.total_length = int(meta.get('total_length', 0))
+        self._unsaved_documents = 0
+
+        documents_path = self.path / 'documents.bin'
+        self._hashes = set(
+            np.fromfile(documents_path, dtype=np.uint64).tolist() if documents_path.exists() else ()
+        )
+        self._new_hashes: List[int] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def term_ids(self, terms: Sequence[str], add: bool = True) -> np.ndarray:
+        """
+        단어의 정수 ID
+
+        Args:
+            terms: 단어 리스트
+            add: 처음 보는 단어를 사전에 추가할지 여부 (False면 -1)
+
+        Returns:
+            단어 ID 배열 (int64)
+        """
+        with self._lock:
+            if add:
+                for term in terms:
+                    if term not in self._ids:
+                        self._ids[term] = len(self._terms)
+                        self._terms.append(term)
+                self._grow(len(self._terms))
+            get = self._ids.get
+            return np.fromiter((get(term, -1) for term in terms), dtype=np.int64, count=len(terms))
+
+    def _grow(self, size: int) -> None:
+        """문서 빈도 배열을 size개 단어까지 확장 (용량은 두 배씩 늘려 추가 비용을 상수로 유지)"""
+        if size > len(self._df):
+            capacity = max(size, 2 * len(self._df), 1024)
+            grown = np.zeros(capacity, dtype=np.int32)
+            grown[:len(self._df)] = self._df
+            self._df = grown
+        self._size = size
+
+    def add_documents(self, term_ids: np.ndarray, lengths: Sequence[int],
+                      hashes: Optional[Sequence[int]] = None, docs: Optional[np.ndarray] = None) -> None:
+        """
+        문서 추가 (문서 빈도, 문서 수, 전체 길이 갱신)
+
+        Args:
+            term_ids: 추가할 문서들의 (문서별로 중복을 뺀) 단어 ID를 이어 붙인 배열
+            lengths: 문서별 단어 수 (BM25 평균 문서 길이 계산용)
+            hashes: 문서별 document_hash (이미 추가한 문서는 건너뜀, 없으면 모두 추가)
+            docs: term_ids 원소별 문서 번호 (hashes와 함께 지정)
+        """
+        with self._lock:
+            if hashes is not None:
+                new = np.zeros(len(lengths), dtype=bool)
+                for doc, value in enumerate(hashes):
+                    if value not in self._hashes:
+                        self._hashes.add(value)
+                        self._new_hashes.append(value)
+                        new[doc] = True
+                if not new.all():
+                    term_ids = term_ids[new[docs]]
+                    lengths = [length for length, is_new in zip(lengths, new.tolist()) if is_new]
+            if len(term_ids):
+                np.add.at(self._df, term_ids, 1)
+            self.documents += len(lengths)
+            self.total_length += int(sum(lengths))
+            self._unsaved_documents += len(lengths)
+            should_save = self._unsaved_documents >= self.flush_every
+        if should_save:
+            self.save()
+
+    def idf(self, term_ids: np.ndarray) -> np.ndarray:
+        """
+        BM25 IDF (log(1 + (N - df + 0.5) / (df + 0.5)), 항상 양수)
+
+        Args:
+            term_ids: 단어 ID 배열 (-1은 처음 보는 단어)
+
+        Returns:
+            단어별 IDF 배열
+        """
+        known = term_ids >= 0
+        df = np.zeros(len(term_ids))
+        with self._lock:
+            df[known] = self._df[term_ids[known]]
+            documents = self.documents
+        return np.log1p((documents - df + 0.5) / (df + 0.5))
+
+    def average_length(self) -> float:
+        """평균 문서 길이 (문서가 없으면 1)"""
+        return self.total_length / self.documents if self.documents else 1.0
+
+    def save(self) -> None:
+        """새 단어, 문서 빈도, 문서 수를 디스크에 기록 (읽기 전용이면 기록하지 않음)"""
+        with self._lock:
+            if not self.writable:
+                return
+            new_terms = self._terms[self._saved_terms:]
+            new_hashes = np.array(self._new_hashes, dtype=np.uint64)
+            self._new_hashes = []
+            df = np.array(self._df[:self._size], dtype=np.int32)
+            meta = {'documents': self.documents, 'total_length': self.total_length}
+            self._saved_terms = len(self._terms)
+            self._unsaved_documents = 0
+
+            # 단어 목록은 뒤에 추가만 하고, 배열과 메타 정보는 임시 파일에 쓴 뒤 교체
+            if new_terms:
+                with open(self.path / 'terms.txt', 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(new_terms) + '\n')
+            if len(new_hashes):
+                with open(self.path / 'documents.bin', 'ab') as f:
+                    new_hashes.tofile(f)
+            with open(self.path / 'df.tmp.npy', 'wb') as f:
+                np.save(f, df)
+            os.replace(self.path / 'df.tmp.npy', self.path / 'df.npy')
+            with open(self.path / 'meta.tmp.json', 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(self.path / 'meta.tmp.json', self.path / 'meta.json')
+
+    def stats(self) -> Dict[str, Any]:
+        """단어 수, 문서 수, 평균 문서 길이"""
+        return {
+            'terms': self._size,
+            'documents': self.documents,
+            'average_length': round(self.average_length(), 1)
+        }
+
+    def close(self) -> None:
+        """저장하지 않은 변경 내용을 기록하고 쓰기 잠금 해제"""
+        if self._unsaved_documents or self._saved_terms < len(self._terms):
+            self.save()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
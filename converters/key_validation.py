@@ -0,0 +1,223 @@
+"""
+API 키 검증 결과 캐시
+
+변환기를 고를 때마다 실제 완성 요청으로 키를 시험하면 변환 전에 유료 왕복이 한 번씩
+추가됩니다. 이 모듈은 모델 목록 조회처럼 과금되지 않는 가벼운 요청으로 키를 확인하고,
+결과를 API 키 해시별로 메모리와 SQLite에 저장해 프로세스 간에 공유합니다.
+TTL이 지난 결과는 일단 그대로 사용하고 백그라운드에서 다시 확인합니다.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+# 인증 실패로 판단할 HTTP 상태 코드
+AUTH_ERROR_STATUS = frozenset([401, 403])
+
+
+def hash_api_key(provider: str, api_key: str) -> str:
+    """캐시 키로 쓰는 제공자별 API 키 해시 (원본 키는 저장하지 않음)"""
+    return f"{provider}:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]}"
+
+
+def probe_api_key(provider: str, api_key: str, timeout: float = 10.0) -> Tuple[Optional[bool], str]:
+    """
+    과금되지 않는 가벼운 요청으로 API 키 확인
+
+    모델 목록 조회를 사용하며, 모델 목록 API가 없는 구버전 Anthropic SDK에서는
+    최소 길이 메시지 요청으로 대체합니다.
+
+    Args:
+        provider: API 제공자 ('anthropic' 또는 'openai')
+        api_key: 확인할 API 키
+        timeout: 요청 제한 시간 (초)
+
+    Returns:
+        (유효 여부, 오류 메시지) 튜플 - 네트워크 오류처럼 판단할 수 없으면 유효 여부가 None
+    """
+    try:
+        if provider == 'anthropic':
+            import anthropic
+            client = anthropic.Anthropic(api_key=api_key, timeout=timeout, max_retries=0)
+            models = getattr(client, 'models', None)
+            if models is not None:
+                models.list(limit=1)
+            else:
+                client.messages.create(
+                    model="claude-3-haiku-20240307",
+                    max_tokens=1,
+                    messages=[{"role": "user", "content": "Hi"}]
+                )
+        elif provider == 'openai':
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, timeout=timeout, max_retries=0)
+            client.models.list()
+        else:
+            return False, f"Unknown provider: {provider}"
+        return True, ''
+
+    except Exception as e:
+        if getattr(e, 'status_code', None) in AUTH_ERROR_STATUS:
+            return False, str(e)
+        return None, str(e)
+
+
+class KeyValidationCache:
+    """API 키 해시별 검증 결과 캐시 (메모리 + SQLite, 만료 시 백그라운드 재확인)"""
+
+    def __init__(self, db_path: str = 'data/key_validation.db', ttl_seconds: float = 6 * 3600,
+                 retry_seconds: float = 60.0, probe_timeout: float = 10.0):
+        """
+        캐시 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            ttl_seconds: 검증 결과 유효 시간 (초)
+            retry_seconds: 네트워크 오류 등으로 판단하지 못한 키를 다시 확인할 때까지의 시간 (초)
+            probe_timeout: 확인 요청 제한 시간 (초)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.probe_timeout = probe_timeout
+
+        self._lock = threading.Lock()
+        # 캐시 키 -> (유효 여부, 확인 시각, 판단 가능 여부)
+        self._memory: Dict[str, Tuple[bool, float, bool]] = {}
+        self._refreshing: Set[str] = set()
+        self._stats = {'hits': 0, 'probes': 0, 'background_refreshes': 0}
+
+        db_file = Path(db_path)
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS validations (
+                key TEXT PRIMARY KEY,
+                valid INTEGER NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def check(self, provider: str, api_key: str) -> bool:
+        """
+        API 키 유효 여부 반환
+
+        처음 보는 키만 동기적으로 확인하고, 이후에는 저장된 결과를 바로 반환합니다.
+
+        Args:
+            provider: API 제공자
+            api_key: 확인할 API 키
+
+        Returns:
+            API 키가 유효한지 여부
+        """
+        key = hash_api_key(provider, api_key)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    'SELECT valid, checked_at FROM validations WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (bool(row[0]), row[1], True)
+                    self._memory[key] = entry
+
+            if entry is not None:
+                valid, checked_at, definitive = entry
+                ttl = self.ttl_seconds if definitive else self.retry_seconds
+                if now - checked_at <= ttl:
+                    self._stats['hits'] += 1
+                    return valid
+                if definitive:
+                    # 만료된 결과는 그대로 쓰고 백그라운드에서 갱신
+                    self._stats['hits'] += 1
+                    self._refresh_in_background(provider, api_key, key)
+                    return valid
+
+        return self._validate(provider, api_key, key)
+
+    def _validate(self, provider: str, api_key: str, key: str) -> bool:
+        """키를 확인하고 결과 저장 (판단하지 못한 결과는 메모리에만 짧게 보관)"""
+        valid, error = probe_api_key(provider, api_key, self.probe_timeout)
+        if error:
+            print(f"⚠️  API 키 테스트 실패 ({provider}): {error}")
+
+        now = time.time()
+        with self._lock:
+            self._stats['probes'] += 1
+            if valid is None:
+                self._memory[key] = (False, now, False)
+                return False
+
+            self._memory[key] = (valid, now, True)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO validations (key, valid, checked_at) VALUES (?, ?, ?)',
+                (key, int(valid), now)
+            )
+            self._conn.commit()
+            return valid
+
+    def _refresh_in_background(self, provider: str, api_key: str, key: str) -> None:
+        """만료된 키를 데몬 스레드에서 다시 확인 (잠금 보유 상태에서 호출)"""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self._stats['background_refreshes'] += 1
+
+        def refresh():
+            try:
+                self._validate(provider, api_key, key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"key-refresh-{provider}", daemon=True).start()
+
+    def invalidate(self, provider: str, api_key: str) -> None:
+        """저장된 검증 결과 삭제 (키 교체나 인증 오류 발생 시)"""
+        key = hash_api_key(provider, api_key)
+        with self._lock:
+            self._memory.pop(key, None)
+            self._conn.execute('DELETE FROM validations WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/확인 요청 통계 반환"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats['entries'] = len(self._memory)
+        return stats
+
+    def close(self) -> None:
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+# 프로세스 전역 캐시 인스턴스
+_key_validation_cache: Optional[KeyValidationCache] = None
+_key_validation_cache_lock = threading.Lock()
+
+
+def get_key_validation_cache() -> KeyValidationCache:
+    """
+    전역 API 키 검증 캐시 반환 (환경 변수로 설정)
+
+    - KEY_VALIDATION_PATH: SQLite 파일 경로 (기본값: data/key_validation.db)
+    - KEY_VALIDATION_TTL: 검증 결과 유효 시간 초 (기본값: 6시간)
+    """
+    global _key_validation_cache
+    with _key_validation_cache_lock:
+        if _key_validation_cache is None:
+            _key_validation_cache = KeyValidationCache(
+                db_path=os.getenv('KEY_VALIDATION_PATH', 'data/key_validation.db'),
+                ttl_seconds=float(os.getenv('KEY_VALIDATION_TTL', 6 * 3600))
+            )
+        return _key_validation_cache
@@ -0,0 +1,490 @@
+"""
+LLM API 기반 변환기 공통 클래스
+
+Anthropic, OpenAI 변환기가 공유하는 프롬프트 구성, 응답 캐시, 마크다운 후처리,
+마크다운과 해시태그를 한 번의 호출로 받는 통합 변환, 본문 추출 압축과 입력 길이 제한,
+긴 기사 분할 변환, 토큰 사용량 집계를 제공합니다.
+각 변환기는 실제 API 요청(_request)만 구현합니다.
+"""
+
+import math
+import os
+import threading
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from text_utils.response_formatter import format_response
+from .base_converter import BaseConverter
+from .compression import compress_content
+from .prompts import (
+    build_markdown_prompt, build_keyword_prompt, build_combined_prompt,
+    build_chunk_prompt, build_merge_prompt, merge_sections, parse_combined_response
+)
+from .rate_limit import AdaptiveConcurrencyLimiter
+from .response_cache import get_response_cache, make_cache_key
+from .tokenizer import count_prompt_tokens, count_tokens, split_into_chunks, truncate_to_tokens
+
+
+class LLMConverter(BaseConverter):
+    """LLM API 기반 변환기 베이스 클래스"""
+
+    use_duplicate_index = True
+
+    # 고정 시스템 프롬프트와 기사별 메시지로 분리되어 이전 캐시 응답과 구분
+    prompt_version = '3'
+
+    # API 제공자 이름 (캐시 키와 오류 메시지에 사용)
+    provider = ''
+
+    # 호출별 최대 토큰 수
+    markdown_max_tokens = 2000
+    keyword_max_tokens = 300
+    combined_max_tokens = 2400
+
+    # 기사 본문 최대 입력 토큰 수 (LLM_MAX_INPUT_TOKENS 환경 변수로 변경, 넘으면 뒤쪽 문단부터 자름)
+    max_input_tokens = 6000
+
+    # 본문 추출 압축 예산 (LLM_COMPRESS_TOKENS 환경 변수로 설정, 0이면 끔)
+    # 켜면 중요 문장만 이 토큰 수 안에서 남겨 보냄 (숫자, 인용구, 주식 심볼 문장 우선)
+    compress_tokens = 0
+
+    # 긴 기사 분할 변환: 본문이 long_article_tokens(LLM_LONG_ARTICLE_TOKENS, 0이면 끔)를 넘으면
+    # chunk_tokens 이하의 부분으로 나눠 동시에 섹션을 정리하고, 짧은 호출로 제목과 전망을 붙임
+    long_article_tokens = 4000
+    chunk_tokens = 1500
+    max_chunks = 8
+    chunk_max_tokens = 800
+    merge_max_tokens = 400
+
+    def __init__(self, output_dir: str = 'data/generated'):
+        """
+        LLM 변환기 초기화
+
+        Args:
+            output_dir: 출력 디렉토리 경로
+        """
+        super().__init__(output_dir)
+        self.model = ''
+        self.response_cache = get_response_cache()
+        self.max_input_tokens = int(os.getenv('LLM_MAX_INPUT_TOKENS', self.max_input_tokens))
+        self.long_article_tokens = int(os.getenv('LLM_LONG_ARTICLE_TOKENS', self.long_article_tokens))
+        self.compress_tokens = int(os.getenv('LLM_COMPRESS_TOKENS', self.compress_tokens))
+
+        # 긴 기사 부분별 동시 호출용 스레드 풀 (처음 사용할 때 생성)
+        self._chunk_executor: Optional[ThreadPoolExecutor] = None
+        self._chunk_executor_lock = threading.Lock()
+
+        # 제공자·API 키별 적응형 동시 요청 제어 (각 변환기가 클라이언트와 함께 설정)
+        self.concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+
+        # 실제 API 응답 기준 토큰 사용량 (프롬프트 캐시 적중 포함)
+        self._usage_lock = threading.Lock()
+        self._usage = {
+            'requests': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_tokens': 0,
+            'cache_creation_tokens': 0,
+            # 요청 전에 로컬 토크나이저로 계산한 입력 토큰 (실제 input_tokens와 비교용)
+            'estimated_input_tokens': 0,
+            'truncated_articles': 0,
+            'truncated_tokens': 0,
+            'compressed_articles': 0,
+            'compression_saved_tokens': 0
+        }
+
+    @abstractmethod
+    def build_request_params(self, system: str, prompt: str, max_tokens: int, temperature: float,
+                             json_mode: bool = False) -> Dict[str, Any]:
+        """
+        제공자 API 요청 본문 생성 (각 변환기에서 구현, 배치 작업에서도 사용)
+
+        Args:
+            system: 고정 시스템 프롬프트
+            prompt: 기사별 사용자 메시지
+            max_tokens: 최대 토큰 수
+            temperature: 창의성 수준
+            json_mode: JSON 객체 응답을 요청할지 여부
+
+        Returns:
+            SDK 생성 메서드에 전달할 파라미터
+        """
+        pass
+
+    @abstractmethod
+    def parse_response(self, response, json_mode: bool = False) -> Tuple[str, Dict[str, int]]:
+        """
+        제공자 API 응답에서 텍스트와 토큰 사용량 추출 (각 변환기에서 구현)
+
+        Args:
+            response: API 응답 객체
+            json_mode: JSON 객체 응답을 요청했는지 여부
+
+        Returns:
+            (API 응답 텍스트, 토큰 사용량) 튜플
+        """
+        pass
+
+    @abstractmethod
+    def _request(self, system: str, prompt: str, max_tokens: int, temperature: float,
+                 json_mode: bool = False) -> Tuple[str, Dict[str, int]]:
+        """
+        API 요청 (각 변환기에서 구현)
+
+        Args:
+            system: 고정 시스템 프롬프트 (프롬프트 캐시 대상)
+            prompt: 기사별 사용자 메시지
+            max_tokens: 최대 토큰 수
+            temperature: 창의성 수준
+            json_mode: JSON 객체 응답을 요청할지 여부
+
+        Returns:
+            (API 응답 텍스트, 토큰 사용량) 튜플 - 사용량 키는
+            input_tokens, output_tokens, cache_read_tokens, cache_creation_tokens
+        """
+        pass
+
+    def call_api(self, prompt: str, max_tokens: int = 2000, temperature: float = 0,
+                 json_mode: bool = False, system: str = '') -> str:
+        """
+        API 호출 (응답 캐시 적용)
+
+        Args:
+            prompt: 기사별 사용자 메시지
+            max_tokens: 최대 토큰 수
+            temperature: 창의성 수준
+            json_mode: JSON 객체 응답을 요청할지 여부
+            system: 고정 시스템 프롬프트
+
+        Returns:
+            API 응답 텍스트
+        """
+        cache_key = self.cache_key(prompt, max_tokens, temperature, json_mode, system)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        def request():
+            return self._request(system, prompt, max_tokens, temperature, json_mode)
+
+        try:
+            if self.concurrency is not None:
+                # 요청 한도 오류 시 동시 요청 수를 줄이고 retry-after만큼 기다린 뒤 재시도
+                text, usage = self.concurrency.run(request)
+            else:
+                text, usage = request()
+        except Exception as e:
+            raise RuntimeError(f"{self.provider.capitalize()} API call failed: {str(e)}")
+
+        usage['estimated_input_tokens'] = count_prompt_tokens(system, prompt, self.model)
+        self.record_usage(usage)
+        self.response_cache.set(cache_key, text)
+        return text
+
+    def duplicate_namespace(self) -> str:
+        """
+        중복 인덱스 네임스페이스 (제공자·모델까지 같을 때만 결과 재사용)
+
+        Returns:
+            변환기 클래스, 제공자, 모델, 프롬프트 버전 문자열
+        """
+        return f"{self.__class__.__name__}:{self.provider}:{self.model}:{self.prompt_version}"
+
+    def cache_key(self, prompt: str, max_tokens: int = 2000, temperature: float = 0,
+                  json_mode: bool = False, system: str = '') -> str:
+        """call_api와 같은 인자로 응답 캐시 키 생성"""
+        params = {'max_tokens': max_tokens, 'temperature': temperature}
+        if json_mode:
+            params['json_mode'] = True
+        return make_cache_key(
+            self.provider, self.model, self.prompt_version, params, system + prompt
+        )
+
+    def record_usage(self, usage: Dict[str, int]) -> None:
+        """API 응답의 토큰 사용량 누적"""
+        with self._usage_lock:
+            self._usage['requests'] += 1
+            for key, value in usage.items():
+                if key in self._usage:
+                    self._usage[key] += int(value or 0)
+
+    def fit_content(self, content: str, max_tokens: Optional[int] = None) -> str:
+        """
+        본문을 입력 토큰 한도에 맞춤 (뒤쪽 문단부터 제거)
+
+        Args:
+            content: 정제된 기사 본문
+            max_tokens: 최대 토큰 수 (기본값: max_input_tokens)
+
+        Returns:
+            한도 안의 본문
+        """
+        max_tokens = max_tokens or self.max_input_tokens
+        fitted, total = truncate_to_tokens(content, max_tokens, self.model)
+        if fitted is not content:
+            dropped = total - count_tokens(fitted, self.model)
+            print(f"✂️  본문이 입력 한도({max_tokens:,} 토큰)를 넘어 뒤쪽 {dropped:,} 토큰을 잘랐습니다")
+            with self._usage_lock:
+                self._usage['truncated_articles'] += 1
+                self._usage['truncated_tokens'] += dropped
+        return fitted
+
+    def compress(self, content: str, title: str = '') -> str:
+        """
+        본문 추출 압축 (compress_tokens가 0이면 그대로 반환)
+
+        Args:
+            content: 정제된 기사 본문
+            title: 기사 제목 (제목과 겹치는 문장에 가중치)
+
+        Returns:
+            압축된 본문
+        """
+        if not self.compress_tokens:
+            return content
+
+        compressed, stats = compress_content(content, self.compress_tokens, self.model, title)
+        if stats['saved_tokens'] > 0:
+            print(f"🗜️  본문 압축: {stats['original_tokens']:,} → {stats['compressed_tokens']:,} 토큰 "
+                  f"({stats['ratio']:.0%}, 문장 {stats['sentences_kept']}/{stats['sentences_total']}, "
+                  f"입력 {stats['saved_tokens']:,} 토큰 절감)")
+            with self._usage_lock:
+                self._usage['compressed_articles'] += 1
+                self._usage['compression_saved_tokens'] += stats['saved_tokens']
+        return compressed
+
+    def usage_stats(self) -> Dict[str, float]:
+        """
+        누적 토큰 사용량 반환
+
+        Returns:
+            요청 수, 입력/출력 토큰, 프롬프트 캐시 읽기/쓰기 토큰, 로컬 계산 입력 토큰,
+            입력 한도로 잘린 기사/토큰 수, 추출 압축한 기사/절감 토큰 수와
+            입력 토큰 중 캐시에서 읽은 비율(cache_read_ratio)
+        """
+        with self._usage_lock:
+            stats: Dict[str, float] = dict(self._usage)
+
+        # Anthropic은 캐시 토큰을 input_tokens와 별도로, OpenAI는 포함해서 보고하므로
+        # 각 변환기가 input_tokens를 캐시 토큰을 포함한 전체 입력으로 맞춰 보고함
+        total_input = stats['input_tokens']
+        stats['cache_read_ratio'] = stats['cache_read_tokens'] / total_input if total_input else 0.0
+        return stats
+
+    def close(self) -> None:
+        """API 클라이언트 연결 풀, 분할 변환 스레드 풀과 중복 인덱스 종료 (응답 캐시는 프로세스 전역이므로 유지)"""
+        with self._chunk_executor_lock:
+            if self._chunk_executor is not None:
+                self._chunk_executor.shutdown(wait=False)
+                self._chunk_executor = None
+        client = getattr(self, 'client', None)
+        if client is not None:
+            client.close()
+            self.client = None
+        super().close()
+
+    def extract_keywords(self, content: str, compressed: bool = False) -> str:
+        """
+        AI 기반 키워드 추출
+
+        Args:
+            content: 분석할 내용
+            compressed: 이미 압축한 본문이 들어 있어 다시 압축하지 않을지 여부
+
+        Returns:
+            해시태그 형식의 키워드
+        """
+        if not compressed:
+            content = self.compress(content)
+        system, prompt = build_keyword_prompt(self.fit_content(content))
+        return self.call_api(prompt, max_tokens=self.keyword_max_tokens, system=system)
+
+    def convert_to_markdown(self, data: Dict[str, str], content: Optional[str] = None) -> str:
+        """
+        AI 기반 마크다운 변환
+
+        Args:
+            data: 구조화된 뉴스 데이터
+            content: compressed_content로 이미 압축한 본문 (없으면 여기서 압축)
+
+        Returns:
+            마크다운 형식의 문자열
+        """
+        if content is None:
+            content = self.compressed_content(data)
+        if self.is_long_article(content):
+            return self.convert_long_article(data, content)[0]
+
+        system, prompt = build_markdown_prompt(data['title'], data['description'], self.fit_content(content))
+        response = self.call_api(prompt, max_tokens=self.markdown_max_tokens, system=system)
+        return self._postprocess_markdown(response)
+
+    def convert_with_keywords(self, data: Dict[str, str]) -> Tuple[str, str]:
+        """
+        마크다운과 해시태그를 한 번의 API 호출로 생성
+
+        응답이 JSON 형식 검증을 통과하지 못하면 기존의 두 번 호출 방식으로 대체하고,
+        긴 기사는 분할 변환으로 처리합니다.
+
+        Args:
+            data: 구조화된 뉴스 데이터
+
+        Returns:
+            (마크다운, 해시태그 문자열) 튜플
+        """
+        # 기사당 한 번만 압축해 요청 생성과 개별 호출 대체에 함께 사용
+        content = self.compressed_content(data)
+        if self.is_long_article(content):
+            return self.convert_long_article(data, content, with_keywords=True)
+
+        response = self.call_api(**self.combined_request(data, content))
+        return self.finish_combined(data, response, content=content)
+
+    def compressed_content(self, data: Dict[str, str]) -> str:
+        """
+        API에 보낼 본문 (정제 후 추출 압축, 압축 통계는 호출할 때마다 기록되므로 기사당 한 번 호출)
+
+        Args:
+            data: 구조화된 뉴스 데이터
+
+        Returns:
+            압축된 본문
+        """
+        return self.compress(self.analyze(data).cleaned, data['title'])
+
+    def combined_request(self, data: Dict[str, str], content: Optional[str] = None) -> Dict[str, Any]:
+        """
+        통합 변환 요청의 call_api 인자 생성
+
+        Args:
+            data: 구조화된 뉴스 데이터
+            content: compressed_content로 이미 압축한 본문 (없으면 여기서 압축)
+
+        Returns:
+            prompt, max_tokens, temperature, json_mode, system 딕셔너리
+        """
+        if content is None:
+            content = self.compressed_content(data)
+        system, prompt = build_combined_prompt(data['title'], data['description'], self.fit_content(content))
+        return {
+            'prompt': prompt,
+            'max_tokens': self.combined_max_tokens,
+            'temperature': 0,
+            'json_mode': True,
+            'system': system
+        }
+
+    def is_long_article(self, content: str) -> bool:
+        """분할 변환 대상인지 여부 (정제된 본문 토큰 수 기준)"""
+        return 0 < self.long_article_tokens < count_tokens(content, self.model)
+
+    def _get_chunk_executor(self) -> ThreadPoolExecutor:
+        with self._chunk_executor_lock:
+            if self._chunk_executor is None:
+                self._chunk_executor = ThreadPoolExecutor(
+                    max_workers=self.max_chunks, thread_name_prefix='llm-chunk'
+                )
+            return self._chunk_executor
+
+    def convert_long_article(self, data: Dict[str, str], content: str,
+                             with_keywords: bool = False) -> Tuple[str, str]:
+        """
+        긴 기사 분할 변환
+
+        본문을 문단 경계에서 비슷한 크기의 부분으로 나눠 부분마다 섹션 정리를 동시에 요청하고,
+        정리된 섹션을 합친 뒤 짧은 호출로 제목과 전망 섹션만 받아 붙입니다. 출력 생성이
+        부분 수만큼 병렬로 나뉘므로 긴 기사의 변환 시간이 크게 줄어듭니다.
+
+        Args:
+            data: 구조화된 뉴스 데이터
+            content: 정제된 기사 본문
+            with_keywords: 해시태그도 함께 생성할지 여부 (제목 작성과 동시에 요청)
+
+        Returns:
+            (마크다운, 해시태그 문자열) 튜플 - with_keywords가 False면 해시태그는 빈 문자열
+        """
+        content = self.fit_content(content, self.chunk_tokens * self.max_chunks)
+        total = count_tokens(content, self.model)
+
+        # 부분 크기를 고르게 맞춰 가장 오래 걸리는 부분의 출력 길이를 줄임
+        parts = max(1, math.ceil(total / self.chunk_tokens))
+        target = max(1, min(self.chunk_tokens, math.ceil(total / parts * 1.2)))
+        chunks = split_into_chunks(content, target, self.model)
+        if len(chunks) > self.max_chunks:
+            chunks = split_into_chunks(content, self.chunk_tokens, self.model)[:self.max_chunks]
+        print(f"🧩 긴 기사 분할 변환: {total:,} 토큰을 {len(chunks)}개 부분으로 나눠 동시 처리")
+
+        executor = self._get_chunk_executor()
+        futures = []
+        for index, chunk in enumerate(chunks, 1):
+            system, prompt = build_chunk_prompt(data['title'], data['description'], chunk, index, len(chunks))
+            futures.append(executor.submit(
+                self.call_api, prompt, max_tokens=self.chunk_max_tokens, system=system
+            ))
+        sections = merge_sections([future.result() for future in futures])
+
+        keywords_future = None
+        if with_keywords:
+            keywords_future = executor.submit(
+                self.extract_keywords, f"{data['title']}\n{data['description']}\n{sections}"
+            )
+        system, prompt = build_merge_prompt(data['title'], data['description'], sections)
+        header = self.call_api(prompt, max_tokens=self.merge_max_tokens, system=system).strip()
+
+        # 첫 줄은 제목, 나머지는 전망 섹션 (제목 없이 섹션부터 오면 원래 기사 제목 사용)
+        title, _, closing = header.partition('\n')
+        if title.lstrip().startswith('▶'):
+            title, closing = data['title'], header
+        parts = [title.strip(), sections, closing.strip()]
+        markdown = self._postprocess_markdown('\n\n'.join(part for part in parts if part))
+
+        keywords = keywords_future.result() if keywords_future is not None else ''
+        return markdown, keywords
+
+    def finish_combined(self, data: Dict[str, str], response: str, fallback: bool = True,
+                        content: Optional[str] = None) -> Tuple[str, str]:
+        """
+        통합 변환 응답을 검증하고 (마크다운, 해시태그 문자열)로 변환
+
+        검증에 실패하면 마크다운 변환과 키워드 추출을 따로 호출합니다.
+
+        Args:
+            data: 구조화된 뉴스 데이터
+            response: 통합 프롬프트 응답 텍스트
+            fallback: 검증 실패 시 개별 호출로 대체할지 여부 (False면 ValueError)
+            content: 요청에 쓴 압축 본문 (개별 호출에 재사용, 없으면 대체할 때 한 번 압축)
+
+        Returns:
+            (마크다운, 해시태그 문자열) 튜플
+
+        Raises:
+            ValueError: fallback이 False이고 응답이 검증을 통과하지 못한 경우
+        """
+        try:
+            markdown, hashtags = parse_combined_response(response)
+        except ValueError as e:
+            if not fallback:
+                raise
+            print(f"⚠️  통합 응답 파싱 실패, 개별 호출로 대체: {str(e)}")
+            if content is None:
+                content = self.compressed_content(data)
+            markdown_content = self.convert_to_markdown(data, content)
+            keywords = self.extract_keywords(
+                f"{data['title']}\n{data['description']}\n{content}", compressed=True
+            )
+            return markdown_content, keywords
+
+        return self._postprocess_markdown(markdown), ' '.join(hashtags)
+
+    def _postprocess_markdown(self, text: str) -> str:
+        """
+        마크다운 응답 후처리 (제목 이모지, 주식 심볼 - 백엔드와 같은 규칙)
+
+        Args:
+            text: API 응답 마크다운
+
+        Returns:
+            후처리된 마크다운
+        """
+        return format_response(text, linker=self.ticker_linker)
@@ -0,0 +1,371 @@
+"""
+로컬 변환기 일괄 처리 엔진
+
+여러 기사의 문장을 한 번에 토큰화해 코퍼스 단어 사전의 정수 ID로 바꾸고,
+(문서, 단어) 빈도와 (문장, 단어) 등장을 희소 좌표 배열로 만들어 NumPy 연산으로
+모든 기사의 문장 점수, 기사별 상위 문장, 섹션명 후보, 해시태그 후보를 한 번에 계산합니다.
+IdfIndex 없이 실행하면 결과는 LocalConverter의 기사 안 단어 빈도 기반 처리와 같고,
+IdfIndex를 주면 코퍼스 문서 빈도를 반영한 BM25 가중치로 순위를 매깁니다.
+"""
+
+import re
+from itertools import chain, islice, repeat
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from text_utils.keyword_matcher import KeywordMatcher
+
+from .analysis import join_phrases
+from .idf_index import IdfIndex, document_hash
+
+# 여러 텍스트를 이어 붙여 한 번에 토큰화할 때 텍스트 사이에 넣는 구분 문자
+_ROW_SEPARATOR = '\x00'
+
+# BM25 파라미터 (단어 빈도 포화, 문서 길이 정규화 정도)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 키워드 추출 전처리 (LocalConverter.extract_keywords와 동일, 구분 문자는 유지)
+_NON_KEYWORD_CHARS = re.compile(r'[^\w\s가-힣\x00]')
+
+
+class TermTable:
+    """코퍼스 단어 사전 (단어 → 정수 ID)과 단어별 속성 배열 (배치 사이에 재사용)"""
+
+    def __init__(self, stopwords: Set[str], section_keys: Sequence[str],
+                 keyword_mapping: Dict[str, str]):
+        """
+        Args:
+            stopwords: 불용어
+            section_keys: 섹션명 매핑 키 (앞에 있을수록 우선)
+            keyword_mapping: 영어 키워드 → 한국어 매핑
+        """
+        self.stopwords = stopwords
+        self.section_keys = list(section_keys)
+        self.keyword_mapping = keyword_mapping
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        # 불용어가 아니고 두 글자 이상인 단어
+        self.content = np.zeros(0, dtype=bool)
+        # 단어에 포함된 섹션명 매핑 키 비트마스크 (비트 i = section_keys[i])
+        self.section_bits = np.zeros(0, dtype=np.int64)
+        # 영어 키워드 매핑이 있는 단어
+        self.mapped = np.zeros(0, dtype=bool)
+        # 단어별 IdfIndex 단어 ID (-1은 아직 조회하지 않음, plan_batch에서 필요할 때 채움)
+        self.index_ids = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def encode(self, tokens: List[str]) -> np.ndarray:
+        """
+        단어 리스트를 정수 ID 배열로 변환 (처음 나온 단어는 사전에 추가)
+
+        Args:
+            tokens: 단어 리스트
+
+        Returns:
+            단어 ID 배열 (int64)
+        """
+        ids = self.ids
+        encoded = np.fromiter(map(ids.get, tokens, repeat(-1)), dtype=np.int64, count=len(tokens))
+        missing = np.flatnonzero(encoded < 0)
+        if len(missing):
+            # 사전에 없던 단어는 처음 나온 순서대로 등록
+            missing_tokens = [tokens[position] for position in missing.tolist()]
+            for token in dict.fromkeys(missing_tokens):
+                ids[token] = len(ids)
+            encoded[missing] = np.fromiter(map(ids.__getitem__, missing_tokens),
+                                           dtype=np.int64, count=len(missing_tokens))
+            self._extend()
+        return encoded
+
+    def _extend(self) -> None:
+        """새로 추가된 단어의 속성 계산"""
+        new_terms = list(islice(self.ids, len(self.terms), None))
+        self.terms.extend(new_terms)
+        count = len(new_terms)
+
+        content = np.fromiter(
+            (term not in self.stopwords and len(term) > 1 for term in new_terms),
+            dtype=bool, count=count
+        )
+        section_bits = np.fromiter(
+            (sum(1 << bit for bit, key in enumerate(self.section_keys) if key in term)
+             for term in new_terms),
+            dtype=np.int64, count=count
+        )
+        mapped = np.fromiter((term in self.keyword_mapping for term in new_terms),
+                             dtype=bool, count=count)
+
+        self.content = np.concatenate([self.content, content])
+        self.section_bits = np.concatenate([self.section_bits, section_bits])
+        self.mapped = np.concatenate([self.mapped, mapped])
+        self.index_ids = np.concatenate([self.index_ids, np.full(count, -1, dtype=np.int64)])
+
+
+def _encode_rows(table: TermTable, texts: List[str], pattern: Optional[re.Pattern] = None,
+                 phrases: Optional[KeywordMatcher] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 텍스트를 소문자로 바꿔 공백 단위로 토큰화하고 단어 ID로 변환 (텍스트별 lower().split()과 같은 결과)
+
+    텍스트 사이에 구분 토큰을 넣어 이어 붙이고 lower/sub/split을 한 번씩만 호출합니다.
+
+    Args:
+        table: 단어 사전
+        texts: 텍스트 리스트
+        pattern: split 전에 공백으로 바꿀 문자 패턴 (구분 문자는 제외해야 함)
+        phrases: split 전에 한 단어로 이을 여러 단어 키워드 사전
+
+    Returns:
+        (이어 붙인 단어 ID 배열, 텍스트별 토큰 수) 튜플
+    """
+    joined = f' {_ROW_SEPARATOR} '.join(texts)
+    if joined.count(_ROW_SEPARATOR) != max(len(texts) - 1, 0):
+        # 본문에 구분 문자가 들어 있으면 텍스트별로 토큰화
+        token_lists = [
+            join_phrases(pattern.sub(' ', text.lower()) if pattern else text.lower(), phrases).split()
+            for text in texts
+        ]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        return table.encode(list(chain.from_iterable(token_lists))), lengths
+
+    joined = joined.lower()
+    if pattern is not None:
+        joined = pattern.sub(' ', joined)
+    joined = join_phrases(joined, phrases)
+    term_ids = table.encode(joined.split())
+
+    separator = term_ids == table.ids.get(_ROW_SEPARATOR, -1)
+    token_rows = np.cumsum(separator)[~separator]
+    return term_ids[~separator], np.bincount(token_rows, minlength=len(texts))
+
+
+def _term_counts(table: TermTable, term_ids: np.ndarray, token_rows: np.ndarray,
+                 vocabulary_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (행, 단어) 빈도 희소 행렬 (불용어 제외)
+
+    Args:
+        table: 단어 사전
+        term_ids: 단어 ID 배열
+        token_rows: 단어별 행 번호
+        vocabulary_size: 키 계산에 쓸 사전 크기 (V)
+
+    Returns:
+        (정렬된 행*V+단어 키, 빈도, 키별 첫 등장 위치, 필터링 후 행 번호) 튜플
+    """
+    keep = table.content[term_ids]
+    keys = token_rows[keep] * vocabulary_size + term_ids[keep]
+    unique_keys, first_index, counts = np.unique(keys, return_index=True, return_counts=True)
+    return unique_keys, counts, first_index, token_rows[keep]
+
+
+class BatchPlan:
+    """기사별 선택 문장과 섹션/해시태그 계산 결과"""
+
+    __slots__ = ('selected', 'section_bits', 'has_words', 'keywords')
+
+    def __init__(self, selected: List[int], section_bits: List[int], has_words: List[bool],
+                 keywords: List[str]):
+        self.selected = selected
+        self.section_bits = section_bits
+        self.has_words = has_words
+        self.keywords = keywords
+
+
+def plan_batch(table: TermTable, contents: List[str], sentence_lists: List[List[str]],
+               keyword_texts: Iterable[str], num_sentences: int = 8, max_keywords: int = 7,
+               idf_index: Optional[IdfIndex] = None, update_index: bool = True,
+               phrases: Optional[KeywordMatcher] = None) -> List[BatchPlan]:
+    """
+    여러 기사의 핵심 문장, 섹션명 비트, 해시태그 후보를 한 번에 계산
+
+    idf_index가 없으면 기사 안의 단어 빈도로 점수를 매깁니다 (기사별 처리와 같은 결과).
+    있으면 기사를 인덱스에 추가한 뒤 단어별 BM25 가중치로 문장과 해시태그 순위를 매겨,
+    어느 기사에나 나오는 흔한 단어의 영향을 줄입니다. 이미 인덱스에 있는 기사(키워드 텍스트의
+    내용 해시가 같은 기사)는 다시 추가하지 않아 같은 기사를 여러 번 변환해도 문서 빈도가 늘지 않습니다.
+
+    Args:
+        table: 단어 사전
+        contents: 기사별 정제된 본문
+        sentence_lists: 기사별 문장 리스트
+        keyword_texts: 기사별 키워드 추출 대상 텍스트 (제목, 설명, 원본 본문)
+        num_sentences: 기사별 최대 핵심 문장 수
+        max_keywords: 기사별 최대 해시태그 수
+        idf_index: 코퍼스 문서 빈도 인덱스
+        update_index: 기사를 idf_index에 추가할지 여부
+        phrases: 한 단어로 볼 여러 단어 키워드 사전 (키워드 텍스트, BM25 모드의 문장에 적용)
+
+    Returns:
+        기사 순서의 BatchPlan 리스트
+    """
+    num_docs = len(contents)
+    doc_rows = np.arange(num_docs, dtype=np.int64)
+    sentences_per_doc = np.fromiter(map(len, sentence_lists), dtype=np.int64, count=num_docs)
+    sentence_docs = np.repeat(doc_rows, sentences_per_doc)
+    num_sentences_total = len(sentence_docs)
+    sentences = list(chain.from_iterable(sentence_lists))
+
+    # 모든 텍스트를 먼저 단어 ID로 바꿔 사전 크기(V)를 고정
+    keyword_texts = list(keyword_texts)
+    keyword_ids, keyword_lengths = _encode_rows(table, keyword_texts, _NON_KEYWORD_CHARS, phrases)
+    if idf_index is None:
+        # 공백 단위 원문 단어, 문장이 num_sentences개를 넘는 기사만 점수가 필요
+        term_ids, sentence_lengths = _encode_rows(table, sentences)
+        long_docs = np.flatnonzero(sentences_per_doc > num_sentences)
+        doc_term_ids, doc_lengths = _encode_rows(table, [contents[doc] for doc in long_docs])
+    else:
+        # 구두점을 뗀 단어 (인덱스와 같은 기준)
+        term_ids, sentence_lengths = _encode_rows(table, sentences, _NON_KEYWORD_CHARS, phrases)
+    vocabulary_size = len(table)
+    token_sentences = np.repeat(np.arange(num_sentences_total, dtype=np.int64), sentence_lengths)
+
+    keyword_keys, keyword_counts, keyword_first, keyword_rows = _term_counts(
+        table, keyword_ids, np.repeat(doc_rows, keyword_lengths), vocabulary_size
+    )
+    if idf_index is None:
+        # 문장 단어 가중치 = 기사 안의 단어 빈도
+        doc_keys, doc_weights, _, _ = _term_counts(
+            table, doc_term_ids, np.repeat(long_docs, doc_lengths), vocabulary_size
+        )
+        keyword_weights = None
+    else:
+        # 문장 단어와 해시태그 가중치 = 기사 단어의 BM25 가중치
+        doc_keys = keyword_keys
+        doc_weights = keyword_weights = _bm25_weights(
+            table, idf_index, keyword_keys, keyword_counts,
+            np.bincount(keyword_rows, minlength=num_docs), vocabulary_size,
+            [document_hash(text) for text in keyword_texts] if update_index else None
+        )
+
+    # 문장 점수 = 문장 단어 가중치 합 / 문장 단어 수
+    scores = np.zeros(num_sentences_total)
+    if len(doc_keys) and len(term_ids):
+        token_keys = sentence_docs[token_sentences] * vocabulary_size + term_ids
+        position = np.minimum(np.searchsorted(doc_keys, token_keys), len(doc_keys) - 1)
+        weights = np.where(doc_keys[position] == token_keys, doc_weights[position], 0)
+        totals = np.bincount(token_sentences, weights=weights, minlength=num_sentences_total)
+        np.divide(totals, sentence_lengths, out=scores, where=sentence_lengths > 0)
+
+    # 기사별로 점수 내림차순 (같은 점수는 앞 문장 우선) 순위를 매겨 상위 문장 선택
+    order = np.lexsort((np.arange(num_sentences_total), -scores, sentence_docs))
+    doc_starts = np.concatenate([[0], np.cumsum(sentences_per_doc)[:-1]]) if num_docs else np.zeros(0, np.int64)
+    ranks = np.empty(num_sentences_total, dtype=np.int64)
+    ranks[order] = np.arange(num_sentences_total) - doc_starts[sentence_docs[order]]
+    selected = ranks < num_sentences
+
+    # 문장별 섹션명 매핑 키 비트 (단어 비트의 OR)와 불용어가 아닌 단어 포함 여부
+    sentence_bits = np.zeros(num_sentences_total, dtype=np.int64)
+    has_words = np.zeros(num_sentences_total, dtype=bool)
+    if len(term_ids):
+        nonempty = np.flatnonzero(sentence_lengths > 0)
+        starts = np.concatenate([[0], np.cumsum(sentence_lengths)[:-1]])[nonempty]
+        sentence_bits[nonempty] = np.bitwise_or.reduceat(table.section_bits[term_ids], starts)
+        has_words = np.bincount(token_sentences, weights=table.content[term_ids],
+                                minlength=num_sentences_total) > 0
+
+    keywords = _plan_keywords(table, keyword_keys, keyword_counts, keyword_first, keyword_weights,
+                              num_docs, vocabulary_size, max_keywords)
+
+    plans = []
+    for doc in range(num_docs):
+        start = int(doc_starts[doc])
+        indices = np.flatnonzero(selected[start:start + sentences_per_doc[doc]]) + start
+        plans.append(BatchPlan(
+            selected=(indices - start).tolist(),
+            section_bits=sentence_bits[indices].tolist(),
+            has_words=has_words[indices].tolist(),
+            keywords=keywords[doc]
+        ))
+    return plans
+
+
+def _bm25_weights(table: TermTable, idf_index: IdfIndex, keys: np.ndarray, counts: np.ndarray,
+                  doc_lengths: np.ndarray, vocabulary_size: int,
+                  doc_hashes: Optional[List[int]]) -> np.ndarray:
+    """
+    (기사, 단어)별 BM25 가중치 idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * 문서 길이 / 평균 길이))
+
+    Args:
+        table: 단어 사전
+        idf_index: 코퍼스 문서 빈도 인덱스
+        keys: 정렬된 기사*V+단어 키 (기사별로 중복 없음)
+        counts: 키별 기사 안의 단어 빈도
+        doc_lengths: 기사별 단어 수
+        vocabulary_size: 키 계산에 쓴 사전 크기
+        doc_hashes: 기사별 document_hash (있으면 인덱스에 없는 기사를 추가한 뒤 계산)
+
+    Returns:
+        키별 가중치 배열
+    """
+    docs, term_ids = np.divmod(keys, vocabulary_size)
+    update_index = doc_hashes is not None
+    index_ids = _index_ids(table, idf_index, term_ids, update_index)
+    if update_index:
+        idf_index.add_documents(index_ids, doc_lengths.tolist(), doc_hashes, docs)
+
+    length_norm = 1 - BM25_B + BM25_B * doc_lengths[docs] / idf_index.average_length()
+    return idf_index.idf(index_ids) * counts * (BM25_K1 + 1) / (counts + BM25_K1 * length_norm)
+
+
+def _index_ids(table: TermTable, idf_index: IdfIndex, term_ids: np.ndarray, add: bool) -> np.ndarray:
+    """
+    단어 사전 ID를 인덱스 단어 ID로 변환 (처음 보는 단어만 인덱스에서 조회해 table에 기록)
+
+    Args:
+        table: 단어 사전
+        idf_index: 코퍼스 문서 빈도 인덱스
+        term_ids: 단어 사전 ID 배열
+        add: 인덱스에 없는 단어를 추가할지 여부 (False면 -1로 남김)
+
+    Returns:
+        인덱스 단어 ID 배열
+    """
+    unknown = np.unique(term_ids[table.index_ids[term_ids] < 0])
+    if len(unknown):
+        found = idf_index.term_ids([table.terms[term_id] for term_id in unknown.tolist()], add=add)
+        table.index_ids[unknown] = found
+    return table.index_ids[term_ids]
+
+
+def _plan_keywords(table: TermTable, keys: np.ndarray, counts: np.ndarray, first_index: np.ndarray,
+                   weights: Optional[np.ndarray], num_docs: int, vocabulary_size: int,
+                   max_keywords: int) -> List[List[str]]:
+    """
+    기사별 해시태그 키워드 (매핑된 영어 단어는 한국어로, 나머지는 2회 이상 등장한 단어)
+
+    Args:
+        table: 단어 사전
+        keys: 정렬된 기사*V+단어 키
+        counts: 키별 기사 안의 단어 빈도
+        first_index: 키별 첫 등장 위치
+        weights: 키별 BM25 가중치 (None이면 처음 등장 순서로 고름)
+        num_docs: 기사 수
+        vocabulary_size: 키 계산에 쓴 사전 크기
+        max_keywords: 기사별 최대 키워드 수
+
+    Returns:
+        기사별 키워드 리스트
+    """
+    docs, term_ids = np.divmod(keys, vocabulary_size)
+
+    # 후보를 기사 번호, (가중치 내림차순,) 첫 등장 위치 순으로 정렬
+    candidate = table.mapped[term_ids] | (counts > 1)
+    docs, term_ids, first_index = docs[candidate], term_ids[candidate], first_index[candidate]
+    if weights is None:
+        order = np.lexsort((first_index, docs))
+    else:
+        order = np.lexsort((first_index, -weights[candidate], docs))
+
+    keywords: List[List[str]] = [[] for _ in range(num_docs)]
+    for doc, term_id in zip(docs[order].tolist(), term_ids[order].tolist()):
+        labels = keywords[doc]
+        if len(labels) >= max_keywords:
+            continue
+        term = table.terms[term_id]
+        label = table.keyword_mapping.get(term, term)
+        if label not in labels:
+            labels.append(label)
+    return keywords
@@ -2,19 +2,39 @@
 로컬 규칙 기반 뉴스 변환기
 
 API 없이 로컬에서 작동하는 변환기로, 규칙 기반 알고리즘을 사용하여 
-뉴스 기사를 마크다운으로 변환합니다.
+뉴스 기사를 마크다운으로 변환합니다. 여러 기사는 convert_many로 한 번에
+토큰화하고 NumPy 연산으로 점수를 계산해 빠르게 변환합니다. 코퍼스 문서 빈도
+인덱스(IdfIndex)를 쓰면 변환한 기사가 쌓일수록 흔한 단어의 가중치를 낮춘
+BM25 점수로 핵심 문장과 해시태그를 고릅니다.
 """
 
+import os
 import re
 import math
-from typing import Dict, List, Tuple
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
+from text_utils.keyword_matcher import KeywordMatcher
+
+from .analysis import PHRASE_JOINER, ArticleAnalysis, keyword_tokens, split_sentences
 from .base_converter import BaseConverter
+from .idf_index import IdfIndex
+from .local_batch import TermTable, plan_batch
 
 
 class LocalConverter(BaseConverter):
     """로컬 규칙 기반 변환기"""
     
+    # process_files에서 한 번에 convert_many로 변환할 최대 기사 수
+    batch_size = 1000
+    
+    # 코퍼스 문서 빈도 인덱스로 BM25 가중치 사용 (False면 기사 안의 단어 빈도만 사용)
+    use_idf_index = True
+    
+    # 조금씩 다른 반복 문단도 SimHash로 제거 (False면 똑같은 문단만 제거해 일괄 변환이 빨라짐)
+    near_duplicate_paragraphs = True
+    
     def __init__(self, output_dir: str = 'data/generated'):
         """
         로컬 변환기 초기화
@@ -24,6 +44,8 @@ class LocalConverter(BaseConverter):
         """
         super().__init__(output_dir)
         print("⚡ Using Local Rule-based Converter")
+        if not self.near_duplicate_paragraphs:
+            self.near_duplicate_distance = None
         
         # 한국어 불용어 (조사, 어미 등)
         self.stopwords = {
@@ -84,6 +106,42 @@ class LocalConverter(BaseConverter):
             'environment': '환경', 'climate': '기후', 'carbon': '탄소', 'emission': '배출',
             'green': '친환경', 'sustainability': '지속가능성'
         }
+        
+        # 여러 단어 키워드('artificial intelligence')는 토큰화 전에 한 단어로 이어서 매칭
+        self.keyword_phrases = KeywordMatcher(
+            [keyword for keyword in self.keyword_mapping if ' ' in keyword]
+        )
+        self._keyword_labels = {
+            keyword.replace(' ', PHRASE_JOINER): label for keyword, label in self.keyword_mapping.items()
+        }
+        
+        # 섹션명 매핑 (앞에 있는 키워드가 우선)
+        self.section_mapping = {
+            '시장': '시장 동향',
+            '주식': '주식 현황',
+            '투자': '투자 동향',
+            '경제': '경제 상황',
+            '정책': '정책 변화',
+            '기술': '기술 발전',
+            '회사': '기업 동향',
+            '성장': '성장 전망',
+            '변화': '변화 현황',
+            '발표': '발표 내용',
+            '계획': '향후 계획',
+            '결과': '주요 결과',
+            '영향': '영향 분석',
+            '전망': '미래 전망'
+        }
+        
+        # convert_many용 코퍼스 단어 사전 (처음 사용할 때 생성, 배치 사이에 재사용)
+        self._term_table: Optional[TermTable] = None
+        
+        # 변환한 기사의 단어별 문서 빈도 (실행 사이에 누적)
+        self.idf_index: Optional[IdfIndex] = None
+        if self.use_idf_index:
+            self.idf_index = IdfIndex(os.getenv('IDF_INDEX_PATH', 'data/idf_index'))
+            if not self.idf_index.writable:
+                print(f"⚠️  IDF 인덱스를 다른 프로세스가 사용 중이라 읽기 전용으로 엽니다: {self.idf_index.path}")
     
     def extract_keywords(self, content: str) -> str:
         """
@@ -95,42 +153,47 @@ class LocalConverter(BaseConverter):
         Returns:
             해시태그 형식의 키워드
         """
-        # 텍스트 전처리
-        content = content.lower()
-        content = re.sub(r'[^\w\s가-힣]', ' ', content)
-        
-        # 단어 분리
-        words = content.split()
-        
-        # 불용어 제거 및 길이 필터링
-        filtered_words = [
-            word for word in words 
-            if word not in self.stopwords and len(word) > 1
-        ]
+        if self.idf_index is not None:
+            # 인덱스를 갱신하지 않고 BM25 가중치 순으로 선택
+            plan = plan_batch(self._get_term_table(), [''], [[]], [content],
+                              idf_index=self.idf_index, update_index=False,
+                              phrases=self.keyword_phrases)[0]
+            return ' '.join(f"#{keyword}" for keyword in plan.keywords)
+        
+        # 텍스트 전처리 및 단어 분리
+        words = keyword_tokens(content, self.keyword_phrases)
+        hashtags = self._select_keywords(Counter(words))
+        
+        # 주식 심볼 감지 (전처리 후 텍스트 기준이라 '$'는 이미 제거됨)
+        stock_symbols = re.findall(r'\$[A-Z]{1,5}', ' '.join(words).upper())
+        if stock_symbols:
+            hashtags.extend([symbol.replace('$', '') for symbol in stock_symbols[:2]])
         
-        # 단어 빈도 계산
-        word_freq = Counter(filtered_words)
+        # 해시태그 형식으로 변환
+        return ' '.join(f"#{keyword}" for keyword in hashtags[:7])
+    
+    def _select_keywords(self, word_freq: Counter) -> List[str]:
+        """
+        단어 빈도에서 해시태그 키워드 선택
         
-        # 영어 키워드 한국어 변환
+        Args:
+            word_freq: 처음 등장한 순서의 단어 빈도 (키워드 추출 전처리 후)
+            
+        Returns:
+            최대 7개의 키워드 리스트 (매핑된 영어 단어는 한국어로, 나머지는 2회 이상 등장한 단어)
+        """
+        # 영어 키워드 한국어 변환 (불용어와 한 글자 단어 제외)
         korean_keywords = []
         for word, freq in word_freq.items():
-            if word in self.keyword_mapping:
-                korean_keywords.append(self.keyword_mapping[word])
+            if word in self.stopwords or len(word) <= 1:
+                continue
+            if word in self._keyword_labels:
+                korean_keywords.append(self._keyword_labels[word])
             elif freq > 1:  # 2회 이상 언급된 단어만
                 korean_keywords.append(word)
         
         # 중복 제거 및 상위 키워드 선택
-        unique_keywords = list(dict.fromkeys(korean_keywords))[:7]
-        
-        # 주식 심볼 감지
-        stock_symbols = re.findall(r'\$[A-Z]{1,5}', content.upper())
-        if stock_symbols:
-            unique_keywords.extend([symbol.replace('$', '') for symbol in stock_symbols[:2]])
-        
-        # 해시태그 형식으로 변환
-        hashtags = [f"#{keyword}" for keyword in unique_keywords[:7]]
-        
-        return ' '.join(hashtags)
+        return list(dict.fromkeys(korean_keywords))[:7]
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """
@@ -142,30 +205,19 @@ class LocalConverter(BaseConverter):
         Returns:
             문장 리스트
         """
-        # 문장 구분자로 분리
-        sentences = re.split(r'[.!?。]+', text)
-        
-        # 빈 문장 제거 및 정리
-        cleaned_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 10:  # 최소 길이 필터
-                cleaned_sentences.append(sentence)
-        
-        return cleaned_sentences
+        return split_sentences(text)
     
-    def _calculate_sentence_score(self, sentence: str, word_freq: Counter) -> float:
+    def _calculate_sentence_score(self, words: List[str], word_freq: Counter) -> float:
         """
         문장 중요도 점수 계산
         
         Args:
-            sentence: 점수를 계산할 문장
+            words: 문장의 단어 (소문자)
             word_freq: 단어 빈도 카운터
             
         Returns:
             문장 점수
         """
-        words = sentence.lower().split()
         score = 0
         
         for word in words:
@@ -178,125 +230,87 @@ class LocalConverter(BaseConverter):
         
         return score
     
-    def _extract_key_sentences(self, content: str, num_sentences: int = 5) -> List[str]:
+    def _extract_key_sentences(self, analysis: ArticleAnalysis, num_sentences: int = 5) -> List[int]:
         """
         핵심 문장 추출
         
         Args:
-            content: 분석할 내용
+            analysis: 기사 분석 결과
             num_sentences: 추출할 문장 수
             
         Returns:
-            핵심 문장 리스트
+            핵심 문장 번호 리스트 (원래 순서)
         """
-        sentences = self._split_into_sentences(content)
+        sentence_tokens = analysis.sentence_tokens
         
-        if len(sentences) <= num_sentences:
-            return sentences
+        if len(sentence_tokens) <= num_sentences:
+            return list(range(len(sentence_tokens)))
         
-        # 단어 빈도 계산
-        all_words = content.lower().split()
-        word_freq = Counter([
-            word for word in all_words 
+        # 단어 빈도 (불용어와 한 글자 단어 제외)
+        word_freq = Counter({
+            word: freq for word, freq in analysis.content_terms.items()
             if word not in self.stopwords and len(word) > 1
-        ])
+        })
         
         # 각 문장 점수 계산
         sentence_scores = []
-        for i, sentence in enumerate(sentences):
-            score = self._calculate_sentence_score(sentence, word_freq)
-            sentence_scores.append((score, i, sentence))
+        for i, words in enumerate(sentence_tokens):
+            score = self._calculate_sentence_score(words, word_freq)
+            sentence_scores.append((score, i))
         
         # 점수 순으로 정렬하여 상위 문장 선택
         sentence_scores.sort(key=lambda x: x[0], reverse=True)
         
         # 상위 문장들을 원본 순서로 재정렬
-        selected_sentences = sentence_scores[:num_sentences]
-        selected_sentences.sort(key=lambda x: x[1])
-        
-        return [sentence for _, _, sentence in selected_sentences]
+        return sorted(i for _, i in sentence_scores[:num_sentences])
     
-    def _create_sections(self, content: str) -> List[Tuple[str, List[str]]]:
+    def _create_sections(self, analysis: ArticleAnalysis) -> List[Tuple[str, List[str]]]:
         """
         내용을 섹션으로 구분
         
         Args:
-            content: 분석할 내용
+            analysis: 기사 분석 결과
             
         Returns:
             (섹션명, 문장리스트) 튜플 리스트
         """
-        key_sentences = self._extract_key_sentences(content, 8)
+        selected = self._extract_key_sentences(analysis, 8)
+        key_sentences = [analysis.sentences[i] for i in selected]
         
         if len(key_sentences) <= 3:
             return [("주요 내용", key_sentences)]
         
-        # 문장들을 주제별로 그룹화
+        # 3개 문장마다 새 섹션 생성 (마지막 섹션은 남은 문장)
         sections = []
-        current_section = []
-        
-        for i, sentence in enumerate(key_sentences):
-            current_section.append(sentence)
-            
-            # 3-4개 문장마다 새 섹션 생성
-            if len(current_section) >= 3 and i < len(key_sentences) - 1:
-                section_name = self._generate_section_name(current_section)
-                sections.append((section_name, current_section.copy()))
-                current_section = []
-        
-        # 남은 문장들 처리
-        if current_section:
-            section_name = self._generate_section_name(current_section)
-            sections.append((section_name, current_section))
+        for start in range(0, len(selected), 3):
+            group = selected[start:start + 3]
+            section_name = self._generate_section_name(
+                [analysis.sentences_lower[i] for i in group],
+                [analysis.sentence_tokens[i] for i in group]
+            )
+            sections.append((section_name, key_sentences[start:start + 3]))
         
         return sections
     
-    def _generate_section_name(self, sentences: List[str]) -> str:
+    def _generate_section_name(self, sentences: List[str], sentence_tokens: List[List[str]]) -> str:
         """
         문장들을 기반으로 섹션명 생성
         
         Args:
-            sentences: 섹션의 문장들
+            sentences: 섹션의 문장들 (소문자)
+            sentence_tokens: 문장별 단어
             
         Returns:
             섹션명
         """
-        # 핵심 단어 추출
-        all_text = ' '.join(sentences).lower()
-        words = all_text.split()
-        
-        # 빈도 기반 키워드 추출
-        word_freq = Counter([
-            word for word in words 
-            if word not in self.stopwords and len(word) > 1
-        ])
-        
-        if not word_freq:
+        # 불용어가 아닌 단어가 없으면 기본 섹션명
+        if not any(word not in self.stopwords and len(word) > 1
+                   for words in sentence_tokens for word in words):
             return "주요 내용"
         
-        # 가장 빈번한 단어 기반 섹션명 생성
-        top_word = word_freq.most_common(1)[0][0]
-        
-        # 섹션명 매핑
-        section_mapping = {
-            '시장': '시장 동향',
-            '주식': '주식 현황',
-            '투자': '투자 동향',
-            '경제': '경제 상황',
-            '정책': '정책 변화',
-            '기술': '기술 발전',
-            '회사': '기업 동향',
-            '성장': '성장 전망',
-            '변화': '변화 현황',
-            '발표': '발표 내용',
-            '계획': '향후 계획',
-            '결과': '주요 결과',
-            '영향': '영향 분석',
-            '전망': '미래 전망'
-        }
-        
         # 매핑에서 찾기
-        for key, value in section_mapping.items():
+        all_text = ' '.join(sentences)
+        for key, value in self.section_mapping.items():
             if key in all_text:
                 return value
         
@@ -312,25 +326,38 @@ class LocalConverter(BaseConverter):
         Returns:
             마크다운 형식의 문자열
         """
-        # 내용 정제
-        content = self.clean_content(data['content'])
+        if self.idf_index is not None:
+            return self.convert_many([data])[0][0]
+        
+        analysis = self.analyze(data)
+        return self._render_markdown(analysis, self._create_sections(analysis))
+    
+    def _render_markdown(self, analysis: ArticleAnalysis,
+                         sections: List[Tuple[str, List[str]]]) -> str:
+        """
+        제목과 섹션으로 마크다운 구성
         
+        Args:
+            analysis: 기사 분석 결과 (토픽, 본문에 언급된 상장사)
+            sections: (섹션명, 문장리스트) 튜플 리스트
+            
+        Returns:
+            마크다운 형식의 문자열
+        """
         # 토픽 감지 및 이모지 선택
-        topic = self.detect_topic(f"{data['title']} {data['description']} {content}")
-        emoji = self.emoji_mapping.get(topic, '📰')
+        emoji = self.emoji_mapping.get(analysis.topic, '📰')
         
         # 제목 생성 (원본 제목 활용)
-        title = data['title'].strip()
+        title = analysis.title.strip()
         if not title:
-            title = data['description'][:50] + "..."
+            title = analysis.description[:50] + "..."
         
         formatted_title = f"{emoji} {title}"
         
-        # 섹션 생성
-        sections = self._create_sections(content)
-        
         # 마크다운 구성
         markdown_lines = [formatted_title, ""]
+        # 기사에서 처음 언급된 회사에만 주식 심볼 표시
+        tagged_symbols = set()
         
         for section_name, sentences in sections:
             markdown_lines.append(f"▶ {section_name}:")
@@ -339,8 +366,9 @@ class LocalConverter(BaseConverter):
                 # 문장 정리
                 sentence = sentence.strip()
                 if sentence:
-                    # 주식 심볼 포맷팅
-                    sentence = self.format_stock_symbols(sentence)
+                    # 주식 심볼 포맷팅 (상장사 언급이 없는 기사는 건너뜀)
+                    if analysis.tickers:
+                        sentence = self.format_stock_symbols(sentence, tagged_symbols)
                     markdown_lines.append(f"• {sentence}")
             
             markdown_lines.append("")  # 섹션 간 빈 줄
@@ -349,4 +377,153 @@ class LocalConverter(BaseConverter):
         while markdown_lines and markdown_lines[-1] == "":
             markdown_lines.pop()
         
-        return '\n'.join(markdown_lines) 
\ No newline at end of file
+        return '\n'.join(markdown_lines)
+    
+    def _batch_sections(self, sentences: List[str], selected: List[int], section_bits: List[int],
+                        has_words: List[bool]) -> List[Tuple[str, List[str]]]:
+        """
+        plan_batch 결과로 섹션 구성 (_create_sections와 같은 규칙)
+        
+        Args:
+            sentences: 기사의 전체 문장
+            selected: 선택된 문장 번호 (원래 순서)
+            section_bits: 선택된 문장별 섹션명 매핑 키 비트
+            has_words: 선택된 문장별 불용어가 아닌 단어 포함 여부
+            
+        Returns:
+            (섹션명, 문장리스트) 튜플 리스트
+        """
+        key_sentences = [sentences[index] for index in selected]
+        if len(key_sentences) <= 3:
+            return [("주요 내용", key_sentences)]
+        
+        section_names = list(self.section_mapping.values())
+        sections = []
+        # 3개 문장마다 새 섹션 (마지막 섹션은 남은 문장)
+        bounds = list(range(0, len(key_sentences), 3)) + [len(key_sentences)]
+        for start, end in zip(bounds, bounds[1:]):
+            bits = 0
+            for value in section_bits[start:end]:
+                bits |= value
+            if any(has_words[start:end]) and bits:
+                # 가장 낮은 비트 = 매핑에서 가장 앞에 있는 키
+                name = section_names[(bits & -bits).bit_length() - 1]
+            else:
+                name = "주요 내용"
+            sections.append((name, key_sentences[start:end]))
+        
+        return sections
+    
+    def convert_with_keywords(self, data: Dict[str, str]) -> Tuple[str, str]:
+        """
+        마크다운 변환과 키워드 추출 (인덱스를 쓰면 기사를 한 번만 인덱스에 추가하도록 convert_many 사용)
+        
+        Args:
+            data: 구조화된 뉴스 데이터
+            
+        Returns:
+            (마크다운, 해시태그 문자열) 튜플
+        """
+        if self.idf_index is not None:
+            return self.convert_many([data])[0]
+        
+        analysis = self.analyze(data)
+        markdown_content = self._render_markdown(analysis, self._create_sections(analysis))
+        keywords = ' '.join(f"#{keyword}" for keyword in self._select_keywords(analysis.keyword_terms))
+        return markdown_content, keywords
+    
+    def _get_term_table(self) -> TermTable:
+        """convert_many용 단어 사전 (처음 사용할 때 생성)"""
+        if self._term_table is None:
+            self._term_table = TermTable(self.stopwords, list(self.section_mapping),
+                                         self._keyword_labels)
+        return self._term_table
+    
+    def convert_many(self, records: List[Dict[str, str]]) -> List[Tuple[str, str]]:
+        """
+        여러 기사를 한 번에 변환
+        
+        모든 기사를 한 번에 토큰화해 단어 ID 희소 행렬로 만들고, 문장 점수와
+        상위 문장 선택, 섹션명, 해시태그 후보를 NumPy 연산으로 계산합니다.
+        인덱스를 쓰지 않으면 기사별 convert_with_keywords와 같은 결과이고, 쓰면 배치의
+        기사를 먼저 인덱스에 추가한 뒤 BM25 가중치로 순위를 매깁니다.
+        
+        Args:
+            records: 구조화된 뉴스 데이터 리스트
+            
+        Returns:
+            입력 순서의 (마크다운, 해시태그 문자열) 튜플 리스트
+        """
+        contents = self.clean_contents([data['content'] for data in records])
+        analyses = [self.analyze(data, cleaned=content) for data, content in zip(records, contents)]
+        plans = plan_batch(
+            self._get_term_table(), contents, [analysis.sentences for analysis in analyses],
+            (f"{data['title']}\n{data['description']}\n{data['content']}" for data in records),
+            idf_index=self.idf_index, phrases=self.keyword_phrases
+        )
+        
+        results = []
+        for analysis, plan in zip(analyses, plans):
+            sections = self._batch_sections(analysis.sentences, plan.selected, plan.section_bits,
+                                            plan.has_words)
+            keywords = ' '.join(f"#{keyword}" for keyword in plan.keywords)
+            results.append((self._render_markdown(analysis, sections), keywords))
+        return results
+    
+    def process_files(self, file_paths: List[str], workers: int = 1) -> List[Optional[Path]]:
+        """
+        여러 파일을 batch_size개씩 convert_many로 변환 (단일 코어 일괄 처리라 workers는 사용하지 않음)
+        
+        Args:
+            file_paths: 처리할 파일 경로 리스트
+            workers: 사용하지 않음 (다른 변환기와 같은 인터페이스 유지)
+            
+        Returns:
+            입력 순서와 같은 순서의 결과 경로 리스트 (실패한 파일은 None)
+        """
+        results: List[Optional[Path]] = [None] * len(file_paths)
+        started = time.perf_counter()
+        
+        for batch_start in range(0, len(file_paths), self.batch_size):
+            batch = []
+            for index in range(batch_start, min(batch_start + self.batch_size, len(file_paths))):
+                try:
+                    data, output_path, index_key = self.prepare_file(file_paths[index])
+                    batch.append((index, data, output_path, index_key))
+                except Exception as e:
+                    print(f"❌ Error processing {file_paths[index]}: {str(e)}")
+            
+            if not batch:
+                continue
+            try:
+                converted = self.convert_many([data for _, data, _, _ in batch])
+            except Exception as e:
+                # 일괄 변환이 실패하면 파일별로 변환해 오류를 격리
+                print(f"⚠️  일괄 변환 실패, 파일별로 변환합니다: {str(e)}")
+                for index, _, _, _ in batch:
+                    results[index] = self.process_file(file_paths[index])
+                continue
+            
+            for (index, _, output_path, index_key), (markdown_content, keywords) in zip(batch, converted):
+                try:
+                    self.save_result(markdown_content, keywords, output_path, index_key)
+                    results[index] = output_path
+                except Exception as e:
+                    print(f"❌ Error processing {file_paths[index]}: {str(e)}")
+        
+        elapsed = time.perf_counter() - started
+        if file_paths and elapsed > 0:
+            print(f"⚡ 일괄 변환: {len(file_paths)}개 기사, {elapsed:.2f}초 "
+                  f"({len(file_paths) / elapsed:,.0f}개/초)")
+        if self.idf_index is not None:
+            stats = self.idf_index.stats()
+            print(f"📚 IDF 인덱스: 문서 {stats['documents']:,}개, 단어 {stats['terms']:,}개, "
+                  f"평균 길이 {stats['average_length']}")
+        return results
+    
+    def close(self) -> None:
+        """IDF 인덱스의 저장하지 않은 변경 내용을 기록하고 리소스 해제"""
+        if self.idf_index is not None:
+            self.idf_index.close()
+            self.idf_index = None
+        super().close()
@@ -0,0 +1,396 @@
+"""
+변환 프롬프트 템플릿
+
+AI 변환기(Anthropic, OpenAI)가 함께 쓰는 마크다운 변환/키워드 추출 프롬프트와
+마크다운과 해시태그를 한 번의 호출로 받는 통합 프롬프트, 그 응답 파서,
+긴 기사를 부분별로 나눠 정리한 뒤 합치는 분할 변환 프롬프트를 제공합니다.
+
+모든 프롬프트는 기사와 무관한 고정 시스템 프롬프트(규칙, 예시)와 기사별 사용자
+메시지로 나뉩니다. 시스템 프롬프트는 호출마다 바이트 단위로 같아야 제공자의
+프롬프트 캐시(Anthropic cache_control, OpenAI 자동 접두어 캐시)가 적중하므로
+기사 내용이나 시각 같은 가변 값을 넣지 않습니다.
+"""
+
+import json
+import re
+from typing import List, Tuple
+
+# 마크다운 변환 예시
+MARKDOWN_EXAMPLE = """💰 크라켄, 암호화폐 시장 점유율 확대 위해 혁신적인 P2P 결제앱 출시
+
+▶ 표결 현황:
+• "vote-a-rama" 새벽까지 지속, 종료 시점 불투명
+• 일출 전 최종 표결 가능성 있다고 언론 보도
+• 화요일부터 계속된 수정안 표결 과정
+
+▶ 통과 조건:
+• 상원 100명 중 통상 60명 찬성 필요하지만 "reconciliation" 절차로 과반수만 필요
+• 공화당 근소한 상원 장악, 민주당 강력 반대
+
+▶ 법안 내용과 비용:
+1. 2017년 트럼프 세금감면 연장
+2. 신규 세금감면 도입
+3. 국방·국경보안 지출 증가
+
+▶ 내부 갈등:
+• 일론 머스크 "미친 법안"이라 강력 비판, 신정당 창당 위협
+• 테슬라 $TSLA 보조금 철회 위협으로 응수"""
+
+# 마크다운 변환 규칙 (예시 형식까지)
+MARKDOWN_INSTRUCTIONS = """당신은 뉴스 기사를 한국어 스타일의 마크다운 문서로 변환하는 전문가입니다.
+아래의 형식과 스타일을 정확히 따라 변환해주세요.
+
+필수 형식:
+1. 제목 형식: 이모지 제목내용
+   예시: "💰 크라켄, 암호화폐 시장 점유율 확대 위해 혁신적인 P2P 결제앱 출시"
+   - 제목 시작에 내용을 잘 표현하는 이모지 **정확히 1개만** 사용
+   - 이모지는 제목의 첫 번째 문자로 위치
+   - 이모지와 제목 내용 사이에 공백 하나만 사용
+   - 제목은 반드시 첫 줄에 위치
+   - 제목 다음에는 빈 줄 하나 추가
+   - 제목은 내용을 기반으로 독자의 관심을 끌 수 있게 작성
+   - 단순 사실 나열보다는 핵심 가치나 의미를 담아 작성
+   - **중요**: 이모지는 반드시 1개만, 여러 개 사용 금지
+
+2. 섹션 구조:
+   - 각 주요 섹션은 ▶로 시작
+   - 섹션 제목은 명사형으로 끝남 (예: "현황:", "전망:", "영향:")
+   - 섹션 제목 뒤에는 반드시 콜론(:) 사용
+
+3. 글머리 기호:
+   - 주요 사실/현황은 • 기호 사용
+   - 순차적 내용이나 상세 설명은 1. 2. 3. 번호 사용
+   - 인용구나 발언은 따옴표(" ") 사용
+
+4. 문체와 톤:
+   - 객관적이고 명확한 문체 사용
+   - 문장은 간결하게, 되도록 1-2줄 이내로 작성
+   - 전문 용어는 가능한 한글로 풀어서 설명
+   - 숫자나 통계는 단위와 함께 명확히 표기
+
+5. 구조화:
+   - 중요도와 시간 순서를 고려한 섹션 배치
+   - 관련 내용은 같은 섹션에 모아서 정리
+   - 섹션 간 적절한 줄바꿈으로 가독성 확보
+   - 마지막에는 향후 전망이나 결론 포함
+
+6. 특별 규칙:
+   - 주식 종목명이 나오면 반드시 종목명 뒤에 $심볼 표기
+   예: 테슬라 $TSLA, 애플 $AAPL
+   - 괄호 사용하지 않고 공백으로 구분
+
+7. 제외할 내용:
+   - 기자 소개나 프로필 정보 (예: "에마 오커먼은 야후 파이낸스에서...")
+   - 기자 연락처나 이메일 정보 (예: "emma.ockerman@yahooinc.com으로 이메일을 보내세요")
+   - 기자 경력이나 소속 언론사 소개
+   - 기사 마지막의 기자 정보 블록 전체
+   - 기자 관련 모든 개인 정보나 연락처
+   - 홍보성 메시지나 광고 문구 (예: "지금 구독하세요", "더 많은 정보를 원하시면...")
+   - 뉴스레터 구독 안내나 마케팅 메시지
+   - 소셜 미디어 팔로우 유도 문구
+   - 앱 다운로드나 서비스 가입 권유
+   - 상업적 홍보나 광고성 콘텐츠
+
+예시 형식:
+""" + MARKDOWN_EXAMPLE + "\n"
+
+# 제목/이모지 작성 안내
+TITLE_GUIDE = """
+제목은 반드시 첫 줄에 위치하고, 내용을 잘 표현하는 이모지 하나를 시작에 넣어주세요.
+제목은 단순히 사실을 나열하는 것이 아니라, 내용의 핵심 가치나 의미를 담아 독자의 관심을 끌 수 있게 작성해주세요.
+
+이모지 선택 가이드:
+- 금융/투자 관련: 💰 💵 📈 📊
+- 기술/혁신 관련: 🚀 💡 🔧 🌟
+- 정책/규제 관련: ⚖️ 📜 🏛️ 🔨
+- 갈등/경쟁 관련: 🔥 ⚔️ 🎯 🎲
+- 협력/계약 관련: 🤝 📝 🎊 🌈
+- 성장/발전 관련: 🌱 🎉 💪 ⭐
+"""
+
+# 키워드 추출 규칙
+KEYWORD_INSTRUCTIONS = """당신은 뉴스 기사에서 핵심 키워드를 추출하는 전문가입니다.
+다음 기사에서 5-7개의 관련 키워드를 추출하여 해시태그 형식으로 반환해주세요.
+
+규칙:
+1. 해시태그는 한글 스타일로 작성 (#키워드)
+2. 각 해시태그는 공백으로 구분
+3. 주식 종목이 언급된 경우 반드시 포함
+4. 가장 중요한 주제어 위주로 선정
+5. 다른 텍스트나 설명 없이 해시태그만 반환
+
+예시 형식:
+#키워드1 #키워드2 #키워드3 #키워드4 #키워드5
+
+"""
+
+# 통합 응답 출력 형식
+COMBINED_OUTPUT_FORMAT = """
+해시태그 규칙:
+1. 기사의 핵심 키워드 5-7개를 한글 스타일 해시태그로 작성 (#키워드)
+2. 해시태그 안에는 공백을 넣지 않음
+3. 주식 종목이 언급된 경우 반드시 포함
+4. 가장 중요한 주제어 위주로 선정
+
+출력 형식:
+다른 텍스트나 설명 없이 아래 JSON 객체 하나만 반환해주세요.
+{"markdown": "위 형식으로 변환한 마크다운 전체", "hashtags": ["#키워드1", "#키워드2", "#키워드3"]}
+"""
+
+# 긴 기사 분할 변환: 부분별 섹션 정리 규칙
+CHUNK_INSTRUCTIONS = """당신은 긴 뉴스 기사를 한국어 스타일의 마크다운 섹션으로 정리하는 전문가입니다.
+기사 전체가 아니라 여러 부분 중 한 부분이 주어집니다. 주어진 부분의 내용만 정리해주세요.
+
+필수 형식:
+1. 제목은 쓰지 않고 섹션만 작성
+2. 각 섹션은 ▶로 시작하고, 섹션 제목은 명사형으로 끝나며 뒤에 콜론(:) 사용 (예: "▶ 현황:")
+3. 주요 사실/현황은 • 기호, 순차적 내용은 1. 2. 3. 번호 사용
+4. 숫자, 통계, 인용구(" "), 주식 종목명과 $심볼(예: 테슬라 $TSLA)은 원문 그대로 유지
+5. 문장은 간결하게 1-2줄 이내로 작성
+6. 향후 전망이나 결론 섹션은 쓰지 않음 (전체를 합칠 때 따로 작성)
+7. 기자 소개, 연락처, 홍보성 문구는 제외
+
+예시 형식:
+▶ 표결 현황:
+• "vote-a-rama" 새벽까지 지속, 종료 시점 불투명
+• 화요일부터 계속된 수정안 표결 과정
+"""
+
+# 긴 기사 분할 변환: 제목과 결론 작성 규칙
+MERGE_INSTRUCTIONS = """당신은 뉴스 기사를 한국어 스타일의 마크다운 문서로 변환하는 전문가입니다.
+긴 기사를 부분별로 정리한 섹션 초안이 주어집니다. 섹션 본문은 그대로 사용하므로 다시 쓰지 말고,
+전체 내용을 대표하는 제목 한 줄과 마지막 전망/결론 섹션 하나만 작성해주세요.
+
+출력 형식:
+1. 첫 줄: 이모지 제목내용 (이모지는 정확히 1개, 제목의 첫 번째 문자)
+2. 빈 줄 하나
+3. ▶ 전망: 섹션과 • 글머리 기호 2-3개
+4. 다른 텍스트나 설명 없이 위 형식만 반환
+
+예시 형식:
+💰 크라켄, 암호화폐 시장 점유율 확대 위해 혁신적인 P2P 결제앱 출시
+
+▶ 전망:
+• 일출 전 최종 표결 가능성
+• 통과 시 세금감면 연장과 국방 지출 증가
+"""
+
+MIN_HASHTAGS = 1
+MAX_HASHTAGS = 10
+
+_CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+_HASHTAG_INVALID = re.compile(r'[\s#]+')
+
+
+# 고정 시스템 프롬프트 (제공자 프롬프트 캐시 대상)
+MARKDOWN_SYSTEM_PROMPT = MARKDOWN_INSTRUCTIONS + TITLE_GUIDE
+COMBINED_SYSTEM_PROMPT = MARKDOWN_SYSTEM_PROMPT + COMBINED_OUTPUT_FORMAT
+KEYWORD_SYSTEM_PROMPT = KEYWORD_INSTRUCTIONS.rstrip()
+CHUNK_SYSTEM_PROMPT = CHUNK_INSTRUCTIONS.rstrip()
+MERGE_SYSTEM_PROMPT = MERGE_INSTRUCTIONS + TITLE_GUIDE
+
+# 섹션 제목 줄 (▶ 제목:)
+_SECTION_HEADING = re.compile(r'^\s*▶\s*(.+?)\s*:?\s*$')
+
+
+def _input_block(title: str, description: str, content: str) -> str:
+    """기사 입력 데이터 블록"""
+    return f"""입력 데이터:
+제목: {title}
+설명: {description}
+본문: {content}
+"""
+
+
+def build_markdown_prompt(title: str, description: str, content: str) -> Tuple[str, str]:
+    """
+    마크다운 변환 프롬프트 생성
+
+    Args:
+        title: 기사 제목
+        description: 기사 설명
+        content: 정제된 기사 본문
+
+    Returns:
+        (시스템 프롬프트, 사용자 메시지) 튜플
+    """
+    return MARKDOWN_SYSTEM_PROMPT, _input_block(title, description, content)
+
+
+def build_keyword_prompt(content: str) -> Tuple[str, str]:
+    """
+    키워드 추출 프롬프트 생성
+
+    Args:
+        content: 분석할 내용
+
+    Returns:
+        (시스템 프롬프트, 사용자 메시지) 튜플
+    """
+    return KEYWORD_SYSTEM_PROMPT, f"Article: {content}"
+
+
+def build_combined_prompt(title: str, description: str, content: str) -> Tuple[str, str]:
+    """
+    마크다운과 해시태그를 함께 요청하는 통합 프롬프트 생성
+
+    Args:
+        title: 기사 제목
+        description: 기사 설명
+        content: 정제된 기사 본문
+
+    Returns:
+        (시스템 프롬프트, 사용자 메시지) 튜플
+    """
+    return COMBINED_SYSTEM_PROMPT, _input_block(title, description, content)
+
+
+def build_chunk_prompt(title: str, description: str, chunk: str, index: int, total: int) -> Tuple[str, str]:
+    """
+    긴 기사의 한 부분을 섹션으로 정리하는 프롬프트 생성
+
+    Args:
+        title: 기사 제목
+        description: 기사 설명
+        chunk: 본문 중 한 부분
+        index: 부분 번호 (1부터)
+        total: 전체 부분 수
+
+    Returns:
+        (시스템 프롬프트, 사용자 메시지) 튜플
+    """
+    return CHUNK_SYSTEM_PROMPT, f"""입력 데이터 ({index}/{total} 부분):
+제목: {title}
+설명: {description}
+본문 일부: {chunk}
+"""
+
+
+def build_merge_prompt(title: str, description: str, sections: str) -> Tuple[str, str]:
+    """
+    부분별 섹션 초안으로 제목과 전망 섹션을 작성하는 프롬프트 생성
+
+    Args:
+        title: 기사 제목
+        description: 기사 설명
+        sections: merge_sections로 합친 섹션 초안
+
+    Returns:
+        (시스템 프롬프트, 사용자 메시지) 튜플
+    """
+    return MERGE_SYSTEM_PROMPT, f"""입력 데이터:
+제목: {title}
+설명: {description}
+섹션 초안:
+{sections}
+"""
+
+
+def merge_sections(drafts: List[str]) -> str:
+    """
+    부분별 섹션 초안을 하나로 합침 (같은 제목의 섹션은 처음 나온 위치에 이어 붙임)
+
+    Args:
+        drafts: 부분별 섹션 마크다운 (본문 순서)
+
+    Returns:
+        합친 섹션 마크다운
+    """
+    order: List[str] = []
+    headings = {}
+    bodies = {}
+    # 섹션 제목 없이 시작한 부분은 앞 부분의 마지막 섹션에 이어 붙임
+    key = None
+    for draft in drafts:
+        for line in draft.strip().split('\n'):
+            match = _SECTION_HEADING.match(line)
+            if match:
+                heading = match.group(1).strip()
+                key = re.sub(r'\s+', '', heading)
+                if key not in bodies:
+                    order.append(key)
+                    headings[key] = heading
+                    bodies[key] = []
+                continue
+            if not line.strip():
+                continue
+            if key is None:
+                # 첫 섹션 제목 앞의 내용
+                key = ''
+                order.append(key)
+                bodies[key] = []
+            bodies[key].append(line.rstrip())
+
+    sections = []
+    for key in order:
+        lines = bodies[key]
+        if key:
+            sections.append('\n'.join([f"▶ {headings[key]}:"] + lines))
+        elif lines:
+            sections.append('\n'.join(lines))
+    return '\n\n'.join(sections)
+
+
+def normalize_hashtags(tags: List[str]) -> List[str]:
+    """
+    해시태그 정규화 (# 접두어, 내부 공백 제거, 중복 제거, 순서 보존)
+
+    Args:
+        tags: 원본 해시태그 리스트
+
+    Returns:
+        정규화된 해시태그 리스트
+    """
+    normalized = []
+    seen = set()
+    for tag in tags:
+        word = _HASHTAG_INVALID.sub('', str(tag))
+        if not word or word.lower() in seen:
+            continue
+        seen.add(word.lower())
+        normalized.append(f"#{word}")
+    return normalized[:MAX_HASHTAGS]
+
+
+def parse_combined_response(text: str) -> Tuple[str, List[str]]:
+    """
+    통합 프롬프트 응답 파싱 및 검증
+
+    Args:
+        text: API 응답 텍스트
+
+    Returns:
+        (마크다운, 해시태그 리스트) 튜플
+
+    Raises:
+        ValueError: JSON 형식이 아니거나 필수 필드가 올바르지 않은 경우
+    """
+    body = _CODE_FENCE.sub('', text.strip())
+    start = body.find('{')
+    end = body.rfind('}')
+    if start == -1 or end <= start:
+        raise ValueError("response does not contain a JSON object")
+
+    try:
+        payload = json.loads(body[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON response: {e}")
+
+    if not isinstance(payload, dict):
+        raise ValueError("response JSON is not an object")
+
+    markdown = payload.get('markdown')
+    if not isinstance(markdown, str) or not markdown.strip():
+        raise ValueError("'markdown' must be a non-empty string")
+
+    hashtags = payload.get('hashtags')
+    if isinstance(hashtags, str):
+        hashtags = hashtags.split()
+    if not isinstance(hashtags, list):
+        raise ValueError("'hashtags' must be a list")
+
+    hashtags = normalize_hashtags(hashtags)
+    if len(hashtags) < MIN_HASHTAGS:
+        raise ValueError("'hashtags' is empty")
+
+    return markdown.strip(), hashtags
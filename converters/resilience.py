@@ -0,0 +1,332 @@
+"""
+제공자 장애 대응 (서킷 브레이커, 헤지 요청)
+
+제공자가 느려지거나 오류를 내기 시작하면 SDK 제한 시간을 다 기다린 뒤에야 다른 제공자로
+넘어가게 됩니다. 이 모듈은 제공자별 서킷 브레이커로 최근 오류율과 느린 호출 비율이
+기준을 넘은 제공자를 잠시 건너뛰고, 선택적으로 주 제공자가 최근 p95 지연 시간 안에
+응답하지 않으면 보조 제공자에도 요청을 보내 먼저 끝난 응답을 사용합니다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# 제공자 장애로 보는 전송 계층 오류 (SDK/httpx의 연결 오류와 시간 초과)
+_TRANSPORT_ERRORS = frozenset(['APIConnectionError', 'APITimeoutError', 'TransportError', 'TimeoutException'])
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """
+    제공자 상태 문제로 볼 오류인지 판단
+
+    5xx, 408, 연결 오류, 시간 초과만 제공자 장애로 봅니다. 429는 API 키의 한도 초과이므로
+    요청 한도 제어(rate_limit)에 맡기고, 그 밖의 4xx와 빈 응답 같은 상태 코드 없는 오류는
+    요청/응답 문제이므로 서킷 브레이커에 반영하지 않습니다. ProviderHealth는 기본적으로
+    이 오류만 다른 제공자로 넘기며, 키/모델 오류도 넘기려면 is_failover_error를 씁니다.
+    """
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status >= 500 or status == 408
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in _TRANSPORT_ERRORS for cls in type(error).__mro__)
+
+
+# 단일 사용자 CLI에서 다른 제공자로 넘길 키/모델 오류 (인증, 권한, 없는 모델, 요청 한도 초과)
+FAILOVER_STATUS_CODES = frozenset([401, 403, 404, 429])
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """
+    다른 제공자로 넘길 오류인지 판단 (제공자 장애 + 키/모델 오류)
+
+    API 키를 운영자 한 명이 관리하는 CLI에서는 한 제공자의 키가 막히거나 모델이 폐기되어도
+    다른 제공자로 변환을 계속합니다. 서킷 브레이커에는 is_provider_failure만 반영합니다.
+    """
+    if is_provider_failure(error):
+        return True
+    return getattr(error, 'status_code', None) in FAILOVER_STATUS_CODES
+
+
+class CircuitBreaker:
+    """최근 호출의 오류율과 느린 호출 비율 기반 서킷 브레이커"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 5,
+                 failure_rate: float = 0.5, slow_call_seconds: float = 30.0,
+                 slow_call_rate: float = 0.5, open_seconds: float = 30.0):
+        """
+        서킷 브레이커 초기화
+
+        Args:
+            name: 제공자 이름
+            window: 판단에 사용할 최근 호출 수
+            min_calls: 판단을 시작할 최소 호출 수
+            failure_rate: 서킷을 여는 오류 비율
+            slow_call_seconds: 느린 호출로 볼 응답 시간 (초)
+            slow_call_rate: 서킷을 여는 느린 호출 비율
+            open_seconds: 서킷을 연 뒤 시험 호출을 허용하기까지의 시간 (초)
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+
+        self._lock = threading.Lock()
+        # (실패 여부, 느린 호출 여부)
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {'opened': 0, 'rejected': 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        호출 허용 여부 (허용되면 호출 결과를 record_* 또는 release로 반드시 알려야 함)
+
+        열린 서킷은 open_seconds가 지나면 반열림 상태가 되어 시험 호출 하나만 허용합니다.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._stats['rejected'] += 1
+            return False
+
+    def record_success(self, elapsed: float) -> None:
+        """성공한 호출 기록 (느린 성공은 느린 호출로 집계)"""
+        self._record(False, elapsed >= self.slow_call_seconds)
+
+    def record_failure(self, elapsed: float) -> None:
+        """제공자 장애로 실패한 호출 기록"""
+        self._record(True, elapsed >= self.slow_call_seconds)
+
+    def release(self) -> None:
+        """판단 없이 끝난 호출 (취소되었거나 호출자 측 오류)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if failed or slow:
+                    self._trip()
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if self._state == self.CLOSED and calls >= self.min_calls:
+                failures = sum(1 for f, _ in self._outcomes if f)
+                slow_calls = sum(1 for _, s in self._outcomes if s)
+                if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                    self._trip()
+
+    def _trip(self) -> None:
+        """서킷 열기 (잠금 보유 상태에서 호출)"""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._stats['opened'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """상태와 열림/거부 횟수"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats['state'] = self._state
+            stats['recent_calls'] = len(self._outcomes)
+        return stats
+
+
+class LatencyTracker:
+    """최근 성공 호출의 응답 시간 분포"""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        """
+        Args:
+            window: 보관할 최근 응답 시간 수
+            min_samples: 백분위수를 계산할 최소 표본 수
+        """
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self._samples.append(elapsed)
+
+    def percentile(self, q: float = 0.95) -> Optional[float]:
+        """백분위수 응답 시간 (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class ProviderHealth:
+    """제공자별 서킷 브레이커와 지연 시간 기반 장애 전환/헤지 호출"""
+
+    def __init__(self, providers: List[str], hedge: bool = False, default_hedge_delay: float = 15.0,
+                 min_hedge_delay: float = 1.0,
+                 failover: Callable[[BaseException], bool] = is_provider_failure, **breaker_options):
+        """
+        Args:
+            providers: 제공자 이름 목록
+            hedge: 주 제공자가 p95 지연 시간 안에 응답하지 않으면 보조 제공자에도 요청할지 여부
+            default_hedge_delay: 지연 표본이 부족할 때 사용할 헤지 대기 시간 (초)
+            min_hedge_delay: 헤지 대기 시간 하한 (초)
+            failover: 다음 제공자로 넘길 오류인지 판단하는 함수 (서킷 브레이커 집계와는 별개)
+            breaker_options: CircuitBreaker 설정
+        """
+        self.hedge = hedge
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.failover = failover
+        self.breakers = {name: CircuitBreaker(name, **breaker_options) for name in providers}
+        self.latency = {name: LatencyTracker() for name in providers}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stats = {'hedged': 0, 'hedge_wins': 0, 'failovers': 0, 'abandoned_in_flight': 0}
+
+    def hedge_delay(self, provider: str) -> float:
+        """헤지 요청을 보내기 전 기다릴 시간 (최근 p95 응답 시간)"""
+        p95 = self.latency[provider].percentile(0.95)
+        return max(self.min_hedge_delay, p95 if p95 is not None else self.default_hedge_delay)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='llm-hedge')
+            return self._executor
+
+    def _run(self, provider: str, call: Callable[[], Any]) -> Any:
+        """호출 하나를 실행하고 결과를 서킷 브레이커와 지연 기록에 반영"""
+        breaker = self.breakers[provider]
+        start = time.monotonic()
+        try:
+            result = call()
+        except Exception as e:
+            if is_provider_failure(e):
+                breaker.record_failure(time.monotonic() - start)
+            else:
+                breaker.release()
+            raise
+        elapsed = time.monotonic() - start
+        breaker.record_success(elapsed)
+        self.latency[provider].record(elapsed)
+        return result
+
+    def call(self, candidates: List[Tuple[str, Callable[[], Any]]]) -> Tuple[str, Any]:
+        """
+        우선순위 순서로 제공자 호출
+
+        서킷이 열린 제공자는 건너뛰고, failover가 참인 오류로 실패하면 다음 제공자로 넘어갑니다.
+        헤지가 켜져 있으면 주 제공자가 p95 안에 응답하지 않을 때 다음 제공자를 함께 호출하고
+        먼저 성공한 응답을 사용합니다 (스레드에서 진행 중인 쪽은 결과만 버림).
+
+        Args:
+            candidates: (제공자 이름, 인자 없는 호출 함수) 목록 (우선순위 순)
+
+        Returns:
+            (응답한 제공자, 호출 결과) 튜플
+
+        Raises:
+            호출자 측 오류는 그대로, 모든 제공자가 실패하면 RuntimeError
+        """
+        queue = list(candidates)
+        errors: List[str] = []
+        pending: Dict[Future, str] = {}
+        executor = self._get_executor()
+
+        def launch_next() -> bool:
+            while queue:
+                provider, call = queue.pop(0)
+                if self.breakers[provider].allow():
+                    pending[executor.submit(self._run, provider, call)] = provider
+                    return True
+                errors.append(f"{provider}: circuit open")
+            return False
+
+        launch_next()
+        first_provider = candidates[0][0] if candidates else ''
+        while pending:
+            timeout = None
+            if self.hedge and queue and len(pending) == 1:
+                timeout = self.hedge_delay(next(iter(pending.values())))
+
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # 주 제공자가 p95 안에 응답하지 않아 다음 제공자에도 요청
+                if launch_next():
+                    self._stats['hedged'] += 1
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    self._abandon(pending)
+                    if provider != first_provider:
+                        self._stats['hedge_wins' if pending else 'failovers'] += 1
+                    return provider, future.result()
+                if not self.failover(error):
+                    self._abandon(pending)
+                    raise error
+                errors.append(f"{provider}: {error}")
+
+            if not pending:
+                launch_next()
+
+        raise RuntimeError(f"All providers failed ({'; '.join(errors) or 'no provider available'})")
+
+    def _abandon(self, pending: Dict[Future, str]) -> None:
+        """
+        남은 호출 포기
+
+        시작 전인 호출만 취소됩니다. 동기 SDK 호출은 도중에 중단할 수 없으므로 이미 보낸 요청은
+        끝까지 실행되어 과금되고, 결과는 버리지만 서킷 브레이커와 지연 기록에는 반영됩니다
+        (stats의 abandoned_in_flight로 집계).
+        """
+        for future, provider in pending.items():
+            if future.cancel():
+                self.breakers[provider].release()
+            else:
+                self._stats['abandoned_in_flight'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """제공자별 서킷 상태, p95 지연 시간, 헤지/장애 전환 횟수"""
+        return {
+            'providers': {
+                name: dict(breaker.stats(), p95_seconds=self.latency[name].percentile(0.95))
+                for name, breaker in self.breakers.items()
+            },
+            **self._stats
+        }
+
+    def close(self) -> None:
+        """헤지용 스레드 풀 종료"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,228 @@
+"""
+LLM 응답 캐시
+
+같은 기사를 재처리하거나 재시도할 때 API를 다시 호출하지 않도록
+제공자, 모델, 프롬프트 템플릿 버전, 호출 파라미터, 프롬프트 내용의 해시를 키로
+응답을 저장합니다. 메모리 LRU와 SQLite 디스크 저장소의 2단계로 구성되며,
+TTL 만료와 크기 제한 기반 제거를 지원합니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def make_cache_key(provider: str, model: str, prompt_version: str,
+                   params: Dict[str, Any], content: str) -> str:
+    """
+    캐시 키 생성
+
+    Args:
+        provider: API 제공자 ('anthropic', 'openai')
+        model: 모델 이름
+        prompt_version: 프롬프트 템플릿 버전
+        params: 호출 파라미터 (max_tokens, temperature 등)
+        content: 프롬프트 내용
+
+    Returns:
+        SHA-256 해시 문자열
+    """
+    payload = json.dumps(
+        [provider, model, prompt_version, params, content],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """메모리 LRU + SQLite 2단계 응답 캐시"""
+
+    def __init__(self, db_path: str = 'data/llm_cache.db', ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 10000, memory_entries: int = 256):
+        """
+        캐시 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            ttl_seconds: 항목 유효 시간 (초)
+            max_entries: 디스크에 보관할 최대 항목 수
+            memory_entries: 메모리 LRU에 보관할 최대 항목 수
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        db_file = Path(db_path)
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+        """)
+        self._conn.commit()
+        self._disk_count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시 조회
+
+        Args:
+            key: make_cache_key로 만든 키
+
+        Returns:
+            저장된 응답 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                'SELECT value, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                self._disk_count -= 1
+                self._stats['misses'] += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self._remember(key, value, created_at)
+            self._stats['disk_hits'] += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        응답 저장
+
+        Args:
+            key: make_cache_key로 만든 키
+            value: 저장할 응답 텍스트
+        """
+        now = time.time()
+
+        with self._lock:
+            exists = self._conn.execute(
+                'SELECT 1 FROM responses WHERE key = ?', (key,)
+            ).fetchone() is not None
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?)',
+                (key, value, now, now)
+            )
+            if not exists:
+                self._disk_count += 1
+            self._evict_disk()
+            self._conn.commit()
+            self._remember(key, value, now)
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        """메모리 LRU에 항목 추가 (잠금 보유 상태에서 호출)"""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        """만료 항목과 크기 제한을 넘는 오래된 항목 제거 (잠금 보유 상태에서 호출)"""
+        if self._disk_count <= self.max_entries:
+            return
+
+        expired = self._conn.execute(
+            'DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+        ).rowcount
+        self._disk_count -= expired
+        self._stats['evictions'] += expired
+
+        overflow = self._disk_count - self.max_entries
+        if overflow > 0:
+            # 한 번에 10% 여유를 두고 제거하여 매 저장마다 제거가 반복되지 않도록 함
+            overflow += self.max_entries // 10
+            removed = self._conn.execute(
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)',
+                (overflow,)
+            ).rowcount
+            self._disk_count -= removed
+            self._stats['evictions'] += removed
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 통계 반환"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = self._disk_count
+
+        hits = stats['memory_hits'] + stats['disk_hits']
+        total = hits + stats['misses']
+        stats['hit_rate'] = hits / total if total else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._disk_count = 0
+
+    def close(self) -> None:
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+# 프로세스 전역 캐시 인스턴스
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    전역 응답 캐시 반환 (환경 변수로 설정)
+
+    - LLM_CACHE_PATH: SQLite 파일 경로 (기본값: data/llm_cache.db)
+    - LLM_CACHE_TTL: 유효 시간 초 (기본값: 7일)
+    - LLM_CACHE_MAX_ENTRIES: 최대 항목 수 (기본값: 10000)
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                db_path=os.getenv('LLM_CACHE_PATH', 'data/llm_cache.db'),
+                ttl_seconds=float(os.getenv('LLM_CACHE_TTL', 7 * 24 * 3600)),
+                max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', 10000))
+            )
+        return _response_cache
@@ -0,0 +1,273 @@
+"""
+텍스트 밀도 기반 본문 영역 선택
+
+페이지의 텍스트 블록별 특징(텍스트 길이, 링크 밀도, 태그 비율)을 NumPy 배열로
+한 번에 계산하고, 본문 점수의 합이 최대가 되는 연속 블록 구간을 기사 본문으로
+선택합니다. 선택자 기반 탐색이 거대한 래퍼 요소를 잡아 내비게이션이나 관련 기사
+목록까지 추출하는 문제를 줄이기 위해 사용됩니다.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+# 텍스트를 묶는 블록 단위 요소
+BLOCK_TAGS = frozenset([
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'pre',
+    'td', 'dd', 'figcaption', 'div', 'section', 'article', 'main'
+])
+
+# 본문 영역 컨테이너로 반환하지 않을 단일 문단 요소
+LEAF_BLOCK_TAGS = frozenset([
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'pre',
+    'td', 'dd', 'figcaption'
+])
+
+# 텍스트를 무시할 요소
+SKIP_TAGS = frozenset(['script', 'style', 'noscript', 'template', 'svg', 'iframe'])
+
+# 내부 블록을 모두 보일러플레이트로 간주할 요소
+CHROME_TAGS = frozenset(['nav', 'header', 'footer', 'aside', 'form', 'menu'])
+
+# 본문 블록 판정 기준
+MAX_LINK_DENSITY = 0.33
+MIN_BLOCK_WORDS = 8
+MAX_TAG_RATIO = 0.5
+
+# 짧은 블록(날짜, 캡션, 버튼 등)에 부과하는 고정 비용 (문자 수 단위)
+SHORT_BLOCK_COST = 20.0
+
+# 선택된 구간이 본문으로 인정되기 위한 최소 텍스트 길이
+MIN_REGION_CHARS = 250
+
+# 선택자로 찾은 요소를 밀도 점수 계산 없이 본문으로 쓸 최대 링크 밀도
+SELECTOR_MAX_LINK_DENSITY = 0.1
+
+
+def _collect_blocks(soup: BeautifulSoup) -> Dict[str, list]:
+    """
+    문서를 한 번 순회하며 블록별 원시 특징 수집
+
+    Args:
+        soup: 파싱된 HTML
+
+    Returns:
+        블록 요소 리스트와 특징 리스트를 담은 딕셔너리 (문서 순서)
+    """
+    index: Dict[int, int] = {}
+    blocks: List[Tag] = []
+    chars: List[int] = []
+    link_chars: List[int] = []
+    words: List[int] = []
+    inline_tags: List[int] = []
+    chrome: List[bool] = []
+    chrome_cache: Dict[int, bool] = {}
+
+    for node in soup.find_all(string=True):
+        parent = node.parent
+        if parent is None or parent.name in SKIP_TAGS:
+            continue
+        text = node.strip()
+        if not text:
+            continue
+
+        # 가장 가까운 블록 요소까지 올라가면서 링크 여부와 인라인 태그 수 확인
+        in_link = False
+        depth = 0
+        block = parent
+        while block is not None and block.name not in BLOCK_TAGS:
+            if block.name == 'a':
+                in_link = True
+            elif block.name in SKIP_TAGS:
+                break
+            depth += 1
+            block = block.parent
+        if block is None or block.name in SKIP_TAGS:
+            continue
+
+        key = id(block)
+        position = index.get(key)
+        if position is None:
+            position = len(blocks)
+            index[key] = position
+            blocks.append(block)
+            chars.append(0)
+            link_chars.append(0)
+            words.append(0)
+            inline_tags.append(0)
+            chrome.append(_in_chrome(block, chrome_cache))
+
+        chars[position] += len(text)
+        words[position] += len(text.split())
+        inline_tags[position] += depth
+        if in_link:
+            link_chars[position] += len(text)
+
+    return {
+        'blocks': blocks,
+        'chars': chars,
+        'link_chars': link_chars,
+        'words': words,
+        'inline_tags': inline_tags,
+        'chrome': chrome
+    }
+
+
+def _in_chrome(block: Tag, cache: Dict[int, bool]) -> bool:
+    """블록이 내비게이션/푸터 등 페이지 골격 요소 안에 있는지 확인"""
+    visited = []
+    element: Optional[Tag] = block
+    result = False
+
+    while element is not None:
+        key = id(element)
+        if key in cache:
+            result = cache[key]
+            break
+        visited.append(key)
+        if element.name in CHROME_TAGS or element.get('role') == 'navigation':
+            result = True
+            break
+        element = element.parent
+
+    for key in visited:
+        cache[key] = result
+    return result
+
+
+def score_blocks(chars: np.ndarray, link_chars: np.ndarray, words: np.ndarray,
+                 inline_tags: np.ndarray, chrome: np.ndarray) -> np.ndarray:
+    """
+    블록별 본문 점수 계산 (벡터 연산)
+
+    본문으로 판정된 블록은 링크가 아닌 텍스트 길이만큼 양수 점수를,
+    나머지 블록은 링크 텍스트 길이와 고정 비용만큼 음수 점수를 받습니다.
+
+    Args:
+        chars: 블록별 텍스트 길이
+        link_chars: 블록별 링크 텍스트 길이
+        words: 블록별 단어 수
+        inline_tags: 블록별 인라인 태그 수
+        chrome: 블록이 페이지 골격 요소 안에 있는지 여부
+
+    Returns:
+        블록별 점수 배열
+    """
+    safe_chars = np.maximum(chars, 1)
+    link_density = link_chars / safe_chars
+    tag_ratio = inline_tags / np.maximum(words, 1)
+
+    is_content = (
+        (link_density < MAX_LINK_DENSITY) &
+        (words >= MIN_BLOCK_WORDS) &
+        (tag_ratio < MAX_TAG_RATIO) &
+        ~chrome
+    )
+
+    content_score = chars * (1.0 - link_density)
+    noise_score = -(link_chars + SHORT_BLOCK_COST)
+    noise_score = np.where(chrome, -(chars + SHORT_BLOCK_COST), noise_score)
+
+    return np.where(is_content, content_score, noise_score)
+
+
+def densest_region(scores: np.ndarray) -> tuple:
+    """
+    점수 합이 최대인 연속 구간 계산 (누적합 기반 최대 부분합)
+
+    Args:
+        scores: 블록별 점수 배열
+
+    Returns:
+        (시작 인덱스, 끝 인덱스, 구간 점수) - 끝 인덱스 포함
+    """
+    prefix = np.concatenate(([0.0], np.cumsum(scores)))
+    running_min = np.minimum.accumulate(prefix[:-1])
+    gains = prefix[1:] - running_min
+
+    end = int(np.argmax(gains))
+    start = int(np.argmin(prefix[:end + 1]))
+    return start, end, float(gains[end])
+
+
+def is_article_element(element: Tag, min_chars: int = MIN_REGION_CHARS) -> bool:
+    """
+    선택자로 찾은 요소를 밀도 점수 계산 없이 본문으로 써도 되는지 확인
+
+    페이지 골격 요소를 품지 않고, 링크 텍스트 비율이 낮고, 텍스트가 충분하면
+    관련 기사 목록까지 감싼 래퍼가 아닌 기사 본문으로 봅니다.
+
+    Args:
+        element: 선택자로 찾은 요소
+        min_chars: 본문으로 인정할 최소 텍스트 길이
+
+    Returns:
+        그대로 본문으로 쓸 수 있는지 여부
+    """
+    if element.name in CHROME_TAGS:
+        return False
+
+    chars = 0
+    link_chars = 0
+    for node in element.descendants:
+        if type(node) is NavigableString:
+            chars += len(node)
+        elif isinstance(node, Tag):
+            if node.name in CHROME_TAGS or node.get('role') == 'navigation':
+                return False
+            if node.name == 'a':
+                link_chars += len(node.get_text())
+    return chars >= min_chars and link_chars <= chars * SELECTOR_MAX_LINK_DENSITY
+
+
+def _common_ancestor(first: Tag, last: Tag) -> Optional[Tag]:
+    """두 요소의 가장 가까운 공통 조상 찾기"""
+    ancestors = {id(first)}
+    ancestors.update(id(parent) for parent in first.parents)
+
+    element: Optional[Tag] = last
+    while element is not None:
+        if id(element) in ancestors:
+            return element
+        element = element.parent
+    return None
+
+
+def select_article_region(soup: BeautifulSoup,
+                          min_chars: int = MIN_REGION_CHARS) -> Optional[Tag]:
+    """
+    텍스트 밀도가 가장 높은 연속 영역을 감싸는 요소 반환
+
+    Args:
+        soup: 파싱된 HTML
+        min_chars: 본문으로 인정할 최소 텍스트 길이
+
+    Returns:
+        본문 영역 요소 (충분한 본문을 찾지 못하면 None)
+    """
+    features = _collect_blocks(soup)
+    blocks = features['blocks']
+    if not blocks:
+        return None
+
+    chars = np.asarray(features['chars'], dtype=np.float64)
+    scores = score_blocks(
+        chars,
+        np.asarray(features['link_chars'], dtype=np.float64),
+        np.asarray(features['words'], dtype=np.float64),
+        np.asarray(features['inline_tags'], dtype=np.float64),
+        np.asarray(features['chrome'], dtype=bool)
+    )
+
+    start, end, gain = densest_region(scores)
+    if gain <= 0 or chars[start:end + 1][scores[start:end + 1] > 0].sum() < min_chars:
+        return None
+
+    region = _common_ancestor(blocks[start], blocks[end])
+    # 구간이 문단 하나뿐이면 본문 추출이 가능하도록 상위 컨테이너 사용
+    while region is not None and region.name in LEAF_BLOCK_TAGS:
+        region = region.parent
+    if region is None or region.name == '[document]':
+        return None
+    return region
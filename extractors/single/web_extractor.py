@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, NavigableString, Tag
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -10,22 +10,65 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from fake_useragent import UserAgent
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union, cast
+from typing import Dict, List, Optional, Any, Tuple, Union, cast
 import logging
 import time
 import os
+import re
+
+from text_utils.keyword_matcher import KeywordMatcher
+from text_utils.simhash import dedupe_near_duplicates, DEFAULT_MAX_DISTANCE
+from .boilerplate import is_article_element, select_article_region
+
+# 기사 컨테이너 태그 (스트리밍 조기 종료 감지용)
+ARTICLE_TAG_PATTERN = re.compile(rb'<(/?)article\b', re.IGNORECASE)
+# 본문 기사 컨테이너 판별용 (<h1> 또는 og:title 문구를 포함해야 관련 기사 카드가 아닌 본문으로 봄)
+_H1_TAG_PATTERN = re.compile(rb'<h1[\s>]', re.IGNORECASE)
+_OG_TITLE_TAG_PATTERN = re.compile(rb'<meta\b[^>]*?og:title[^>]*>', re.IGNORECASE)
+_CONTENT_ATTR_PATTERN = re.compile(rb'\bcontent\s*=\s*(["\'])(.*?)\1', re.IGNORECASE | re.DOTALL)
+
+# 본문 문단으로 추출할 요소
+_CONTENT_TAGS = ['p', 'h2', 'h3', 'h4', 'blockquote', 'div']
+
+# 기사 본문 선택자 'article', '.article', '.articlePage', '.story-body', '.content', '.post-content',
+# '[class*="article"]', '[class*="content"]'의 우선순위 (문서를 한 번만 순회해 평가, 작을수록 우선)
+_ARTICLE_CLASS_RANKS = {'article': 1, 'articlePage': 2, 'story-body': 3, 'content': 4, 'post-content': 5}
+_ARTICLE_CLASS_PARTS = (('article', 6), ('content', 7))
+_NO_SELECTOR_RANK = len(_ARTICLE_CLASS_RANKS) + len(_ARTICLE_CLASS_PARTS) + 1
+
+# 본문에서 건너뛸 홍보 문단 키워드 (단어 단위 매칭이라 'following', 'unrelated'가 든 문단은 남김)
+_PROMOTIONAL_KEYWORDS = KeywordMatcher([
+    'recommended', 'related', 'subscribe', 'follow', 'download',
+    'sign up', 'newsletter', 'advertisement', 'sponsored'
+], plurals=True)
 
 class WebExtractor:
-    def __init__(self, use_selenium: bool = False, save_to_file: bool = True):
+    # 스트리밍 다운로드 청크 크기
+    CHUNK_SIZE = 64 * 1024
+    # 이 크기 이상의 본문 기사 컨테이너(<h1>이나 og:title 포함)가 닫히면 다운로드 중단
+    MIN_ARTICLE_BYTES = 2 * 1024
+    # 압축 비율 검사를 시작하는 최소 해제 크기
+    MIN_RATIO_CHECK_BYTES = 1024 * 1024
+
+    def __init__(self, use_selenium: bool = False, save_to_file: bool = True,
+                 max_response_bytes: int = 5 * 1024 * 1024,
+                 max_compression_ratio: int = 100,
+                 near_duplicate_distance: int = DEFAULT_MAX_DISTANCE):
         """
         웹 콘텐츠 추출기 초기화
         
         Args:
             use_selenium: Selenium 사용 여부
             save_to_file: 결과를 파일로 저장할지 여부
+            max_response_bytes: requests 모드에서 읽을 최대 본문 크기 (압축 해제 후)
+            max_compression_ratio: 허용할 최대 압축 해제 비율 (압축 폭탄 방지)
+            near_duplicate_distance: 유사 중복 문단 판정 해밍 거리 (0이면 완전 일치만 제거)
         """
         self.use_selenium = use_selenium
         self.save_to_file = save_to_file
+        self.max_response_bytes = max_response_bytes
+        self.max_compression_ratio = max_compression_ratio
+        self.near_duplicate_distance = near_duplicate_distance
         self.driver: Optional[webdriver.Chrome] = None
         self.session = requests.Session()
         self.ua = UserAgent()
@@ -95,13 +138,117 @@ class WebExtractor:
     
     def _extract_with_requests(self, url: str) -> Dict[str, Any]:
         """requests를 사용한 데이터 추출"""
-        headers = {'User-Agent': self.ua.random}
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        html, encoding = self._fetch_html(url)
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
         return self._parse_content(soup, url)
     
+    def _fetch_html(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """
+        HTML 스트리밍 다운로드
+        
+        본문을 청크 단위로 읽으면서 최대 크기를 넘으면 경고를 남기고 그때까지 읽은 부분만 쓰며
+        (Content-Length는 압축된 크기라 미리 거부하지 않음), 압축 해제 비율이 비정상적으로
+        높으면 중단합니다. 본문 기사 컨테이너(<h1>이나 og:title 문구를 포함한 <article>)가
+        닫히면 나머지는 읽지 않습니다. 본문 앞에 오는 관련 기사 카드 <article>에서는 멈추지 않습니다.
+        
+        Args:
+            url: 다운로드할 URL
+            
+        Returns:
+            (HTML 바이트, 헤더에 명시된 인코딩 또는 None)
+        """
+        headers = {'User-Agent': self.ua.random}
+        with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            
+            declared_length = response.headers.get('Content-Length', '')
+            if declared_length.isdigit() and int(declared_length) > self.max_response_bytes:
+                self.logger.warning(
+                    f"응답 크기 {int(declared_length)} bytes가 최대 {self.max_response_bytes} bytes를 "
+                    f"넘어 앞부분만 읽습니다: {url}"
+                )
+            
+            # charset이 명시된 경우에만 인코딩 지정 (그 외에는 BeautifulSoup이 감지)
+            content_type = response.headers.get('Content-Type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else None
+            
+            body = bytearray()
+            scan_pos = 0
+            depth = 0
+            article_start = 0
+            
+            for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                if not chunk:
+                    continue
+                
+                remaining = self.max_response_bytes - len(body)
+                if len(chunk) > remaining:
+                    body.extend(chunk[:remaining])
+                    self.logger.warning(
+                        f"응답이 {self.max_response_bytes} bytes를 초과하여 잘라냅니다: {url}"
+                    )
+                    break
+                body.extend(chunk)
+                
+                # 압축 폭탄 검사 (소켓에서 읽은 압축 바이트 대비 해제된 바이트)
+                wire_bytes = response.raw.tell()
+                if (len(body) >= self.MIN_RATIO_CHECK_BYTES and wire_bytes and
+                        len(body) / wire_bytes > self.max_compression_ratio):
+                    raise ValueError(
+                        f"비정상적인 압축 비율 감지: {len(body)}/{wire_bytes} bytes"
+                    )
+                
+                # 기사 컨테이너 종료 감지
+                for match in ARTICLE_TAG_PATTERN.finditer(body, scan_pos):
+                    if not match.group(1):
+                        if depth == 0:
+                            article_start = match.start()
+                        depth += 1
+                        scan_pos = match.end()
+                        continue
+                    
+                    tag_end = body.find(b'>', match.end())
+                    if tag_end == -1:
+                        # 닫는 태그가 청크 경계에 걸린 경우 다음 청크에서 다시 검사
+                        scan_pos = match.start()
+                        break
+                    scan_pos = tag_end + 1
+                    if depth == 0:
+                        continue
+                    depth -= 1
+                    if (depth == 0 and tag_end - article_start >= self.MIN_ARTICLE_BYTES and
+                            self._is_main_article(body, article_start, tag_end)):
+                        self.logger.info(f"기사 본문 수신 완료, 다운로드 조기 종료: {tag_end + 1} bytes")
+                        return bytes(body[:tag_end + 1]), encoding
+                else:
+                    # 다음 청크와 이어질 수 있는 태그 조각을 위해 약간 겹쳐서 검사
+                    scan_pos = max(scan_pos, len(body) - len(b'<article'))
+        
+        return bytes(body), encoding
+    
+    @staticmethod
+    def _is_main_article(body: bytearray, start: int, end: int) -> bool:
+        """
+        닫힌 <article>이 페이지의 본문 기사인지 판단
+
+        <h1>을 포함하거나, 앞서 받은 og:title 문구를 포함하면 본문으로 봅니다.
+
+        Args:
+            body: 지금까지 받은 HTML
+            start: <article> 시작 위치
+            end: </article> 끝 위치
+
+        Returns:
+            본문 기사 컨테이너 여부
+        """
+        if _H1_TAG_PATTERN.search(body, start, end):
+            return True
+        og_tag = _OG_TITLE_TAG_PATTERN.search(body, 0, start)
+        content = _CONTENT_ATTR_PATTERN.search(og_tag.group(0)) if og_tag else None
+        title = content.group(2).strip() if content else b''
+        return bool(title) and body.find(title, start, end) != -1
+
     def _extract_with_selenium(self, url: str) -> Dict[str, Any]:
         """Selenium을 사용한 데이터 추출"""
         if self.driver is None:
@@ -134,22 +281,32 @@ class WebExtractor:
     
     def _find_article(self, soup: BeautifulSoup) -> Optional[Tag]:
         """기사 본문 요소 찾기"""
-        # Try different selectors for article content
-        selectors = [
-            'article',
-            '.article',
-            '.articlePage',
-            '.story-body',
-            '.content',
-            '.post-content',
-            '[class*="article"]',
-            '[class*="content"]'
-        ]
+        # 선택자로 찾은 요소가 본문만 담고 있으면 밀도 점수 계산 없이 사용
+        element = self._select_article(soup)
+        if element is not None and is_article_element(element):
+            return element
         
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element and isinstance(element, Tag):
-                return element
+        # 선택자 결과가 없거나 내비게이션/링크 목록을 품은 래퍼면 텍스트 밀도 기반으로 본문 영역 선택
+        region = select_article_region(soup)
+        if region is not None:
+            return region
+        return element
+    
+    def _select_article(self, soup: BeautifulSoup) -> Optional[Tag]:
+        """선택자 목록으로 기사 본문 요소 찾기"""
+        # 선택자마다 문서 전체를 다시 훑지 않도록 한 번 순회하며 가장 우선하는 요소 선택
+        best: Optional[Tag] = None
+        best_rank = _NO_SELECTOR_RANK
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            rank = 0 if element.name == 'article' else self._selector_rank(element.get('class'))
+            if rank < best_rank:
+                best, best_rank = element, rank
+                if rank == 0:
+                    break
+        if best is not None:
+            return best
         
         # Fallback: look for main content area
         main = soup.find('main') or soup.find('div', {'role': 'main'})
@@ -158,6 +315,17 @@ class WebExtractor:
             
         return None
     
+    @staticmethod
+    def _selector_rank(classes: Optional[List[str]]) -> int:
+        """클래스 목록이 맞는 기사 본문 선택자 중 가장 높은 우선순위"""
+        rank = _NO_SELECTOR_RANK
+        for name in classes or ():
+            rank = min(rank, _ARTICLE_CLASS_RANKS.get(name, _NO_SELECTOR_RANK))
+            for part, part_rank in _ARTICLE_CLASS_PARTS:
+                if part_rank < rank and part in name:
+                    rank = part_rank
+        return rank
+    
     def _get_title(self, soup: BeautifulSoup) -> str:
         """제목 추출"""
         # Try multiple title selectors
@@ -202,30 +370,66 @@ class WebExtractor:
         paragraphs = []
         
         # Find all text content elements
-        content_elements = article.find_all(['p', 'h2', 'h3', 'h4', 'blockquote', 'div'])
+        content_elements = article.find_all(_CONTENT_TAGS)
         
         for element in content_elements:
             if not isinstance(element, Tag):
                 continue
-                
-            text = element.get_text().strip()
             
-            # Skip promotional content
-            skip_keywords = [
-                'recommended', 'related', 'subscribe', 'follow', 'download',
-                'sign up', 'newsletter', 'advertisement', 'sponsored'
-            ]
+            # 다른 본문 요소를 감싸는 래퍼 div는 자식 요소에서 추출되므로 래퍼에 직접 쓰인 텍스트만 추출
+            if element.name == 'div' and element.find(_CONTENT_TAGS) is not None:
+                texts = self._direct_text_runs(element)
+            else:
+                texts = [element.get_text().strip()]
             
-            if (text and 
-                len(text) > 10 and 
-                not any(keyword in text.lower() for keyword in skip_keywords)):
-                paragraphs.append(text)
+            for text in texts:
+                # Skip promotional content
+                if (text and 
+                    len(text) > 10 and 
+                    not _PROMOTIONAL_KEYWORDS.search(text)):
+                    paragraphs.append(text)
+        
+        # 유사 중복 문단 제거 (반복 캡션, 약간 다른 동일 문장)
+        paragraphs = dedupe_near_duplicates(paragraphs, self.near_duplicate_distance)
         
         return {
             'text': '\n\n'.join(paragraphs),
             'paragraphs': paragraphs
         }
     
+    @staticmethod
+    def _direct_text_runs(wrapper: Tag) -> List[str]:
+        """
+        래퍼 div에 본문 요소 없이 직접 쓰인 텍스트 구간
+
+        '<div>첫 문단.<br>둘째 문단.<div>…</div></div>'처럼 본문 요소 사이에 놓인 텍스트를
+        <br>과 본문 요소를 경계로 나눠 반환합니다 (인라인 요소 안의 텍스트는 포함).
+
+        Args:
+            wrapper: 다른 본문 요소를 포함한 div
+
+        Returns:
+            텍스트 구간 리스트 (직접 쓰인 텍스트가 없으면 빈 리스트)
+        """
+        if not any(type(child) is NavigableString and child.strip() for child in wrapper.children):
+            return []
+        
+        runs = []
+        current: List[str] = []
+        for child in wrapper.children:
+            if type(child) is NavigableString:
+                current.append(str(child))
+                continue
+            if not isinstance(child, Tag):
+                continue
+            if child.name == 'br' or child.name in _CONTENT_TAGS or child.find(_CONTENT_TAGS) is not None:
+                runs.append(''.join(current).strip())
+                current = []
+            else:
+                current.append(child.get_text())
+        runs.append(''.join(current).strip())
+        return [run for run in runs if run]
+    
     def _get_author(self, soup: BeautifulSoup) -> str:
         """저자 정보 추출"""
         # Try meta tag first
@@ -15,7 +15,7 @@ import sys
 import argparse
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 from datetime import datetime
 
@@ -24,6 +24,7 @@ current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 from extractors.single.web_extractor import WebExtractor
+from converters.base_converter import BaseConverter
 from converters.factory import create_converter, print_converter_status
 
 
@@ -44,8 +45,44 @@ class NewsConverterService:
         self.temp_dir = Path('temp_extracted')
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         
+        # 변환기 타입별 인스턴스 (None은 자동 선택) - 서비스 수명 동안 재사용
+        self._converters: Dict[Optional[str], BaseConverter] = {}
+        
         print("🚀 뉴스 변환 통합 서비스 시작")
     
+    def get_converter(self, converter_type: Optional[str] = None) -> BaseConverter:
+        """
+        변환기 반환 (타입별로 처음 한 번만 생성)
+        
+        SDK 클라이언트, 매핑 테이블, 출력 디렉토리 준비 비용은 첫 기사에서만 발생합니다.
+        
+        Args:
+            converter_type: 변환기 타입 (None이면 자동 선택)
+            
+        Returns:
+            변환기 인스턴스
+        """
+        converter = self._converters.get(converter_type)
+        if converter is None:
+            converter = create_converter(converter_type, str(self.output_dir))
+            self._converters[converter_type] = converter
+        return converter
+    
+    def close(self) -> None:
+        """보유한 변환기를 모두 닫음 (서비스 사용이 끝나면 호출)"""
+        for converter in self._converters.values():
+            try:
+                converter.close()
+            except Exception as e:
+                print(f"⚠️  변환기 종료 실패: {str(e)}")
+        self._converters.clear()
+    
+    def __enter__(self) -> 'NewsConverterService':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def _validate_url(self, url: str) -> bool:
         """
         URL 유효성 검사
@@ -141,7 +178,7 @@ class NewsConverterService:
         print(f"🤖 마크다운 변환 중...")
         
         try:
-            converter = create_converter(converter_type, str(self.output_dir))
+            converter = self.get_converter(converter_type)
             
             # 변환 실행
             converter.process_file(str(txt_file))
@@ -266,8 +303,12 @@ def interactive_mode():
     # 변환기 상태 출력
     print_converter_status()
     
-    service = NewsConverterService()
-    
+    with NewsConverterService() as service:
+        _interactive_loop(service)
+
+
+def _interactive_loop(service: NewsConverterService):
+    """대화형 모드 메뉴 반복"""
     while True:
         print(f"\n📋 메뉴:")
         print("1. 단일 URL 변환")
@@ -406,8 +447,8 @@ def main():
         return
     
     # 직접 변환 모드
-    service = NewsConverterService(args.output)
-    success, md_file = service.process_url(args.url, args.type, args.keep_txt)
+    with NewsConverterService(args.output) as service:
+        success, md_file = service.process_url(args.url, args.type, args.keep_txt)
     
     if success:
         print(f"\n🎉 성공적으로 완료되었습니다!")
@@ -3,24 +3,19 @@
 모든 콘텐츠 생성 프롬프트와 가이드라인을 한 곳에서 관리
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.response_formatter import (
+    EMOJI_CATEGORIES, TITLE_EMOJIS, fix_title_emoji, format_response, has_title_emoji
+)
+from services.ticker_linker import TickerLinker
 
 
 class ContentGuidelines:
     """콘텐츠 생성 가이드라인 중앙 관리 클래스"""
     
-    # 이모지 카테고리별 분류
-    EMOJI_CATEGORIES = {
-        'finance': ['💰', '💵', '📈', '📊'],
-        'technology': ['🚀', '💡', '🔧', '🌟'],
-        'policy': ['⚖️', '📜', '🏛️', '🔨'],
-        'conflict': ['🔥', '⚔️', '🎯', '🎲'],
-        'cooperation': ['🤝', '📝', '🎊', '🌈'],
-        'growth': ['🌱', '🎉', '💪', '⭐'],
-        'news': ['📰', '⚠️', '💱', '🚗', '⛽'],
-        'tech_companies': ['🤖', '💻', '📱', '🏦', '🏢'],
-        'global': ['🌍', '🇺🇸', '🇨🇳', '🇯🇵', '🇰🇷', '🇪🇺']
-    }
+    # 이모지 카테고리별 분류 (루트 변환기와 같은 표)
+    EMOJI_CATEGORIES = EMOJI_CATEGORIES
     
     # 표준 예시 템플릿
     EXAMPLE_TEMPLATE = """🤝 시진핑-트럼프 회담 준비, 시간 촉박
@@ -48,8 +43,13 @@ class ContentGuidelines:
 #시진핑 #트럼프 #미중정상회담 #무역협상 #중국희토류 #대만 #남중국해"""
 
     @classmethod
-    def get_main_prompt_template(cls) -> str:
-        """메인 프롬프트 템플릿 반환"""
+    def get_system_prompt_template(cls) -> str:
+        """
+        고정 시스템 프롬프트 템플릿 반환 (규칙, 예시, 이모지 가이드)
+        
+        기사와 무관한 부분만 담아 호출마다 같은 접두어가 되도록 하여
+        제공자 프롬프트 캐시(Anthropic cache_control, OpenAI 자동 접두어 캐시)가 적중하게 함
+        """
         return """당신은 뉴스 기사를 한국어 스타일의 마크다운 문서로 변환하는 전문가입니다.
 아래의 형식과 스타일을 정확히 따라 변환해주세요.
 
@@ -108,11 +108,6 @@ class ContentGuidelines:
 예시 형식:
 {example}
 
-입력 데이터:
-제목: {title}
-설명: {description}
-본문: {content}
-
 제목은 반드시 첫 줄에 위치하고, 내용을 잘 표현하는 이모지 하나를 시작에 넣어주세요.
 제목은 단순히 사실을 나열하는 것이 아니라, 내용의 핵심 가치나 의미를 담아 독자의 관심을 끌 수 있게 작성해주세요.
 
@@ -126,15 +121,39 @@ class ContentGuidelines:
 """
 
     @classmethod
-    def get_formatted_prompt(cls, title: str, description: str = "", content: str = "") -> str:
-        """포맷팅된 프롬프트 반환"""
-        template = cls.get_main_prompt_template()
-        return template.format(
-            example=cls.EXAMPLE_TEMPLATE,
+    def get_article_prompt_template(cls) -> str:
+        """기사별 입력 데이터 템플릿 반환"""
+        return """입력 데이터:
+제목: {title}
+설명: {description}
+본문: {content}
+"""
+
+    @classmethod
+    def get_main_prompt_template(cls) -> str:
+        """메인 프롬프트 템플릿 반환 (시스템 프롬프트 + 기사 입력)"""
+        return cls.get_system_prompt_template() + "\n" + cls.get_article_prompt_template()
+
+    @classmethod
+    def get_system_prompt(cls) -> str:
+        """예시가 채워진 고정 시스템 프롬프트 반환"""
+        return cls.get_system_prompt_template().format(example=cls.EXAMPLE_TEMPLATE)
+
+    @classmethod
+    def get_prompt_parts(cls, title: str, description: str = "", content: str = "") -> Tuple[str, str]:
+        """(고정 시스템 프롬프트, 기사별 사용자 메시지) 반환"""
+        user_prompt = cls.get_article_prompt_template().format(
             title=title,
             description=description,
             content=content
         )
+        return cls.get_system_prompt(), user_prompt
+
+    @classmethod
+    def get_formatted_prompt(cls, title: str, description: str = "", content: str = "") -> str:
+        """포맷팅된 프롬프트 반환"""
+        system_prompt, user_prompt = cls.get_prompt_parts(title, description, content)
+        return system_prompt + "\n" + user_prompt
     
     @classmethod
     def get_emoji_for_category(cls, category: str) -> List[str]:
@@ -143,81 +162,75 @@ class ContentGuidelines:
     
     @classmethod
     def get_all_emojis(cls) -> List[str]:
-        """모든 이모지 목록 반환"""
-        all_emojis = []
-        for emojis in cls.EMOJI_CATEGORIES.values():
-            all_emojis.extend(emojis)
-        return list(set(all_emojis))  # 중복 제거
+        """모든 이모지 목록 반환 (카테고리 순서, 중복 없음)"""
+        return list(TITLE_EMOJIS)
     
     @classmethod
     def validate_emoji_format(cls, text: str) -> bool:
-        """이모지 포맷 검증"""
-        lines = text.split('\n')
-        if not lines:
-            return False
-        
-        title_line = lines[0].strip()
-        all_emojis = cls.get_all_emojis()
-        
-        # 제목에 이모지가 있는지 확인
-        emoji_count = sum(1 for emoji in all_emojis if emoji in title_line)
-        
-        # 정확히 1개의 이모지가 있고, 제목 시작에 있는지 확인
-        if emoji_count == 1:
-            for emoji in all_emojis:
-                if title_line.startswith(emoji + ' '):
-                    return True
-        
-        return False
+        """이모지 포맷 검증 (제목이 이모지 하나로 시작하는지, 국기/조합 이모지는 한 글자로 셈)"""
+        return has_title_emoji(text)
     
     @classmethod
     def fix_emoji_format(cls, text: str) -> str:
-        """이모지 포맷 자동 수정"""
-        lines = text.split('\n')
-        if not lines:
-            return text
+        """이모지 포맷 자동 수정 (없으면 📰 추가, 여러 개면 처음 나온 이모지만 유지)"""
+        return fix_title_emoji(text)
+    
+    @classmethod
+    def format_stock_symbols(cls, text: str, seen: Optional[Set[str]] = None) -> str:
+        """
+        주식 심볼 포맷팅
         
-        title_line = lines[0].strip()
-        all_emojis = cls.get_all_emojis()
+        (NASDAQ: TSLA) 표기와 표에 있는 심볼의 (TSLA) 표기를 $TSLA로 바꾸고,
+        처음 언급된 회사 이름 뒤에 $심볼을 붙임 ('(AI)' 같은 일반 약어는 그대로 둠)
         
-        # 이모지 개수 확인
-        emoji_count = sum(1 for emoji in all_emojis if emoji in title_line)
+        Args:
+            text: 원본 텍스트
+            seen: 이미 심볼을 붙인 회사 (여러 줄을 나눠 처리할 때 공유)
+        """
+        return TickerLinker.default().link(text, seen, normalize_tags=True)
+
+
+class IncrementalContentFormatter:
+    """
+    스트리밍 응답용 줄 단위 포맷터
+    
+    fix_content_format의 규칙은 제목 줄(이모지)과 한 줄 안의 패턴(주식 심볼)에만
+    적용되므로, 완성된 줄부터 바로 같은 규칙을 적용해 내보낼 수 있음
+    """
+    
+    def __init__(self, guidelines: ContentGuidelines = None):
+        self.guidelines = guidelines or ContentGuidelines
+        self._buffer = ""
+        self._title_done = False
+        # 앞 줄에서 심볼을 붙인 회사 (한 번에 포맷팅할 때처럼 처음 언급에만 붙임)
+        self._seen = set()
+    
+    def feed(self, chunk: str) -> str:
+        """토큰 조각을 받아 포맷팅이 끝난 완성 줄들을 반환 (없으면 빈 문자열)"""
+        self._buffer += chunk
+        if not self._title_done:
+            # 전체 응답을 strip()한 결과와 같도록 제목 앞 공백은 버림
+            self._buffer = self._buffer.lstrip()
         
-        if emoji_count == 0:
-            # 이모지가 없으면 기본 이모지 추가
-            formatted_title = f"📰 {title_line}"
-        elif emoji_count > 1:
-            # 여러 이모지가 있으면 첫 번째만 유지
-            first_emoji = None
-            for emoji in all_emojis:
-                if emoji in title_line:
-                    first_emoji = emoji
-                    break
-            
-            # 모든 이모지 제거 후 첫 번째 이모지만 추가
-            clean_title = title_line
-            for emoji in all_emojis:
-                clean_title = clean_title.replace(emoji, '')
-            
-            formatted_title = f"{first_emoji} {clean_title.strip()}"
-        else:
-            # 정확히 1개의 이모지가 있는 경우
-            formatted_title = title_line
+        if '\n' not in self._buffer:
+            return ""
         
-        # 수정된 제목으로 교체
-        lines[0] = formatted_title
-        return '\n'.join(lines)
+        complete, self._buffer = self._buffer.rsplit('\n', 1)
+        return ''.join(self._format_line(line) + '\n' for line in complete.split('\n'))
     
-    @classmethod
-    def format_stock_symbols(cls, text: str) -> str:
-        """주식 심볼 포맷팅"""
-        import re
-        # (NASDAQ: TSLA) → $TSLA 형태로 변환
-        text = re.sub(r'\(NASDAQ:\s*([A-Z]+)\)', r' $\1', text)
-        text = re.sub(r'\(NYSE:\s*([A-Z]+)\)', r' $\1', text)
-        text = re.sub(r'\(([A-Z]{1,5})\)', r' $\1', text)  # 일반적인 심볼
-        
-        return text
+    def flush(self) -> str:
+        """남은 마지막 줄을 포맷팅해 반환"""
+        rest, self._buffer = self._buffer.rstrip(), ""
+        if not rest:
+            return ""
+        return self._format_line(rest)
+    
+    def _format_line(self, line: str) -> str:
+        """한 줄 포맷팅 (첫 줄은 제목 이모지 규칙 포함)"""
+        if not self._title_done:
+            self._title_done = True
+            line = self.guidelines.fix_emoji_format(line)
+        return self.guidelines.format_stock_symbols(line, self._seen)
 
 
 # 전역 인스턴스
@@ -230,20 +243,19 @@ def get_content_prompt(title: str, description: str = "", content: str = "") ->
     return content_guidelines.get_formatted_prompt(title, description, content)
 
 
+def get_content_prompt_parts(title: str, description: str = "", content: str = "") -> Tuple[str, str]:
+    """콘텐츠 생성 프롬프트를 고정 시스템 프롬프트와 기사별 메시지로 나눠 가져오기"""
+    return content_guidelines.get_prompt_parts(title, description, content)
+
+
 def validate_content_format(text: str) -> bool:
     """콘텐츠 포맷 검증"""
     return content_guidelines.validate_emoji_format(text)
 
 
 def fix_content_format(text: str) -> str:
-    """콘텐츠 포맷 자동 수정"""
-    # 이모지 포맷 수정
-    text = content_guidelines.fix_emoji_format(text)
-    
-    # 주식 심볼 포맷 수정
-    text = content_guidelines.format_stock_symbols(text)
-    
-    return text
+    """콘텐츠 포맷 자동 수정 (제목 이모지, 주식 심볼)"""
+    return format_response(text)
 
 
 def get_emoji_suggestions(category: str = 'news') -> List[str]:
@@ -4,6 +4,7 @@
 """
 
 import asyncio
+import json
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -11,7 +12,7 @@ from typing import Dict, Any, Optional
 
 from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, HttpUrl
 import uvicorn
 
@@ -39,6 +40,8 @@ class ConversionRequest(BaseModel):
     content: str
     provider: str = 'openai'
     user_api_key: Optional[str] = None
+    # 장애 전환에 쓸 다른 제공자의 사용자 API 키 (서버 LLM_FAILOVER=true일 때만 사용)
+    fallback_api_keys: Optional[Dict[str, str]] = None
 
 
 class ApiKeyValidationRequest(BaseModel):
@@ -78,9 +81,13 @@ async def lifespan(app: FastAPI):
         else:
             logger.warning(f"⚠️  {provider.upper()} API key not available")
     
+    # 서버 측 키의 API 클라이언트 예열 (첫 요청의 연결/TLS 비용 제거)
+    await converter.warm_up()
+    
     yield
     
     logger.info("🛑 NewsForge Pro Unified API Shutting down...")
+    await converter.aclose()
 
 
 # FastAPI 앱 초기화
@@ -154,7 +161,8 @@ async def convert_news_endpoint(
             title=request.title,
             content=request.content,
             provider=request.provider,
-            user_api_key=request.user_api_key
+            user_api_key=request.user_api_key,
+            fallback_api_keys=request.fallback_api_keys
         )
         
         # 백그라운드 태스크로 사용량 로깅 (필요시)
@@ -170,6 +178,48 @@ async def convert_news_endpoint(
         raise HTTPException(status_code=500, detail="내부 서버 오류가 발생했습니다")
 
 
+# 스트리밍 변환 엔드포인트
+@app.post("/api/v1/convert/stream")
+async def convert_news_stream_endpoint(request: ConversionRequest):
+    """
+    뉴스 기사를 마크다운으로 변환하며 결과를 SSE(text/event-stream)로 전달
+    
+    start → delta(여러 번) → done 또는 error 순서로 이벤트를 보내며,
+    done 이벤트에는 /api/v1/convert 응답과 같은 메타데이터와 토큰 사용량이 담김
+    """
+    logger.info(f"🔄 Streaming conversion: {request.url}")
+    converter = get_unified_converter()
+    
+    async def event_stream():
+        async for event in converter.stream_news(
+            url=str(request.url),
+            title=request.title,
+            content=request.content,
+            provider=request.provider,
+            user_api_key=request.user_api_key,
+            fallback_api_keys=request.fallback_api_keys
+        ):
+            yield _format_sse(event)
+            if event['event'] in ('done', 'error'):
+                await log_usage(event)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # 프록시(nginx 등)가 응답을 모았다가 보내지 않도록 버퍼링 해제
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """스트리밍 이벤트를 SSE 메시지로 직렬화"""
+    payload = {key: value for key, value in event.items() if key != 'event'}
+    return f"event: {event['event']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
 # API 키 검증 엔드포인트
 @app.post("/api/v1/validate-key")
 async def validate_api_key_endpoint(request: ApiKeyValidationRequest):
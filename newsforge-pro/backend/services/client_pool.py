@@ -0,0 +1,188 @@
+"""
+제공자별 비동기 LLM 클라이언트 풀
+
+요청마다 AsyncOpenAI/AsyncAnthropic을 새로 만들면 연결 풀 생성과 TLS 핸드셰이크
+비용을 매번 치르고 클라이언트도 닫히지 않습니다. 이 모듈은 (제공자, API 키 해시)를
+키로 클라이언트를 재사용하고, 최대 개수를 넘으면 가장 오래 쓰지 않은 클라이언트를
+제거합니다. 제거된 클라이언트는 진행 중인 요청이 모두 끝난 뒤 닫힙니다.
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+import anthropic
+import openai
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLIENTS = 64
+
+
+def hash_api_key(api_key: str) -> str:
+    """풀 키와 로그에 쓰는 API 키 해시 (원본 키는 보관하지 않음)"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class _PooledClient:
+    """풀에 보관된 클라이언트와 사용 중인 요청 수"""
+
+    __slots__ = ('client', 'leases', 'evicted')
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.leases = 0
+        self.evicted = False
+
+
+class ClientPool:
+    """(제공자, API 키 해시) 기반 LRU 비동기 클라이언트 풀"""
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS):
+        """
+        Args:
+            max_clients: 보관할 최대 클라이언트 수
+        """
+        self.max_clients = max(1, max_clients)
+        self._clients: "OrderedDict[Tuple[str, str], _PooledClient]" = OrderedDict()
+        # 제거되었지만 아직 요청이 진행 중인 클라이언트
+        self._draining: Set[_PooledClient] = set()
+        self._stats = {'created': 0, 'hits': 0, 'evictions': 0, 'closed': 0}
+
+    @staticmethod
+    def _create_client(provider: str, api_key: str) -> Any:
+        """제공자별 비동기 클라이언트 생성 (재시도는 services.rate_limit이 담당하므로 SDK 재시도는 끔)"""
+        if provider == 'openai':
+            return openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+        if provider == 'anthropic':
+            return anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    def _acquire(self, provider: str, api_key: str) -> _PooledClient:
+        """풀에서 클라이언트를 꺼내거나 새로 만들어 등록"""
+        key = (provider, hash_api_key(api_key))
+        entry = self._clients.get(key)
+        if entry is not None:
+            self._clients.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+        entry = _PooledClient(self._create_client(provider, api_key))
+        self._clients[key] = entry
+        self._stats['created'] += 1
+        logger.info(f"🔌 New {provider} client for key {key[1]} (pool size: {len(self._clients)})")
+        return entry
+
+    async def _evict_overflow(self) -> None:
+        """최대 개수를 넘는 가장 오래된 클라이언트 제거"""
+        while len(self._clients) > self.max_clients:
+            (provider, key_hash), entry = self._clients.popitem(last=False)
+            entry.evicted = True
+            self._stats['evictions'] += 1
+            logger.info(f"♻️  Evicted {provider} client for key {key_hash}")
+            if entry.leases == 0:
+                await self._close(entry)
+            else:
+                self._draining.add(entry)
+
+    async def _close(self, entry: _PooledClient) -> None:
+        """클라이언트 연결 종료"""
+        self._draining.discard(entry)
+        try:
+            await entry.client.close()
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to close LLM client: {str(e)}")
+        self._stats['closed'] += 1
+
+    @asynccontextmanager
+    async def lease(self, provider: str, api_key: str) -> AsyncIterator[Any]:
+        """
+        요청 하나 동안 사용할 클라이언트 대여
+
+        스트리밍처럼 응답을 오래 읽는 경우에도 대여 중에는 클라이언트가 닫히지 않습니다.
+
+        Args:
+            provider: AI 제공자 ('openai' 또는 'anthropic')
+            api_key: API 키
+
+        Yields:
+            제공자 비동기 클라이언트
+        """
+        entry = self._acquire(provider, api_key)
+        entry.leases += 1
+        try:
+            await self._evict_overflow()
+            yield entry.client
+        finally:
+            entry.leases -= 1
+            if entry.evicted and entry.leases == 0:
+                await self._close(entry)
+
+    async def warm(self, provider: str, api_key: str) -> bool:
+        """
+        클라이언트를 미리 만들고 가벼운 요청으로 연결(TLS 포함)을 열어 둠
+
+        Args:
+            provider: AI 제공자
+            api_key: API 키
+
+        Returns:
+            연결 예열 요청이 성공했는지 여부 (클라이언트는 실패해도 풀에 남음)
+        """
+        async with self.lease(provider, api_key) as client:
+            models = getattr(client, 'models', None)
+            if models is None:
+                # 모델 목록 API가 없는 구버전 SDK는 클라이언트 생성까지만 수행
+                return False
+            try:
+                await models.list()
+                logger.info(f"🔥 Pre-warmed {provider} client")
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to pre-warm {provider} client: {str(e)}")
+                return False
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 크기와 생성/재사용/제거 통계"""
+        by_provider: Dict[str, int] = {}
+        for provider, _ in self._clients:
+            by_provider[provider] = by_provider.get(provider, 0) + 1
+
+        stats: Dict[str, Any] = dict(self._stats)
+        stats.update({
+            'size': len(self._clients),
+            'max_size': self.max_clients,
+            'by_provider': by_provider,
+            'in_use': sum(entry.leases for entry in self._clients.values()),
+            'draining': len(self._draining)
+        })
+        return stats
+
+    async def close_all(self) -> None:
+        """풀의 모든 클라이언트 종료 (애플리케이션 종료 시 호출)"""
+        entries = list(self._clients.values()) + list(self._draining)
+        self._clients.clear()
+        for entry in entries:
+            await self._close(entry)
+
+
+# 프로세스 전역 클라이언트 풀
+_client_pool: Optional[ClientPool] = None
+
+
+def get_client_pool() -> ClientPool:
+    """
+    전역 클라이언트 풀 반환 (환경 변수로 설정)
+
+    - LLM_CLIENT_POOL_SIZE: 보관할 최대 클라이언트 수 (기본값: 64)
+    """
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = ClientPool(
+            max_clients=int(os.getenv('LLM_CLIENT_POOL_SIZE', DEFAULT_MAX_CLIENTS))
+        )
+    return _client_pool
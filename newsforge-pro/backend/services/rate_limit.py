@@ -0,0 +1,305 @@
+"""
+요청 한도 기반 적응형 동시 실행 제어
+
+제공자·API 키별 AIMD 제어기로 동시 요청 수를 조절합니다. 한도 오류(429, Anthropic
+과부하 529)가 나면 동시 요청 수를 절반으로 줄이고, 응답 헤더(x-ratelimit-*,
+anthropic-ratelimit-*)에 여유가 있는 동안 성공할 때마다 조금씩 늘립니다.
+retry-after가 오면 그 키의 모든 요청을 해당 시간만큼 멈추고, 지터를 더한 대기 후 다시 시도합니다.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# 동시 요청 수를 줄이는 상태 코드 (요청 한도 초과, Anthropic 과부하)
+RATE_LIMIT_STATUS = frozenset([429, 529])
+# 동시 요청 수는 유지하고 대기 후 다시 시도하는 상태 코드
+TRANSIENT_STATUS = frozenset([408, 409, 500, 502, 503, 504])
+# 상태 코드 없이 다시 시도할 SDK 예외 (연결 실패, 시간 초과)
+TRANSIENT_ERRORS = frozenset(['APIConnectionError', 'APITimeoutError'])
+
+# 응답 헤더의 (한도, 남은 양) 쌍
+RATE_LIMIT_HEADER_PAIRS = [
+    ('x-ratelimit-limit-requests', 'x-ratelimit-remaining-requests'),
+    ('x-ratelimit-limit-tokens', 'x-ratelimit-remaining-tokens'),
+    ('anthropic-ratelimit-requests-limit', 'anthropic-ratelimit-requests-remaining'),
+    ('anthropic-ratelimit-tokens-limit', 'anthropic-ratelimit-tokens-remaining'),
+    ('anthropic-ratelimit-input-tokens-limit', 'anthropic-ratelimit-input-tokens-remaining'),
+    ('anthropic-ratelimit-output-tokens-limit', 'anthropic-ratelimit-output-tokens-remaining'),
+]
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """SDK 예외의 HTTP 상태 코드 (없으면 None)"""
+    status = getattr(error, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def _error_headers(error: BaseException) -> Mapping[str, str]:
+    response = getattr(error, 'response', None)
+    return getattr(response, 'headers', None) or {}
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """retry-after-ms / retry-after(초 또는 HTTP 날짜) 헤더의 대기 시간 (초)"""
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def headroom(headers: Mapping[str, str]) -> Optional[float]:
+    """응답 헤더 기준 남은 요청/토큰 한도 비율 (가장 여유가 적은 항목, 헤더가 없으면 None)"""
+    ratios = []
+    for limit_header, remaining_header in RATE_LIMIT_HEADER_PAIRS:
+        limit = headers.get(limit_header)
+        remaining = headers.get(remaining_header)
+        if not limit or remaining is None:
+            continue
+        try:
+            limit_value = float(limit)
+            if limit_value > 0:
+                ratios.append(float(remaining) / limit_value)
+        except ValueError:
+            continue
+    return min(ratios) if ratios else None
+
+
+# 보관할 최대 제어기 수 기본값
+DEFAULT_MAX_LIMITERS = 256
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD 방식 적응형 동시 요청 제한 (제공자·API 키별로 공유)"""
+
+    def __init__(self, name: str, initial_limit: float = 4, min_limit: int = 1, max_limit: int = 32,
+                 decrease_factor: float = 0.5, low_headroom: float = 0.1,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Args:
+            name: 로그와 통계에 쓰는 이름
+            initial_limit: 초기 동시 요청 수
+            min_limit: 최소 동시 요청 수
+            max_limit: 최대 동시 요청 수
+            decrease_factor: 한도 오류 시 동시 요청 수에 곱할 비율
+            low_headroom: 이 비율보다 남은 한도가 적으면 동시 요청 수를 늘리지 않음
+            max_retries: 한도/일시 오류 시 최대 재시도 횟수
+            base_delay: retry-after가 없을 때 지수 백오프 기본 대기 시간 (초)
+            max_delay: 최대 대기 시간 (초)
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.low_headroom = low_headroom
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._cond: Optional[asyncio.Condition] = None
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._headroom: Optional[float] = None
+        self._stats = {'requests': 0, 'rate_limited': 0, 'retries': 0, 'decreases': 0}
+
+    @property
+    def limit(self) -> int:
+        """현재 동시 요청 한도"""
+        return int(self._limit)
+
+    def _condition(self) -> asyncio.Condition:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _acquire(self) -> float:
+        """실행 슬롯을 얻을 때까지 대기하고 시작 시각 반환"""
+        cond = self._condition()
+        async with cond:
+            while True:
+                wait = self._blocked_until - time.monotonic()
+                if wait <= 0 and self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    self._stats['requests'] += 1
+                    return time.monotonic()
+                try:
+                    await asyncio.wait_for(cond.wait(), timeout=wait if wait > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _release(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self._in_flight -= 1
+            cond.notify_all()
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """성공 응답 헤더의 남은 한도 기록 (동시 요청 수 증가 여부 판단에 사용)"""
+        value = headroom(headers)
+        if value is not None:
+            self._headroom = value
+
+    def _on_success(self) -> None:
+        """덧셈 증가: 남은 한도가 충분하면 한 번에 1/한도씩 늘림 (한도만큼 성공하면 +1)"""
+        if self._headroom is not None and self._headroom < self.low_headroom:
+            return
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _on_rate_limited(self, started_at: float, retry_after: Optional[float]) -> None:
+        """곱셈 감소: 마지막 감소 이후 시작한 요청의 한도 오류에만 동시 요청 수를 줄임"""
+        self._stats['rate_limited'] += 1
+        now = time.monotonic()
+        if started_at >= self._last_decrease:
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self._last_decrease = now
+            self._stats['decreases'] += 1
+            logger.warning(f"⚠️  {self.name} rate limited, concurrency limit -> {self.limit}")
+        if retry_after:
+            # 같은 키의 다른 요청도 retry-after 동안 새로 보내지 않음
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        요청 하나 동안 실행 슬롯 점유 (재시도 없음, 스트리밍 응답에 사용)
+
+        블록 안에서 한도 오류가 나면 동시 요청 수를 줄이고, 정상 종료하면 늘립니다.
+        """
+        started_at = await self._acquire()
+        try:
+            yield
+        except BaseException as e:
+            if error_status(e) in RATE_LIMIT_STATUS:
+                self._on_rate_limited(started_at, retry_after_seconds(_error_headers(e)))
+            raise
+        else:
+            self._on_success()
+        finally:
+            await self._release()
+
+    def retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        다시 시도하기 전 대기 시간 (다시 시도하지 않을 오류면 None)
+
+        retry-after가 있으면 그보다 일찍 보내지 않도록 0~20% 지터를 더하고,
+        없으면 지수 백오프 범위에서 무작위로 고릅니다 (full jitter).
+        """
+        status = error_status(error)
+        retryable = (status in RATE_LIMIT_STATUS or status in TRANSIENT_STATUS or
+                     (status is None and type(error).__name__ in TRANSIENT_ERRORS))
+        if not retryable or attempt >= self.max_retries:
+            return None
+
+        retry_after = retry_after_seconds(_error_headers(error))
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) * random.uniform(1.0, 1.2)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        슬롯을 점유해 호출하고, 한도/일시 오류면 대기 후 다시 시도 (대기 중에는 슬롯 반환)
+
+        Args:
+            call: 코루틴을 만드는 인자 없는 함수
+
+        Returns:
+            호출 결과
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.slot():
+                    return await call()
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                self._stats['retries'] += 1
+                logger.info(f"⏳ {self.name} retry {attempt}/{self.max_retries} in {delay:.1f}s "
+                            f"(concurrency limit {self.limit})")
+                await asyncio.sleep(delay)
+
+    def idle(self) -> bool:
+        """진행 중인 요청과 retry-after 대기가 없는지 여부 (레지스트리에서 제거해도 되는지)"""
+        return self._in_flight == 0 and self._blocked_until <= time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 동시 요청 한도와 한도 오류/재시도 통계"""
+        stats: Dict[str, Any] = dict(self._stats)
+        stats['limit'] = int(self._limit)
+        stats['in_flight'] = self._in_flight
+        stats['headroom'] = self._headroom
+        return stats
+
+
+# 제공자·API 키 해시별 제어기 (오래 쓰지 않은 순서)
+_limiters: "OrderedDict[Tuple[str, str], AdaptiveConcurrencyLimiter]" = OrderedDict()
+
+
+def get_concurrency_limiter(provider: str, api_key: str) -> AdaptiveConcurrencyLimiter:
+    """
+    제공자·API 키별 동시 요청 제어기 반환 (환경 변수로 설정)
+
+    - LLM_INITIAL_CONCURRENCY: 초기 동시 요청 수 (기본값: 4)
+    - LLM_MAX_CONCURRENCY: 최대 동시 요청 수 (기본값: 32)
+    - LLM_CONCURRENCY_LIMITERS_MAX: 보관할 최대 제어기 수 (기본값: 256, 넘으면 쉬고 있는
+      제어기를 오래 쓰지 않은 것부터 제거)
+    """
+    key = (provider, hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16])
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = AdaptiveConcurrencyLimiter(
+            f"{provider}:{key[1]}",
+            initial_limit=float(os.getenv('LLM_INITIAL_CONCURRENCY', 4)),
+            max_limit=int(os.getenv('LLM_MAX_CONCURRENCY', 32))
+        )
+        _limiters[key] = limiter
+        _evict_idle_limiters()
+    else:
+        _limiters.move_to_end(key)
+    return limiter
+
+
+def _evict_idle_limiters() -> None:
+    """최대 개수를 넘은 만큼 쉬고 있는 제어기를 오래 쓰지 않은 것부터 제거 (사용 중인 제어기는 유지)"""
+    max_limiters = max(1, int(os.getenv('LLM_CONCURRENCY_LIMITERS_MAX', DEFAULT_MAX_LIMITERS)))
+    overflow = len(_limiters) - max_limiters
+    if overflow <= 0:
+        return
+    # 방금 추가한 제어기(맨 뒤)는 곧 사용하므로 제외
+    candidates = list(_limiters.items())[:-1]
+    for key in [key for key, limiter in candidates if limiter.idle()][:overflow]:
+        del _limiters[key]
+
+
+def concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 제어기의 통계 ('제공자:키 해시'별)"""
+    return {limiter.name: limiter.stats() for limiter in _limiters.values()}
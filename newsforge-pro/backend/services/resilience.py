@@ -0,0 +1,276 @@
+"""
+제공자 장애 대응 (서킷 브레이커, 헤지 요청)
+
+제공자별 서킷 브레이커로 최근 오류율과 느린 호출 비율이 기준을 넘은 제공자를 잠시
+건너뛰고 다른 제공자로 전환합니다. 헤지를 켜면 주 제공자가 최근 p95 지연 시간 안에
+응답하지 않을 때 보조 제공자에도 요청을 보내 먼저 성공한 응답을 쓰고 나머지는 취소합니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# 제공자 장애로 보는 전송 계층 오류 (SDK/httpx의 연결 오류와 시간 초과)
+_TRANSPORT_ERRORS = frozenset(['APIConnectionError', 'APITimeoutError', 'TransportError', 'TimeoutException'])
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """
+    제공자 상태 문제로 볼 오류인지 판단
+
+    5xx, 408, 연결 오류, 시간 초과만 제공자 장애로 봅니다. 429는 한 사용자 키의 한도
+    초과이므로 서킷을 열어 모든 사용자의 요청을 막지 않고 동시 요청 제어(rate_limit)에
+    맡기며, 그 밖의 4xx와 빈 응답 같은 상태 코드 없는 오류는 요청/응답 문제로 봅니다.
+    """
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status >= 500 or status == 408
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in _TRANSPORT_ERRORS for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """최근 호출의 오류율과 느린 호출 비율 기반 서킷 브레이커"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 5,
+                 failure_rate: float = 0.5, slow_call_seconds: float = 30.0,
+                 slow_call_rate: float = 0.5, open_seconds: float = 30.0):
+        """
+        Args:
+            name: 제공자 이름
+            window: 판단에 사용할 최근 호출 수
+            min_calls: 판단을 시작할 최소 호출 수
+            failure_rate: 서킷을 여는 오류 비율
+            slow_call_seconds: 느린 호출로 볼 응답 시간 (초)
+            slow_call_rate: 서킷을 여는 느린 호출 비율
+            open_seconds: 서킷을 연 뒤 시험 호출을 허용하기까지의 시간 (초)
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+
+        # (실패 여부, 느린 호출 여부)
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {'opened': 0, 'rejected': 0}
+
+    def allow(self) -> bool:
+        """
+        호출 허용 여부 (허용되면 결과를 record_* 또는 release로 반드시 알려야 함)
+
+        열린 서킷은 open_seconds가 지나면 반열림 상태가 되어 시험 호출 하나만 허용합니다.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self._stats['rejected'] += 1
+        return False
+
+    def record_success(self, elapsed: float) -> None:
+        """성공한 호출 기록 (느린 성공은 느린 호출로 집계)"""
+        self._record(False, elapsed >= self.slow_call_seconds)
+
+    def record_failure(self, elapsed: float) -> None:
+        """제공자 장애로 실패한 호출 기록"""
+        self._record(True, elapsed >= self.slow_call_seconds)
+
+    def release(self) -> None:
+        """판단 없이 끝난 호출 (취소되었거나 호출자 측 오류)"""
+        self._probe_in_flight = False
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            if failed or slow:
+                self._trip()
+            else:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+                logger.info(f"✅ {self.name} circuit closed")
+            return
+
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if self.state == self.CLOSED and calls >= self.min_calls:
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                self._trip()
+
+    def _trip(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._stats['opened'] += 1
+        logger.warning(f"⚠️  {self.name} circuit opened for {self.open_seconds:g}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """상태와 열림/거부 횟수"""
+        stats: Dict[str, Any] = dict(self._stats)
+        stats['state'] = self.state
+        stats['recent_calls'] = len(self._outcomes)
+        return stats
+
+
+class LatencyTracker:
+    """최근 성공 호출의 응답 시간 분포"""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed: float) -> None:
+        self._samples.append(elapsed)
+
+    def percentile(self, q: float = 0.95) -> Optional[float]:
+        """백분위수 응답 시간 (표본이 부족하면 None)"""
+        if len(self._samples) < self.min_samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class ProviderHealth:
+    """제공자별 서킷 브레이커와 지연 시간 기반 장애 전환/헤지 호출"""
+
+    def __init__(self, providers: List[str], hedge: bool = False, default_hedge_delay: float = 15.0,
+                 min_hedge_delay: float = 1.0, **breaker_options):
+        """
+        Args:
+            providers: 제공자 이름 목록
+            hedge: 주 제공자가 p95 지연 시간 안에 응답하지 않으면 보조 제공자에도 요청할지 여부
+            default_hedge_delay: 지연 표본이 부족할 때 사용할 헤지 대기 시간 (초)
+            min_hedge_delay: 헤지 대기 시간 하한 (초)
+            breaker_options: CircuitBreaker 설정
+        """
+        self.hedge = hedge
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.breakers = {name: CircuitBreaker(name, **breaker_options) for name in providers}
+        self.latency = {name: LatencyTracker() for name in providers}
+        self._stats = {'hedged': 0, 'hedge_wins': 0, 'failovers': 0}
+
+    def hedge_delay(self, provider: str) -> float:
+        """헤지 요청을 보내기 전 기다릴 시간 (최근 p95 응답 시간)"""
+        p95 = self.latency[provider].percentile(0.95)
+        return max(self.min_hedge_delay, p95 if p95 is not None else self.default_hedge_delay)
+
+    async def _run(self, provider: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """호출 하나를 실행하고 결과를 서킷 브레이커와 지연 기록에 반영"""
+        breaker = self.breakers[provider]
+        start = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            if is_provider_failure(e):
+                breaker.record_failure(time.monotonic() - start)
+            else:
+                breaker.release()
+            raise
+        elapsed = time.monotonic() - start
+        breaker.record_success(elapsed)
+        self.latency[provider].record(elapsed)
+        return result
+
+    async def call(self, candidates: List[Tuple[str, Callable[[], Awaitable[Any]]]]) -> Tuple[str, Any]:
+        """
+        우선순위 순서로 제공자 호출
+
+        서킷이 열린 제공자는 건너뛰고, 제공자 장애로 실패하면 다음 제공자로 넘어갑니다.
+        헤지가 켜져 있으면 주 제공자가 p95 안에 응답하지 않을 때 다음 제공자를 함께 호출하고
+        먼저 성공한 응답을 사용하며 나머지 요청은 취소합니다.
+
+        Args:
+            candidates: (제공자 이름, 코루틴을 만드는 함수) 목록 (우선순위 순)
+
+        Returns:
+            (응답한 제공자, 호출 결과) 튜플
+
+        Raises:
+            호출자 측 오류는 그대로, 모든 제공자가 실패하면 RuntimeError
+        """
+        queue = list(candidates)
+        errors: List[str] = []
+        pending: Dict[asyncio.Task, str] = {}
+        first_provider = candidates[0][0] if candidates else ''
+
+        def launch_next() -> bool:
+            while queue:
+                provider, call = queue.pop(0)
+                if self.breakers[provider].allow():
+                    pending[asyncio.ensure_future(self._run(provider, call))] = provider
+                    return True
+                errors.append(f"{provider}: circuit open")
+            return False
+
+        try:
+            launch_next()
+            while pending:
+                timeout = None
+                if self.hedge and queue and len(pending) == 1:
+                    timeout = self.hedge_delay(next(iter(pending.values())))
+
+                done, _ = await asyncio.wait(list(pending), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 주 제공자가 p95 안에 응답하지 않아 다음 제공자에도 요청
+                    if launch_next():
+                        self._stats['hedged'] += 1
+                        logger.info(f"⏱️  Hedging {first_provider} request")
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if provider != first_provider:
+                            self._stats['hedge_wins' if pending else 'failovers'] += 1
+                        return provider, task.result()
+                    if not is_provider_failure(error):
+                        raise error
+                    logger.warning(f"⚠️  {provider} failed, trying next provider: {str(error)}")
+                    errors.append(f"{provider}: {error}")
+
+                if not pending:
+                    launch_next()
+        finally:
+            # 진 쪽 요청 취소 (호출자가 취소된 경우 포함)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise RuntimeError(f"All providers failed ({'; '.join(errors) or 'no provider available'})")
+
+    def stats(self) -> Dict[str, Any]:
+        """제공자별 서킷 상태, p95 지연 시간, 헤지/장애 전환 횟수"""
+        return {
+            'providers': {
+                name: dict(breaker.stats(), p95_seconds=self.latency[name].percentile(0.95))
+                for name, breaker in self.breakers.items()
+            },
+            **self._stats
+        }
@@ -0,0 +1,145 @@
+"""
+LLM 응답 마크다운 후처리
+
+제목 이모지 규칙과 주식 심볼 규칙을 미리 컴파일해 두고 응답마다 한 번에 적용합니다.
+루트 변환기(LLMConverter)와 백엔드(ContentGuidelines)가 같은 규칙을 씁니다.
+
+- 제목 줄: 이모지를 코드포인트가 아닌 그래핌(화면에 보이는 글자 하나) 단위로 셈
+  ('⚖️'는 ⚖ + 변형 선택자, '🇺🇸'는 지역 표시 문자 2개, '👨‍💻'은 '💻'이 아닌 조합 이모지 하나)
+- 본문: 거래소/괄호 심볼 표기를 $심볼로 바꾸고 처음 언급된 회사에 $심볼 추가 (TickerLinker 한 번 탐색)
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from .ticker_linker import TickerLinker
+
+# 이모지 카테고리별 분류
+EMOJI_CATEGORIES: Dict[str, List[str]] = {
+    'finance': ['💰', '💵', '📈', '📊'],
+    'technology': ['🚀', '💡', '🔧', '🌟'],
+    'policy': ['⚖️', '📜', '🏛️', '🔨'],
+    'conflict': ['🔥', '⚔️', '🎯', '🎲'],
+    'cooperation': ['🤝', '📝', '🎊', '🌈'],
+    'growth': ['🌱', '🎉', '💪', '⭐'],
+    'news': ['📰', '⚠️', '💱', '🚗', '⛽'],
+    'tech_companies': ['🤖', '💻', '📱', '🏦', '🏢'],
+    'global': ['🌍', '🇺🇸', '🇨🇳', '🇯🇵', '🇰🇷', '🇪🇺']
+}
+
+# 제목에 쓰는 이모지 (카테고리 순서, 중복 없음)
+TITLE_EMOJIS: Tuple[str, ...] = tuple(dict.fromkeys(
+    emoji for emojis in EMOJI_CATEGORIES.values() for emoji in emojis
+))
+DEFAULT_TITLE_EMOJI = '📰'
+
+# 그림 문자 (기호/딩뱃/화살표 블록과 보조 다국어 평면의 이모지 블록)
+_PICTOGRAPH = (
+    '\u00a9\u00ae\u203c\u2049\u2122\u2139\u2194-\u21aa\u231a-\u23ff\u24c2\u25aa-\u27bf'
+    '\u2934\u2935\u2b05-\u2b55\u3030\u303d\u3297\u3299'
+    '\U0001F000-\U0001F1E5\U0001F200-\U0001FAFF'
+)
+# 변형 선택자, 피부색 수식자, 키캡 결합 문자
+_MODIFIERS = '\ufe0e\ufe0f\U0001F3FB-\U0001F3FF\u20e3'
+_VARIATIONS = re.compile('[\ufe0e\ufe0f\U0001F3FB-\U0001F3FF]')
+# 이모지 그래핌: 국기(지역 표시 문자 2개), 또는 그림 문자 + 수식자를 ZWJ(\u200d)로 이은 조합
+_EMOJI_CLUSTER = re.compile(
+    '[\U0001F1E6-\U0001F1FF]{1,2}'
+    f'|[{_PICTOGRAPH}][{_MODIFIERS}]*(?:\u200d[{_PICTOGRAPH}][{_MODIFIERS}]*)*'
+)
+
+
+def _emoji_key(cluster: str) -> str:
+    """변형 선택자와 피부색을 뺀 비교용 이모지 ('⚖'와 '⚖️', '💪🏽'을 같은 이모지로 봄)"""
+    return _VARIATIONS.sub('', cluster)
+
+
+_TITLE_EMOJI_KEYS = {_emoji_key(emoji): emoji for emoji in TITLE_EMOJIS}
+
+
+def title_emojis(title: str) -> List[Tuple[int, int, str]]:
+    """
+    제목에 있는 제목용 이모지
+
+    Args:
+        title: 제목 줄
+
+    Returns:
+        (시작, 끝, TITLE_EMOJIS 표기) 튜플 리스트 (앞에서부터)
+    """
+    found = []
+    for match in _EMOJI_CLUSTER.finditer(title):
+        emoji = _TITLE_EMOJI_KEYS.get(_emoji_key(match.group()))
+        if emoji is not None:
+            found.append((match.start(), match.end(), emoji))
+    return found
+
+
+def has_title_emoji(text: str) -> bool:
+    """
+    첫 줄이 제목용 이모지 하나로 시작하고 다른 제목용 이모지가 없는지 여부
+
+    Args:
+        text: 검사할 마크다운
+
+    Returns:
+        제목 이모지 형식이 맞는지 여부
+    """
+    title = text.partition('\n')[0].strip()
+    found = title_emojis(title)
+    return len(found) == 1 and found[0][0] == 0 and title[found[0][1]:found[0][1] + 1] == ' '
+
+
+def fix_title_emoji(text: str) -> str:
+    """
+    제목 줄에 이모지가 정확히 하나 있도록 수정 (본문은 그대로)
+
+    없으면 DEFAULT_TITLE_EMOJI를 앞에 붙이고, 여러 개면 모두 지운 뒤 처음 나온 이모지만 앞에 붙입니다.
+    이모지가 하나면 위치와 상관없이 그대로 둡니다.
+
+    Args:
+        text: 원본 마크다운
+
+    Returns:
+        제목 이모지가 수정된 마크다운
+    """
+    title, newline, body = text.partition('\n')
+    title = title.strip()
+    found = title_emojis(title)
+
+    if not found:
+        title = f"{DEFAULT_TITLE_EMOJI} {title}"
+    elif len(found) > 1:
+        parts = []
+        last = 0
+        for start, end, _ in found:
+            parts.append(title[last:start])
+            last = end
+            # 공백 뒤(또는 맨 앞)에서 지운 이모지는 뒤따르는 공백도 지워 공백이 두 번 남지 않게 함
+            kept = ''.join(parts)
+            if not kept or kept.endswith(' '):
+                while title[last:last + 1] == ' ':
+                    last += 1
+        parts.append(title[last:])
+        title = f"{found[0][2]} {''.join(parts).strip()}"
+
+    return title + newline + body
+
+
+def format_response(text: str, seen: Optional[Set[str]] = None, title: bool = True,
+                    linker: Optional[TickerLinker] = None) -> str:
+    """
+    LLM 응답 후처리 (제목 이모지 수정 후 주식 심볼 표기를 한 번의 탐색으로 정리)
+
+    Args:
+        text: API 응답 마크다운 (또는 스트리밍 중 완성된 줄)
+        seen: 이미 심볼을 붙인 회사 (여러 줄을 나눠 처리할 때 공유)
+        title: 첫 줄을 제목으로 보고 이모지를 수정할지 여부
+        linker: 심볼 연결기 (없으면 함께 배포되는 표 사용)
+
+    Returns:
+        후처리된 마크다운
+    """
+    if title:
+        text = fix_title_emoji(text)
+    return (linker or TickerLinker.default()).link(text, seen, normalize_tags=True)
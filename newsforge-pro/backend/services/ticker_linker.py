@@ -0,0 +1,164 @@
+"""
+상장사 이름 → 주식 심볼 연결
+
+tickers.tsv의 회사 이름과 별칭을 KeywordMatcher 사전 하나로 컴파일해 텍스트를 한 번 훑고,
+같은 위치에서는 가장 긴 이름('Samsung SDI' > 'Samsung')을 골라 기사에서 처음 언급된
+회사에만 $심볼을 붙입니다. 이미 '$TSLA'나 '(NASDAQ: TSLA)'처럼 심볼이 붙은 회사는
+다시 붙이지 않으며, 이런 심볼 표기도 회사 이름과 같은 탐색에서 함께 찾습니다.
+이름 바로 뒤에 조사가 붙어 있으면('삼성전자는') 이름과 조사를 떼지 않도록 '삼성전자($005930)는'처럼
+괄호 안에 붙입니다.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .keyword_matcher import KeywordMatcher
+
+# 함께 배포되는 회사명 표
+DEFAULT_TABLE_PATH = Path(__file__).with_name('tickers.tsv')
+
+# 심볼 (영문 대문자/숫자, BRK.B 같은 클래스 접미사 허용)
+_SYMBOL = r'[A-Z0-9]{1,6}(?:\.[A-Z]{1,2})?'
+_EXCHANGES = r'NASDAQ|Nasdaq|NYSE American|NYSE|AMEX|KRX|KOSPI|KOSDAQ|OTC'
+# 이름 바로 뒤에 이미 붙은 심볼 (' $TSLA', ' (NASDAQ: TSLA)', ' (TSLA)', '($005930)')
+_TAGGED = re.compile(rf'[ \t]*(?:\$({_SYMBOL})|\((?:(?:{_EXCHANGES})\s*:\s*)?\$?({_SYMBOL})\))')
+# 한 번에 훑을 때 회사 이름과 함께 찾는 심볼 표기 (괄호 안의 심볼, $심볼)
+_TAG = rf'(?P<tag>[ \t]*\((?P<exchange>(?:{_EXCHANGES})\s*:\s*)?(?P<tag_symbol>{_SYMBOL})\))'
+_CASHTAG = rf'\$(?P<cashtag>{_SYMBOL})(?![A-Za-z0-9])'
+
+# 조사 등 이름에 이어 쓰는 한글
+_HANGUL_FOLLOWS = re.compile('[가-힣]')
+
+_default: Optional['TickerLinker'] = None
+_default_lock = threading.Lock()
+
+
+def _symbol_tag(symbol: str, text: str, end: int) -> str:
+    """
+    end 위치에 넣을 심볼 표기 (뒤에 한글 조사가 이어지면 띄어 쓰지 않고 괄호 안에 붙임)
+
+    Args:
+        symbol: 주식 심볼
+        text: 원본 텍스트
+        end: 심볼을 넣을 위치
+
+    Returns:
+        ' $심볼' 또는 '($심볼)'
+    """
+    return f"(${symbol})" if _HANGUL_FOLLOWS.match(text, end) else f" ${symbol}"
+
+
+class TickerLinker:
+    """회사명 사전 기반 주식 심볼 연결기 (여러 스레드에서 함께 사용 가능)"""
+
+    def __init__(self, names: Dict[str, str]):
+        """
+        Args:
+            names: 회사 이름/별칭 → 심볼
+        """
+        self.names = names
+        self.symbols: Set[str] = set(names.values())
+        self._matcher = KeywordMatcher(names, ignore_case=False, hangul_boundary=True)
+        # 심볼 표기와 회사 이름을 한 정규식으로 묶어 텍스트를 한 번만 훑음
+        alternatives = [_TAG, _CASHTAG]
+        if self._matcher.pattern:
+            alternatives.append(f"(?P<name>{self._matcher.pattern})")
+        self._scanner = re.compile('|'.join(alternatives))
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_TABLE_PATH) -> 'TickerLinker':
+        """
+        회사명 표 파일 불러오기 (심볼<TAB>시장<TAB>이름|별칭|..., '#'으로 시작하는 줄은 주석)
+
+        Args:
+            path: 표 파일 경로
+
+        Returns:
+            TickerLinker
+        """
+        names: Dict[str, str] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line.strip() or line.startswith('#'):
+                    continue
+                symbol, _, aliases = line.split('\t', 2)
+                for name in aliases.split('|'):
+                    name = ' '.join(name.split())
+                    if name:
+                        # 같은 이름이 여러 번 나오면 앞 행 우선
+                        names.setdefault(name, symbol.strip())
+        return cls(names)
+
+    @classmethod
+    def default(cls) -> 'TickerLinker':
+        """함께 배포되는 표로 만든 공용 연결기 (처음 호출할 때 한 번 불러옴)"""
+        global _default
+        with _default_lock:
+            if _default is None:
+                _default = cls.load()
+            return _default
+
+    def mentions(self, text: str) -> List[str]:
+        """
+        텍스트에 언급된 회사의 심볼
+
+        Args:
+            text: 검사할 텍스트
+
+        Returns:
+            처음 언급된 순서의 심볼 리스트 (중복 없음)
+        """
+        return list(dict.fromkeys(self.names[name] for _, _, name in self._matcher.finditer(text)))
+
+    def link(self, text: str, seen: Optional[Set[str]] = None, normalize_tags: bool = False) -> str:
+        """
+        처음 언급된 회사 이름 뒤에 $심볼 붙이기 (텍스트를 한 번만 훑음)
+
+        Args:
+            text: 원본 텍스트
+            seen: 이미 심볼을 붙였거나 심볼이 나온 회사 (여러 줄/문장을 나눠 처리할 때 공유,
+                이 호출에서 만난 심볼이 추가됨)
+            normalize_tags: '(NASDAQ: TSLA)' 표기와 표에 있는 심볼만 괄호로 쓴 '(TSLA)'를
+                ' $TSLA'(뒤에 조사가 이어지면 '($TSLA)')로 바꿀지 여부 ('(AI)', '(CEO)'처럼 표에 없는 괄호 속 대문자는 그대로 둠)
+
+        Returns:
+            심볼이 붙은 텍스트
+        """
+        if seen is None:
+            seen = set()
+
+        parts = []
+        last = 0
+        for match in self._scanner.finditer(text):
+            kind = match.lastgroup
+            if kind == 'name':
+                symbol = self.names[' '.join(match.group('name').split())]
+                if symbol in seen:
+                    continue
+                seen.add(symbol)
+                end = match.end()
+                tagged = _TAGGED.match(text, end)
+                if tagged and symbol in tagged.groups():
+                    continue
+                parts.append(text[last:end])
+                parts.append(_symbol_tag(symbol, text, end))
+                last = end
+            elif kind == 'cashtag':
+                seen.add(match.group('cashtag'))
+            else:
+                symbol = match.group('tag_symbol')
+                if not match.group('exchange') and symbol not in self.symbols:
+                    continue
+                seen.add(symbol)
+                if normalize_tags:
+                    parts.append(text[last:match.start()])
+                    parts.append(_symbol_tag(symbol, text, match.end()))
+                    last = match.end()
+
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return ''.join(parts)
@@ -0,0 +1,216 @@
+"""
+분당 토큰/요청 수 예산 (사전 토큰 버킷)
+
+요청을 보내기 전에 로컬에서 계산한 입력 토큰 수와 max_tokens를 API 키·모델별 버킷에서
+차감하고, 예산이 부족하면 채워질 때까지 순서대로 기다립니다. 응답을 받으면 실제 사용량과의
+차이를 돌려받고(응답을 받지 못한 요청은 전부 돌려받음), 응답 헤더에 나온 실제 한도와 남은 양으로
+버킷을 맞춥니다.
+한도의 95%까지만 쓰므로 긴 기사가 몰려도 TPM/RPM 한도 바로 아래에서 처리됩니다.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUDGETS = 256
+
+# 응답 헤더의 (분당 한도, 남은 양) 이름
+TOKEN_HEADERS = [
+    ('x-ratelimit-limit-tokens', 'x-ratelimit-remaining-tokens'),
+    ('anthropic-ratelimit-tokens-limit', 'anthropic-ratelimit-tokens-remaining'),
+]
+REQUEST_HEADERS = [
+    ('x-ratelimit-limit-requests', 'x-ratelimit-remaining-requests'),
+    ('anthropic-ratelimit-requests-limit', 'anthropic-ratelimit-requests-remaining'),
+]
+
+
+def _header_pair(headers: Mapping[str, str], names) -> Tuple[Optional[float], Optional[float]]:
+    """(한도, 남은 양) 헤더 값 (없거나 숫자가 아니면 None)"""
+    for limit_name, remaining_name in names:
+        limit = headers.get(limit_name)
+        if not limit:
+            continue
+        try:
+            remaining = headers.get(remaining_name)
+            return float(limit), (float(remaining) if remaining is not None else None)
+        except ValueError:
+            continue
+    return None, None
+
+
+class _Bucket:
+    """분당 용량만큼 연속으로 채워지는 버킷"""
+
+    __slots__ = ('capacity', 'level', 'updated')
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 채워질 때까지 남은 시간 (초)"""
+        return max(0.0, (amount - self.level) * 60.0 / self.capacity)
+
+    def resize(self, capacity: float) -> None:
+        # 한도가 바뀌면 남은 비율을 유지
+        self.level = self.level * capacity / self.capacity
+        self.capacity = capacity
+
+
+class TokenBudget:
+    """API 키·모델별 분당 토큰/요청 수 토큰 버킷"""
+
+    def __init__(self, name: str, tokens_per_minute: float, requests_per_minute: float,
+                 safety_margin: float = 0.95):
+        """
+        Args:
+            name: 로그와 통계에 쓰는 이름
+            tokens_per_minute: 분당 토큰 한도 (응답 헤더에 한도가 오면 그 값으로 교체)
+            requests_per_minute: 분당 요청 수 한도 (응답 헤더에 한도가 오면 그 값으로 교체)
+            safety_margin: 한도 중 실제로 사용할 비율
+        """
+        self.name = name
+        self.safety_margin = safety_margin
+        self._tokens = _Bucket(tokens_per_minute * safety_margin)
+        self._requests = _Bucket(requests_per_minute * safety_margin)
+        self._lock: Optional[asyncio.Lock] = None
+        self._stats = {'reservations': 0, 'queued': 0, 'wait_seconds': 0.0,
+                       'reserved_tokens': 0, 'used_tokens': 0, 'refunded_tokens': 0}
+
+    async def acquire(self, tokens: int) -> int:
+        """
+        요청 하나와 토큰을 예산에서 차감 (부족하면 먼저 기다리던 요청부터 순서대로 대기)
+
+        Args:
+            tokens: 입력 토큰 수 + max_tokens
+
+        Returns:
+            차감한 토큰 수 (settle에 전달)
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        cost = float(tokens)
+        started = time.monotonic()
+        queued = False
+        async with self._lock:
+            while True:
+                # 분당 한도보다 큰 요청은 버킷이 가득 찰 때 보냄
+                cost = min(cost, self._tokens.capacity)
+                now = time.monotonic()
+                self._tokens.refill(now)
+                self._requests.refill(now)
+                wait = max(self._tokens.wait_time(cost), self._requests.wait_time(1))
+                if wait <= 0:
+                    break
+                queued = True
+                await asyncio.sleep(wait)
+
+            self._tokens.level -= cost
+            self._requests.level -= 1
+
+        waited = time.monotonic() - started
+        self._stats['reservations'] += 1
+        self._stats['reserved_tokens'] += int(cost)
+        if queued:
+            self._stats['queued'] += 1
+            self._stats['wait_seconds'] += waited
+            logger.info(f"⏳ {self.name} waited {waited:.1f}s for token budget ({int(cost)} tokens)")
+        return int(cost)
+
+    def settle(self, reserved: int, used: Optional[int]) -> None:
+        """
+        실제 사용량으로 정산 (남은 토큰은 돌려주고, 초과분은 추가로 차감)
+
+        요청이 실패하거나 스트림이 중간에 끊겨도 호출한 쪽에서 반드시 정산해야 예약이 새지 않습니다.
+
+        Args:
+            reserved: acquire가 반환한 토큰 수
+            used: 응답 usage의 입력+출력 토큰 수 (0이면 예약을 모두 돌려줌,
+                  모르면 None - 예약한 만큼 사용한 것으로 봄)
+        """
+        if used is None:
+            return
+        if used:
+            self._stats['used_tokens'] += used
+        else:
+            self._stats['refunded_tokens'] += reserved
+        self._tokens.refill(time.monotonic())
+        self._tokens.level = min(self._tokens.capacity, self._tokens.level + reserved - used)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """응답 헤더의 실제 분당 한도와 남은 양으로 버킷 보정"""
+        now = time.monotonic()
+        for bucket, names in ((self._tokens, TOKEN_HEADERS), (self._requests, REQUEST_HEADERS)):
+            limit, remaining = _header_pair(headers, names)
+            if not limit:
+                continue
+            capacity = limit * self.safety_margin
+            bucket.refill(now)
+            if capacity != bucket.capacity:
+                bucket.resize(capacity)
+            if remaining is not None:
+                # 제공자 기준 남은 양에서 안전 여유분을 뺀 값보다 많이 쓰지 않음
+                bucket.level = min(bucket.level, remaining - (limit - capacity))
+
+    def stats(self) -> Dict[str, Any]:
+        """분당 한도, 현재 남은 예산, 대기 통계"""
+        stats: Dict[str, Any] = dict(self._stats)
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        stats['tokens_per_minute'] = int(self._tokens.capacity)
+        stats['requests_per_minute'] = int(self._requests.capacity)
+        stats['available_tokens'] = int(self._tokens.level)
+        return stats
+
+
+# 제공자·API 키 해시·모델별 예산 (가장 오래 쓰지 않은 예산부터 제거)
+_budgets: "OrderedDict[Tuple[str, str, str], TokenBudget]" = OrderedDict()
+
+
+def get_token_budget(provider: str, api_key: str, model: str) -> TokenBudget:
+    """
+    제공자·API 키·모델별 토큰 예산 반환 (환경 변수로 초기 한도 설정)
+
+    사용자 키가 계속 바뀌어도 메모리가 늘지 않도록 최대 개수를 넘으면 가장 오래 쓰지 않은
+    예산을 제거합니다. 제거된 예산을 쓰던 요청은 그 객체로 계속 정산하고, 같은 키로 다시
+    요청하면 새 예산을 만듭니다.
+
+    - LLM_TOKENS_PER_MINUTE: 응답 헤더로 한도를 알기 전 분당 토큰 한도 (기본값: 30000)
+    - LLM_REQUESTS_PER_MINUTE: 응답 헤더로 한도를 알기 전 분당 요청 수 한도 (기본값: 500)
+    - LLM_TOKEN_BUDGETS_MAX: 보관할 최대 예산 수 (기본값: 256)
+    """
+    key_hash = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    key = (provider, key_hash, model)
+    budget = _budgets.get(key)
+    if budget is not None:
+        _budgets.move_to_end(key)
+        return budget
+
+    budget = TokenBudget(
+        f"{provider}:{key_hash}:{model}",
+        tokens_per_minute=float(os.getenv('LLM_TOKENS_PER_MINUTE', 30000)),
+        requests_per_minute=float(os.getenv('LLM_REQUESTS_PER_MINUTE', 500))
+    )
+    _budgets[key] = budget
+    max_budgets = max(1, int(os.getenv('LLM_TOKEN_BUDGETS_MAX', DEFAULT_MAX_BUDGETS)))
+    while len(_budgets) > max_budgets:
+        _budgets.popitem(last=False)
+    return budget
+
+
+def token_budget_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 예산의 통계 ('제공자:키 해시:모델'별)"""
+    return {budget.name: budget.stats() for budget in _budgets.values()}
@@ -0,0 +1,156 @@
+"""
+로컬 토큰 수 계산과 입력 길이 제한
+
+OpenAI 모델은 tiktoken이 설치되어 있으면 실제 토크나이저로 계산하고, 그 밖의 경우
+(Anthropic 모델, tiktoken 미설치)는 문자 종류별 규칙으로 계산합니다. 규칙 기반 값은
+한글/한자 한 글자를 한 토큰으로 보는 등 실제보다 약간 많게 잡아 요청 한도 계산에 안전합니다.
+긴 기사는 뒤쪽 문단부터 잘라 입력 토큰 한도에 맞춥니다.
+"""
+
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    # tiktoken이 없으면 규칙 기반 계산만 사용
+    tiktoken = None
+
+
+logger = logging.getLogger(__name__)
+
+# 메시지 하나당 역할/구분자 토큰, 응답 시작 토큰 (OpenAI 채팅 형식 기준)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# 규칙 기반 계산용 패턴: 한글/한자/가나는 글자 단위, 영문은 단어 단위, 숫자, 기타 기호
+_TOKEN_PATTERN = re.compile(
+    r'(?P<cjk>[ᄀ-ᇿ぀-ヿ㄰-㆏㐀-䶿一-鿿가-힯])'
+    r'|(?P<word>[A-Za-z]+)'
+    r'|(?P<digits>[0-9]+)'
+    r'|(?P<other>[^\sA-Za-z0-9])'
+)
+
+# 문장 경계 (마침표/물음표/느낌표 뒤 공백)
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。])\s+')
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[Any]:
+    """모델의 tiktoken 인코딩 (OpenAI 모델이 아니거나 tiktoken이 없으면 None)"""
+    if tiktoken is None or model.startswith('claude'):
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # tiktoken이 모르는 모델은 세대별 기본 인코딩
+            return tiktoken.get_encoding(
+                'o200k_base' if model.startswith(('gpt-4o', 'o1', 'o3')) else 'cl100k_base'
+            )
+    except Exception as e:
+        # 인코딩 파일을 내려받지 못한 경우 등 (기본 인코딩을 불러오다 실패한 경우 포함)
+        logger.warning(f"⚠️  tiktoken encoding unavailable for {model}: {str(e)}")
+        return None
+
+
+def _heuristic_tokens(text: str) -> int:
+    """문자 종류별 규칙으로 토큰 수 계산 (영문 약 4글자, 숫자 약 3자리당 1토큰)"""
+    count = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'word':
+            count += math.ceil(len(match.group()) / 4)
+        elif kind == 'digits':
+            count += math.ceil(len(match.group()) / 3)
+        else:
+            count += 1
+    return count
+
+
+def count_tokens(text: str, model: str = '') -> int:
+    """
+    텍스트의 토큰 수
+
+    Args:
+        text: 계산할 텍스트
+        model: 모델 이름 (OpenAI 모델이면 tiktoken 사용)
+
+    Returns:
+        토큰 수
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _heuristic_tokens(text)
+
+
+def count_prompt_tokens(system_prompt: str, prompt: str, model: str = '') -> int:
+    """시스템 프롬프트와 사용자 메시지로 구성된 요청의 입력 토큰 수 (메시지 구분 토큰 포함)"""
+    messages = [text for text in (system_prompt, prompt) if text]
+    return (sum(count_tokens(text, model) for text in messages)
+            + TOKENS_PER_MESSAGE * len(messages) + TOKENS_PER_REPLY)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = '') -> Tuple[str, int]:
+    """
+    토큰 한도에 맞게 본문 자르기 (뒤쪽 문단부터 제거)
+
+    뉴스 기사는 핵심 내용이 앞에 오므로 앞 문단부터 통째로 담고, 한도에 걸린 문단은
+    문장 단위로 들어가는 만큼만 남깁니다. 첫 문장도 들어가지 않으면 글자 단위로 자릅니다.
+
+    Args:
+        text: 기사 본문
+        max_tokens: 최대 토큰 수
+        model: 모델 이름
+
+    Returns:
+        (잘린 본문, 원래 토큰 수) 튜플 - 한도 안이면 본문을 그대로 반환
+    """
+    total = count_tokens(text, model)
+    if total <= max_tokens:
+        return text, total
+
+    kept = []
+    used = 0
+    for line in text.split('\n'):
+        # 줄바꿈 한 토큰 포함
+        cost = count_tokens(line, model) + 1
+        if used + cost <= max_tokens:
+            kept.append(line)
+            used += cost
+            continue
+
+        # 한도에 걸린 문단은 들어가는 문장까지만
+        sentences = []
+        for sentence in _SENTENCE_BOUNDARY.split(line):
+            cost = count_tokens(sentence, model) + 1
+            if used + cost > max_tokens:
+                break
+            sentences.append(sentence)
+            used += cost
+        if sentences:
+            kept.append(' '.join(sentences))
+        elif not any(part.strip() for part in kept):
+            # 첫 문장이 한도보다 길면 글자 단위로 자름
+            kept = [_truncate_chars(line, max_tokens, model)]
+        break
+
+    return '\n'.join(kept).rstrip(), total
+
+
+def _truncate_chars(text: str, max_tokens: int, model: str) -> str:
+    """토큰 한도 안에 드는 가장 긴 앞부분 (이진 탐색)"""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
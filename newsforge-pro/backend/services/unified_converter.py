@@ -5,7 +5,8 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import uuid
 
@@ -15,21 +16,57 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.api_keys import get_openai_key, get_anthropic_key, validate_api_key
-from config.content_guidelines import get_content_prompt, fix_content_format, get_prompt_template
-
-# AI 클라이언트
-import openai
-import anthropic
+from config.content_guidelines import get_content_prompt_parts, fix_content_format, IncrementalContentFormatter
+from services.response_cache import get_response_cache, make_cache_key
+from services.client_pool import get_client_pool
+from services.resilience import ProviderHealth, is_provider_failure
+from services.rate_limit import get_concurrency_limiter, concurrency_stats
+from services.token_budget import get_token_budget, token_budget_stats
+from services.tokenizer import count_prompt_tokens, count_tokens, truncate_to_tokens
 
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트 템플릿 버전 (프롬프트를 바꾸면 올려서 이전 응답 캐시를 무효화)
+PROMPT_VERSION = '2'
+
+# 제공자별 모델 및 호출 파라미터
+MODELS = {
+    'openai': 'gpt-4o',
+    'anthropic': 'claude-3-sonnet-20240229'
+}
+MAX_TOKENS = 2000
+TEMPERATURE = 0
+# 기사 본문 최대 입력 토큰 수 (넘으면 뒤쪽 문단부터 자름)
+MAX_INPUT_TOKENS = int(os.getenv('LLM_MAX_INPUT_TOKENS', 6000))
+
 
 class UnifiedConverter:
     """통합 뉴스 변환 서비스 - 모든 중복 제거"""
     
     def __init__(self):
         self.supported_providers = ['openai', 'anthropic']
+        self.response_cache = get_response_cache()
+        # API 키별로 재사용하는 비동기 클라이언트 (연결 풀과 TLS 세션 유지)
+        self.client_pool = get_client_pool()
+        # 제공자별 서킷 브레이커와 p95 기반 헤지 (LLM_HEDGING=true일 때만 헤지)
+        self.provider_health = ProviderHealth(
+            self.supported_providers,
+            hedge=os.getenv('LLM_HEDGING', 'false').lower() in ('1', 'true', 'yes'),
+            default_hedge_delay=float(os.getenv('LLM_HEDGE_DELAY', 15))
+        )
+        # 주 제공자 장애 시 다른 제공자로 전환할지 여부 (기본 꺼짐, 사용자 키 요청은 같은 사용자의 키로만 전환)
+        self.failover_enabled = os.getenv('LLM_FAILOVER', 'false').lower() in ('1', 'true', 'yes')
+        # 실제 API 응답 기준 누적 토큰 사용량 (프롬프트 캐시 절감량 측정용)
+        self.usage_totals = {
+            'requests': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'cached_tokens': 0,
+            'cache_creation_tokens': 0,
+            'truncated_articles': 0,
+            'truncated_tokens': 0
+        }
         logger.info("🚀 Unified Converter Service initialized")
     
     async def convert_news(
@@ -38,7 +75,8 @@ class UnifiedConverter:
         title: str, 
         content: str, 
         provider: str = 'openai',
-        user_api_key: Optional[str] = None
+        user_api_key: Optional[str] = None,
+        fallback_api_keys: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
         뉴스를 마크다운으로 변환 (통합 메서드)
@@ -49,6 +87,7 @@ class UnifiedConverter:
             content: 본문 내용
             provider: AI 제공자 ('openai' 또는 'anthropic')
             user_api_key: 사용자 제공 API 키 (선택사항)
+            fallback_api_keys: 장애 전환에 쓸 다른 제공자의 사용자 API 키 (LLM_FAILOVER=true일 때만 사용)
         
         Returns:
             변환된 마크다운 및 메타데이터
@@ -62,15 +101,19 @@ class UnifiedConverter:
             # 1. API 키 검증 및 가져오기
             api_key = await self._get_validated_api_key(provider, user_api_key)
             
-            # 2. 콘텐츠 생성 프롬프트 준비
-            prompt = get_content_prompt(
+            # 2. 콘텐츠 생성 프롬프트 준비 (고정 시스템 프롬프트 + 기사별 메시지, 본문은 입력 한도에 맞춤)
+            content = self._fit_content(content, provider)
+            system_prompt, user_prompt = get_content_prompt_parts(
                 title=title,
                 description="",  # URL에서 추출된 경우 description이 없을 수 있음
                 content=content
             )
             
             # 3. AI API 호출
-            raw_response = await self._call_ai_api(provider, api_key, prompt)
+            candidates = self._provider_candidates(provider, api_key, user_api_key, fallback_api_keys)
+            raw_response, usage, served_by = await self._call_ai_api(
+                provider, candidates, system_prompt, user_prompt
+            )
             
             # 4. 응답 정제 및 포맷팅
             formatted_content = fix_content_format(raw_response)
@@ -83,11 +126,11 @@ class UnifiedConverter:
                 'url': url,
                 'original_title': title,
                 'markdown_content': formatted_content,
-                'provider': provider,
+                'provider': served_by,
                 'processing_time_seconds': processing_time,
                 'timestamp': datetime.now().isoformat(),
                 'success': True,
-                'token_usage': self._estimate_tokens(prompt, raw_response)
+                'token_usage': usage or self._estimate_tokens(system_prompt, user_prompt, raw_response, provider)
             }
             
             logger.info(f"✅ Conversion {conversion_id} completed in {processing_time:.2f}s")
@@ -109,6 +152,95 @@ class UnifiedConverter:
                 'error': str(e)
             }
     
+    async def stream_news(
+        self,
+        url: str,
+        title: str,
+        content: str,
+        provider: str = 'openai',
+        user_api_key: Optional[str] = None,
+        fallback_api_keys: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        뉴스를 마크다운으로 변환하며 제공자 토큰을 도착하는 대로 전달 (스트리밍)
+        
+        이벤트 순서:
+            start - {'id', 'provider'}
+            delta - {'text'}: fix_content_format 규칙을 줄 단위로 적용한 마크다운 조각
+            done  - convert_news와 같은 결과 딕셔너리 (최종 markdown_content, token_usage 포함)
+            error - convert_news 실패 결과와 같은 딕셔너리
+        """
+        start_time = datetime.now()
+        conversion_id = str(uuid.uuid4())
+        
+        yield {'event': 'start', 'id': conversion_id, 'provider': provider}
+        
+        try:
+            logger.info(f"🔄 Starting streaming conversion {conversion_id} with {provider}")
+            
+            api_key = await self._get_validated_api_key(provider, user_api_key)
+            content = self._fit_content(content, provider)
+            system_prompt, user_prompt = get_content_prompt_parts(
+                title=title,
+                description="",
+                content=content
+            )
+            
+            formatter = IncrementalContentFormatter()
+            chunks = []
+            usage: Dict[str, int] = {}
+            stream_info = {'provider': provider}
+            
+            candidates = self._provider_candidates(provider, api_key, user_api_key, fallback_api_keys)
+            async for text in self._stream_ai_api(
+                provider, candidates, system_prompt, user_prompt, usage, stream_info
+            ):
+                chunks.append(text)
+                formatted = formatter.feed(text)
+                if formatted:
+                    yield {'event': 'delta', 'text': formatted}
+            
+            tail = formatter.flush()
+            if tail:
+                yield {'event': 'delta', 'text': tail}
+            
+            raw_response = ''.join(chunks).strip()
+            if not raw_response:
+                raise ValueError(f"{provider} returned empty response")
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            logger.info(f"✅ Streaming conversion {conversion_id} completed in {processing_time:.2f}s")
+            
+            yield {
+                'event': 'done',
+                'id': conversion_id,
+                'url': url,
+                'original_title': title,
+                'markdown_content': fix_content_format(raw_response),
+                'provider': stream_info['provider'],
+                'processing_time_seconds': processing_time,
+                'timestamp': datetime.now().isoformat(),
+                'success': True,
+                'token_usage': usage or self._estimate_tokens(system_prompt, user_prompt, raw_response, provider)
+            }
+            
+        except Exception as e:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            logger.error(f"❌ Streaming conversion {conversion_id} failed: {str(e)}")
+            
+            yield {
+                'event': 'error',
+                'id': conversion_id,
+                'url': url,
+                'original_title': title,
+                'markdown_content': '',
+                'provider': provider,
+                'processing_time_seconds': processing_time,
+                'timestamp': datetime.now().isoformat(),
+                'success': False,
+                'error': str(e)
+            }
+    
     async def _get_validated_api_key(self, provider: str, user_key: Optional[str] = None) -> str:
         """API 키 검증 및 반환"""
         if provider not in self.supported_providers:
@@ -149,75 +281,438 @@ class UnifiedConverter:
             logger.error(f"❌ Unexpected error during API key validation: {str(e)}")
             raise ValueError(f"API 키와 제공업체를 설정해주세요. 예상치 못한 오류: {str(e)}")
     
-    async def _call_ai_api(self, provider: str, api_key: str, prompt: str) -> str:
-        """AI API 통합 호출"""
-        if provider == 'openai':
-            return await self._call_openai(api_key, prompt)
-        elif provider == 'anthropic':
-            return await self._call_anthropic(api_key, prompt)
-        else:
+    def _fallback_candidate(
+        self, provider: str, user_api_key: Optional[str], fallback_api_keys: Optional[Dict[str, str]]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        장애 전환에 쓸 다른 제공자와 API 키 (없으면 None)
+        
+        사용자 키로 요청했으면 같은 사용자가 함께 보낸 다른 제공자 키로만 전환하고,
+        서버 측 키(운영자 과금)로는 넘어가지 않습니다.
+        """
+        if not self.failover_enabled:
+            return None
+        for other in self.supported_providers:
+            if other == provider:
+                continue
+            if user_api_key:
+                key = (fallback_api_keys or {}).get(other)
+                if not key:
+                    continue
+            else:
+                key = None
+            try:
+                return other, (get_openai_key(key) if other == 'openai' else get_anthropic_key(key))
+            except ValueError:
+                continue
+        return None
+    
+    def _provider_candidates(
+        self, provider: str, api_key: str, user_api_key: Optional[str] = None,
+        fallback_api_keys: Optional[Dict[str, str]] = None
+    ) -> List[Tuple[str, str]]:
+        """(제공자, API 키) 호출 순서 - 요청한 제공자 다음에 장애 전환용 제공자"""
+        candidates = [(provider, api_key)]
+        fallback = self._fallback_candidate(provider, user_api_key, fallback_api_keys)
+        if fallback:
+            candidates.append(fallback)
+        return candidates
+    
+    async def _call_ai_api(
+        self, provider: str, candidates: List[Tuple[str, str]], system_prompt: str, user_prompt: str
+    ) -> Tuple[str, Dict[str, int], str]:
+        """
+        AI API 통합 호출 (동일 요청은 응답 캐시에서 반환)
+        
+        요청한 제공자의 서킷이 열렸거나 제공자 장애로 실패하면 다른 제공자로 전환하고,
+        헤지가 켜져 있으면 p95 지연 시간을 넘긴 요청을 다른 제공자에도 보냅니다.
+        
+        Returns:
+            (응답 텍스트, 토큰 사용량, 응답한 제공자) - 응답 캐시에서 반환하면 사용량은 빈 딕셔너리
+        """
+        if provider not in MODELS:
             raise ValueError(f"Unsupported provider: {provider}")
+        
+        cache_key = make_cache_key(
+            provider, MODELS[provider], PROMPT_VERSION,
+            {'max_tokens': MAX_TOKENS, 'temperature': TEMPERATURE}, system_prompt + user_prompt
+        )
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"⚡ {provider} response served from cache")
+            return cached, {}, provider
+        
+        def make_call(name: str, key: str):
+            if name == 'openai':
+                return lambda: self._call_openai(key, user_prompt, system_prompt)
+            return lambda: self._call_anthropic(key, user_prompt, system_prompt)
+        
+        served_by, (response, usage) = await self.provider_health.call([
+            (name, make_call(name, key)) for name, key in candidates
+        ])
+        
+        self._record_usage(usage)
+        self.response_cache.set(cache_key, response)
+        return response, usage, served_by
     
-    async def _call_openai(self, api_key: str, prompt: str) -> str:
-        """OpenAI API 호출"""
+    async def _stream_ai_api(
+        self, provider: str, candidates: List[Tuple[str, str]], system_prompt: str, user_prompt: str,
+        usage: Dict[str, int], stream_info: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        AI API 스트리밍 통합 호출 (응답 캐시 적중 시 캐시된 응답을 한 번에 전달)
+        
+        서킷이 열린 제공자는 건너뛰고, 첫 토큰 전에 제공자 장애로 실패하면 다른 제공자로
+        전환합니다 (스트림은 헤지하지 않음). 응답한 제공자는 stream_info['provider']에 기록하고,
+        스트림이 끝나면 응답 usage 기준 토큰 사용량을 usage 딕셔너리에 채움
+        """
+        if provider not in MODELS:
+            raise ValueError(f"Unsupported provider: {provider}")
+        
+        cache_key = make_cache_key(
+            provider, MODELS[provider], PROMPT_VERSION,
+            {'max_tokens': MAX_TOKENS, 'temperature': TEMPERATURE}, system_prompt + user_prompt
+        )
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"⚡ {provider} response served from cache")
+            yield cached
+            return
+        
+        errors = []
+        for name, key in candidates:
+            breaker = self.provider_health.breakers[name]
+            if not breaker.allow():
+                errors.append(f"{name}: circuit open")
+                continue
+            
+            if name == 'openai':
+                stream = self._stream_openai(key, user_prompt, system_prompt, usage)
+            else:
+                stream = self._stream_anthropic(key, user_prompt, system_prompt, usage)
+            
+            chunks = []
+            start = time.monotonic()
+            try:
+                async for text in stream:
+                    chunks.append(text)
+                    yield text
+            except Exception as e:
+                if is_provider_failure(e):
+                    breaker.record_failure(time.monotonic() - start)
+                else:
+                    breaker.release()
+                # 이미 전달한 토큰이 있으면 다른 제공자로 이어 붙일 수 없음
+                if chunks or not is_provider_failure(e):
+                    raise
+                logger.warning(f"⚠️  {name} stream failed, trying next provider: {str(e)}")
+                errors.append(f"{name}: {e}")
+                continue
+            except BaseException:
+                # 클라이언트 연결 종료 등으로 스트림이 중단되면 제공자 스트림도 바로 닫음
+                breaker.release()
+                await stream.aclose()
+                raise
+            
+            breaker.record_success(time.monotonic() - start)
+            if stream_info is not None:
+                stream_info['provider'] = name
+            
+            # 끝까지 받은 응답만 캐시 (클라이언트 연결이 끊겨 중단되면 여기까지 오지 않음)
+            response = ''.join(chunks).strip()
+            if response:
+                self._record_usage(usage)
+                self.response_cache.set(cache_key, response)
+            return
+        
+        raise RuntimeError(f"All providers failed ({'; '.join(errors)})")
+    
+    async def _stream_openai(
+        self, api_key: str, prompt: str, system_prompt: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """OpenAI 스트리밍 호출 (마지막 청크의 usage로 토큰 사용량 기록)"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        budget = get_token_budget('openai', api_key, MODELS['openai'])
+        estimated_prompt_tokens = count_prompt_tokens(system_prompt, prompt, MODELS['openai'])
+        reserved = await budget.acquire(estimated_prompt_tokens + MAX_TOKENS)
+        # 실패하거나 중간에 끊겨도 정산: 스트림이 열리기 전이면 예약을 모두 돌려주고,
+        # usage 청크 전에 끊기면 입력 토큰만 쓴 것으로 봄 (끊긴 스트림의 출력 토큰 수는 알 수 없음)
+        used = 0
         try:
-            client = openai.AsyncOpenAI(api_key=api_key)
-            
-            response = await client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0
+            limiter = get_concurrency_limiter('openai', api_key)
+            async with self.client_pool.lease('openai', api_key) as client, limiter.slot():
+                stream = await client.chat.completions.create(
+                    model=MODELS['openai'],
+                    messages=messages,
+                    max_tokens=MAX_TOKENS,
+                    temperature=TEMPERATURE,
+                    stream=True,
+                    # include_usage를 켜면 choices가 빈 마지막 청크에 usage가 담김
+                    extra_body={'stream_options': {'include_usage': True}}
+                )
+                used = estimated_prompt_tokens
+                
+                async for chunk in stream:
+                    if chunk.choices:
+                        text = chunk.choices[0].delta.content
+                        if text:
+                            yield text
+                    
+                    chunk_usage = getattr(chunk, 'usage', None)
+                    if chunk_usage:
+                        details = getattr(chunk_usage, 'prompt_tokens_details', None)
+                        if isinstance(details, dict):
+                            cached_tokens = details.get('cached_tokens') or 0
+                        else:
+                            cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+                        prompt_tokens = getattr(chunk_usage, 'prompt_tokens', 0) or 0
+                        completion_tokens = getattr(chunk_usage, 'completion_tokens', 0) or 0
+                        used = prompt_tokens + completion_tokens
+                        usage.update({
+                            'prompt_tokens': prompt_tokens,
+                            'completion_tokens': completion_tokens,
+                            'total_tokens': used,
+                            'cached_tokens': cached_tokens,
+                            'cache_creation_tokens': 0
+                        })
+        finally:
+            budget.settle(reserved, used)
+    
+    async def _stream_anthropic(
+        self, api_key: str, prompt: str, system_prompt: str, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Anthropic 스트리밍 호출 (message_start/message_delta 이벤트로 토큰 사용량 기록)"""
+        kwargs = {}
+        if system_prompt:
+            kwargs['system'] = [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        
+        budget = get_token_budget('anthropic', api_key, MODELS['anthropic'])
+        estimated_prompt_tokens = count_prompt_tokens(system_prompt, prompt, MODELS['anthropic'])
+        reserved = await budget.acquire(estimated_prompt_tokens + MAX_TOKENS)
+        # 실패하거나 중간에 끊겨도 정산: 스트림이 열리기 전이면 예약을 모두 돌려주고,
+        # 끊기면 그때까지 관측한 입력/출력 토큰으로 정산
+        prompt_tokens = cached_tokens = cache_creation_tokens = completion_tokens = 0
+        used = 0
+        try:
+            limiter = get_concurrency_limiter('anthropic', api_key)
+            async with self.client_pool.lease('anthropic', api_key) as client, limiter.slot():
+                stream = await client.messages.create(
+                    model=MODELS['anthropic'],
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=MAX_TOKENS,
+                    temperature=TEMPERATURE,
+                    stream=True,
+                    **kwargs
+                )
+                used = estimated_prompt_tokens
+                
+                async for event in stream:
+                    if event.type == 'content_block_delta':
+                        text = getattr(event.delta, 'text', None)
+                        if text:
+                            yield text
+                    elif event.type == 'message_start':
+                        # input_tokens는 캐시 읽기/쓰기 토큰을 제외한 값이므로 전체 입력으로 합산
+                        start_usage = event.message.usage
+                        cached_tokens = getattr(start_usage, 'cache_read_input_tokens', 0) or 0
+                        cache_creation_tokens = getattr(start_usage, 'cache_creation_input_tokens', 0) or 0
+                        prompt_tokens = (getattr(start_usage, 'input_tokens', 0) or 0) + cached_tokens + cache_creation_tokens
+                        used = prompt_tokens
+                    elif event.type == 'message_delta':
+                        completion_tokens = getattr(event.usage, 'output_tokens', 0) or 0
+                        used = prompt_tokens + completion_tokens
+            
+            usage.update({
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'cached_tokens': cached_tokens,
+                'cache_creation_tokens': cache_creation_tokens
+            })
+        finally:
+            budget.settle(reserved, used)
+    
+    def _record_usage(self, usage: Dict[str, int]) -> None:
+        """API 응답 토큰 사용량 누적"""
+        self.usage_totals['requests'] += 1
+        for key in ('prompt_tokens', 'completion_tokens', 'cached_tokens', 'cache_creation_tokens'):
+            self.usage_totals[key] += usage.get(key, 0)
+    
+    async def _call_openai(
+        self, api_key: str, prompt: str, system_prompt: str = ""
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        OpenAI API 호출
+        
+        1024토큰 이상의 동일한 접두어는 OpenAI가 자동으로 캐시하므로
+        고정 시스템 프롬프트를 첫 메시지로 둠
+        """
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            
+            # 입력 토큰 + max_tokens만큼 분당 예산을 먼저 확보 (부족하면 대기)
+            budget = get_token_budget('openai', api_key, MODELS['openai'])
+            reserved = await budget.acquire(
+                count_prompt_tokens(system_prompt, prompt, MODELS['openai']) + MAX_TOKENS
             )
+            # 요청이 실패하거나 취소되면 응답 usage가 없으므로 예약을 모두 돌려줌
+            used: Optional[int] = 0
+            try:
+                limiter = get_concurrency_limiter('openai', api_key)
+                async with self.client_pool.lease('openai', api_key) as client:
+                    async def request():
+                        raw = await client.chat.completions.with_raw_response.create(
+                            model=MODELS['openai'],
+                            messages=messages,
+                            max_tokens=MAX_TOKENS,
+                            temperature=TEMPERATURE
+                        )
+                        limiter.observe(raw.headers)
+                        budget.observe(raw.headers)
+                        return raw.parse()
+                
+                    response = await limiter.run(request)
+            
+                usage = getattr(response, 'usage', None)
+                details = getattr(usage, 'prompt_tokens_details', None)
+                if isinstance(details, dict):
+                    cached_tokens = details.get('cached_tokens') or 0
+                else:
+                    cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+                prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+                completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+                # usage가 없는 응답은 예약한 만큼 사용한 것으로 봄
+                used = prompt_tokens + completion_tokens if usage is not None else None
+            finally:
+                budget.settle(reserved, used)
             
             content = response.choices[0].message.content
             if not content:
                 raise ValueError("OpenAI returned empty response")
             
-            logger.info("✅ OpenAI API call successful")
-            return content.strip()
+            logger.info(f"✅ OpenAI API call successful (cached prompt tokens: {cached_tokens})")
+            return content.strip(), {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'cached_tokens': cached_tokens,
+                'cache_creation_tokens': 0
+            }
             
         except Exception as e:
             logger.error(f"❌ OpenAI API call failed: {str(e)}")
             raise
     
-    async def _call_anthropic(self, api_key: str, prompt: str) -> str:
-        """Anthropic API 호출"""
+    async def _call_anthropic(
+        self, api_key: str, prompt: str, system_prompt: str = ""
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Anthropic API 호출
+        
+        고정 시스템 프롬프트에 cache_control을 지정해 프롬프트 캐시에 올림
+        """
         try:
-            client = anthropic.AsyncAnthropic(api_key=api_key)
-            
-            response = await client.messages.create(
-                model="claude-3-sonnet-20240229",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0
+            kwargs = {}
+            if system_prompt:
+                kwargs['system'] = [
+                    {
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ]
+            
+            budget = get_token_budget('anthropic', api_key, MODELS['anthropic'])
+            reserved = await budget.acquire(
+                count_prompt_tokens(system_prompt, prompt, MODELS['anthropic']) + MAX_TOKENS
             )
+            # 요청이 실패하거나 취소되면 응답 usage가 없으므로 예약을 모두 돌려줌
+            used: Optional[int] = 0
+            try:
+                limiter = get_concurrency_limiter('anthropic', api_key)
+                async with self.client_pool.lease('anthropic', api_key) as client:
+                    async def request():
+                        raw = await client.messages.with_raw_response.create(
+                            model=MODELS['anthropic'],
+                            messages=[
+                                {"role": "user", "content": prompt}
+                            ],
+                            max_tokens=MAX_TOKENS,
+                            temperature=TEMPERATURE,
+                            **kwargs
+                        )
+                        limiter.observe(raw.headers)
+                        budget.observe(raw.headers)
+                        return raw.parse()
+                
+                    response = await limiter.run(request)
+            
+                # input_tokens는 캐시 읽기/쓰기 토큰을 제외한 값이므로 전체 입력으로 합산
+                usage = getattr(response, 'usage', None)
+                cached_tokens = getattr(usage, 'cache_read_input_tokens', 0) or 0
+                cache_creation_tokens = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+                prompt_tokens = (getattr(usage, 'input_tokens', 0) or 0) + cached_tokens + cache_creation_tokens
+                completion_tokens = getattr(usage, 'output_tokens', 0) or 0
+                # usage가 없는 응답은 예약한 만큼 사용한 것으로 봄
+                used = prompt_tokens + completion_tokens if usage is not None else None
+            finally:
+                budget.settle(reserved, used)
             
             content = response.content[0].text
             if not content:
                 raise ValueError("Anthropic returned empty response")
             
-            logger.info("✅ Anthropic API call successful")
-            return content.strip()
+            logger.info(f"✅ Anthropic API call successful (cached prompt tokens: {cached_tokens})")
+            return content.strip(), {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'cached_tokens': cached_tokens,
+                'cache_creation_tokens': cache_creation_tokens
+            }
             
         except Exception as e:
             logger.error(f"❌ Anthropic API call failed: {str(e)}")
             raise
     
-    def _estimate_tokens(self, prompt: str, response: str) -> Dict[str, int]:
-        """토큰 사용량 추정"""
-        # 간단한 토큰 추정 (실제로는 더 정확한 계산 필요)
-        prompt_tokens = len(prompt.split()) * 1.3  # 한국어 특성 고려
-        response_tokens = len(response.split()) * 1.3
+    def _fit_content(self, content: str, provider: str) -> str:
+        """본문을 입력 토큰 한도에 맞춤 (뒤쪽 문단부터 제거)"""
+        model = MODELS.get(provider, '')
+        fitted, total = truncate_to_tokens(content, MAX_INPUT_TOKENS, model)
+        if fitted is not content:
+            dropped = total - count_tokens(fitted, model)
+            self.usage_totals['truncated_articles'] += 1
+            self.usage_totals['truncated_tokens'] += dropped
+            logger.info(f"✂️  Article truncated to {MAX_INPUT_TOKENS} input tokens ({dropped} tokens dropped)")
+        return fitted
+    
+    def _estimate_tokens(
+        self, system_prompt: str, user_prompt: str, response: str, provider: str
+    ) -> Dict[str, int]:
+        """로컬 토크나이저 기준 토큰 사용량 (응답 캐시 적중 등으로 API usage가 없을 때)"""
+        model = MODELS.get(provider, '')
+        prompt_tokens = count_prompt_tokens(system_prompt, user_prompt, model)
+        completion_tokens = count_tokens(response, model)
         
         return {
-            'prompt_tokens': int(prompt_tokens),
-            'completion_tokens': int(response_tokens),
-            'total_tokens': int(prompt_tokens + response_tokens)
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
         }
     
     async def validate_api_key_async(self, provider: str, api_key: str) -> Dict[str, Any]:
@@ -252,6 +747,20 @@ class UnifiedConverter:
                 'error': str(e)
             }
     
+    async def warm_up(self) -> None:
+        """서버 측 API 키로 클라이언트를 미리 만들고 연결을 열어 둠 (애플리케이션 시작 시 호출)"""
+        key_getters = {'openai': get_openai_key, 'anthropic': get_anthropic_key}
+        for provider in self.supported_providers:
+            try:
+                api_key = key_getters[provider]()
+            except ValueError:
+                continue
+            await self.client_pool.warm(provider, api_key)
+    
+    async def aclose(self) -> None:
+        """풀에 보관된 클라이언트 연결 종료 (애플리케이션 종료 시 호출)"""
+        await self.client_pool.close_all()
+    
     def get_supported_providers(self) -> list:
         """지원되는 AI 제공자 목록 반환"""
         return self.supported_providers.copy()
@@ -267,8 +776,22 @@ class UnifiedConverter:
                 'Unified content guidelines',
                 'Automatic format validation',
                 'Error handling and fallback',
-                'Token usage tracking'
+                'Token usage tracking',
+                'LLM response caching',
+                'Provider prompt caching',
+                'Streaming conversion (SSE)',
+                'Pooled API clients per key',
+                'Provider circuit breakers and hedged requests',
+                'Rate-limit-aware adaptive concurrency',
+                'Pre-flight token budgets per key and model',
+                'Tokenizer-based input truncation'
             ],
+            'cache': self.response_cache.stats(),
+            'client_pool': self.client_pool.stats(),
+            'provider_health': self.provider_health.stats(),
+            'rate_limits': concurrency_stats(),
+            'token_budgets': token_budget_stats(),
+            'token_usage': dict(self.usage_totals),
             'status': 'active'
         }
 
@@ -291,11 +814,12 @@ async def convert_news_unified(
     title: str, 
     content: str,
     provider: str = 'openai',
-    user_api_key: Optional[str] = None
+    user_api_key: Optional[str] = None,
+    fallback_api_keys: Optional[Dict[str, str]] = None
 ) -> Dict[str, Any]:
     """통합 뉴스 변환 (편의 함수)"""
     converter = get_unified_converter()
-    return await converter.convert_news(url, title, content, provider, user_api_key)
+    return await converter.convert_news(url, title, content, provider, user_api_key, fallback_api_keys)
 
 
 async def validate_user_api_key(provider: str, api_key: str) -> Dict[str, Any]:
@@ -40,6 +40,6 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "": ["*.txt", "*.md", "*.json"],
+        "": ["*.txt", "*.md", "*.json", "*.tsv"],
     },
 ) 
\ No newline at end of file
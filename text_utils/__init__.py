@@ -0,0 +1,32 @@
+"""
+텍스트 처리 유틸리티 패키지
+
+뉴스 추출기와 변환기가 공통으로 사용하는 텍스트 처리 도구들을 포함합니다.
+
+- simhash: SimHash 기반 유사 중복 문단 제거
+- minhash: 기사 간 유사도 비교용 MinHash 서명 및 LSH 키
+- keyword_matcher: 단어 경계를 지키는 사전 키워드 다중 매칭
+- ticker_linker: 상장사 이름 → 주식 심볼 연결
+- response_formatter: LLM 응답 제목 이모지와 주식 심볼 후처리
+"""
+
+from .simhash import simhash, simhash_many, hamming_distance, dedupe_near_duplicates
+from .minhash import minhash_signature, estimate_jaccard, lsh_band_keys
+from .keyword_matcher import KeywordMatcher
+from .ticker_linker import TickerLinker
+from .response_formatter import format_response, fix_title_emoji, has_title_emoji
+
+__all__ = [
+    'simhash',
+    'simhash_many',
+    'hamming_distance',
+    'dedupe_near_duplicates',
+    'minhash_signature',
+    'estimate_jaccard',
+    'lsh_band_keys',
+    'KeywordMatcher',
+    'TickerLinker',
+    'format_response',
+    'fix_title_emoji',
+    'has_title_emoji'
+]
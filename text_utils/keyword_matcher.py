@@ -0,0 +1,178 @@
+"""
+사전 키워드 다중 매칭
+
+여러 키워드를 문자 트라이로 묶어 하나의 정규식으로 컴파일하고, 텍스트를 한 번 훑어
+사전에 있는 키워드 등장을 모두 찾습니다. 키워드마다 text.count나 in 검사를 반복하면
+키워드 수만큼 텍스트를 다시 읽지만, 트라이 정규식은 위치마다 공통 접두사를 한 번만
+비교하므로 사전이 커져도 탐색은 한 번입니다.
+
+- 영문/숫자 단어 경계: 'ai'는 'said', 'oil'은 'turmoil', 'Meta'는 'Metaverse' 안에서 찾지 않음
+  (한글은 조사가 붙으므로 기본적으로 영문/숫자가 이어질 때만 경계가 아닌 것으로 봄)
+- 한글 단어 경계 옵션: 고유명사 사전용으로 앞뒤에 한글이 붙으면 제외하되 뒤따르는 조사는 허용
+  ('메타'는 '메타버스', '하이브'는 '하이브리드'에서 찾지 않고 '메타는', '하이브가'에서는 찾음)
+- 여러 단어 키워드('artificial intelligence')는 단어 사이 공백 종류와 개수에 상관없이 매칭
+- 같은 위치에서는 가장 긴 키워드, 겹치는 등장은 앞쪽 우선 (사전 태깅 방식)
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 단어 경계 판정에 쓰는 문자 (영문/숫자)
+_WORD_CHARS = 'A-Za-z0-9'
+_HANGUL = '가-힣'
+# 한글 단어 경계 옵션에서 키워드 뒤에 붙어도 되는 조사 (긴 것부터)
+_PARTICLES = (
+    '이라는', '으로서', '으로', '에서', '에게', '부터', '까지', '보다', '처럼', '이며', '이다',
+    '였다', '라고', '라는', '로서', '와의', '과의', '은', '는', '이', '가', '을', '를', '의',
+    '에', '와', '과', '도', '로', '만', '측'
+)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(keyword: str, ignore_case: bool) -> str:
+    keyword = _WHITESPACE.sub(' ', keyword.strip())
+    return keyword.lower() if ignore_case else keyword
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    키워드 목록을 공통 접두사로 묶은 정규식 (긴 키워드를 먼저 시도)
+
+    Args:
+        keywords: 정규화된 키워드
+
+    Returns:
+        정규식 문자열 (키워드가 없으면 빈 문자열)
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            (r'\s+' if char == ' ' else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # 여기서 끝나는 키워드가 있으면 더 긴 키워드를 먼저 시도하고 실패하면 여기서 끝냄
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """컴파일된 키워드 사전 (여러 스레드에서 함께 사용 가능)"""
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = True,
+                 word_boundary: bool = True, plurals: bool = False,
+                 hangul_boundary: bool = False):
+        """
+        Args:
+            keywords: 찾을 키워드 (여러 단어 가능)
+            ignore_case: 대소문자 무시 여부
+            word_boundary: 영문/숫자 단어 중간에서 시작하거나 끝나는 등장은 제외할지 여부
+            plurals: 영문 복수형(-s, -es)도 같은 키워드로 볼지 여부
+            hangul_boundary: 한글 단어 중간의 등장도 제외할지 여부 (뒤따르는 조사는 허용,
+                word_boundary와 함께 사용)
+        """
+        self.ignore_case = ignore_case
+        self.keywords = list(dict.fromkeys(
+            keyword for keyword in (_normalize(k, ignore_case) for k in keywords) if keyword
+        ))
+
+        pattern = f"({_trie_pattern(self.keywords)})"
+        if plurals:
+            pattern += '(?:e?s)?'
+        if word_boundary and hangul_boundary:
+            particles = '|'.join(_PARTICLES)
+            pattern = (f"(?<![{_WORD_CHARS}{_HANGUL}]){pattern}(?![{_WORD_CHARS}])"
+                       f"(?:(?![{_HANGUL}])|(?=(?:{particles})+(?![{_HANGUL}])))")
+        elif word_boundary:
+            pattern = f"(?<![{_WORD_CHARS}]){pattern}(?![{_WORD_CHARS}])"
+        # 다른 정규식에 끼워 넣을 때 쓰는 원본 (ignore_case면 IGNORECASE로 컴파일해야 함)
+        self.pattern = pattern if self.keywords else ''
+        # 대소문자를 무시할 때 위치가 필요 없는 검사는 소문자 텍스트에 _pattern을 쓰고,
+        # 원문 위치가 필요한 find_all/sub는 IGNORECASE로 컴파일한 _located_pattern을 씀
+        self._pattern: Optional[re.Pattern] = re.compile(pattern) if self.keywords else None
+        self._located_pattern = self._pattern
+        if self._pattern is not None and ignore_case:
+            self._located_pattern = re.compile(pattern, re.IGNORECASE)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _keyword(self, match: re.Match) -> str:
+        """매칭된 텍스트의 사전 키워드 (복수형 어미 제외, 공백 정규화)"""
+        return _normalize(match.group(1), self.ignore_case)
+
+    def search(self, text: str) -> bool:
+        """
+        키워드가 하나라도 있는지 여부
+
+        Args:
+            text: 검사할 텍스트
+
+        Returns:
+            키워드 등장 여부
+        """
+        if self._pattern is None:
+            return False
+        return self._pattern.search(text.lower() if self.ignore_case else text) is not None
+
+    def counts(self, text: str) -> Counter:
+        """
+        키워드별 등장 횟수
+
+        Args:
+            text: 검사할 텍스트
+
+        Returns:
+            키워드 → 횟수 Counter (사전 형태로 정규화된 키워드)
+        """
+        if self._pattern is None:
+            return Counter()
+        if self.ignore_case:
+            text = text.lower()
+        return Counter(' '.join(found.split()) for found in self._pattern.findall(text))
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        키워드 등장 위치 (앞에서부터, 겹치지 않게)
+
+        Args:
+            text: 검사할 텍스트
+
+        Yields:
+            (시작, 끝, 키워드) 튜플 - 끝은 복수형 어미를 포함한 원문 위치
+        """
+        if self._located_pattern is None:
+            return
+        for match in self._located_pattern.finditer(text):
+            yield match.start(), match.end(), self._keyword(match)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """finditer 결과 리스트"""
+        return list(self.finditer(text))
+
+    def sub(self, text: str, replace: Callable[[str, str], str]) -> str:
+        """
+        키워드 등장을 한 번에 치환
+
+        Args:
+            text: 원본 텍스트
+            replace: (매칭된 원문, 키워드)를 받아 바꿀 문자열을 반환하는 함수
+
+        Returns:
+            치환된 텍스트
+        """
+        if self._located_pattern is None:
+            return text
+        return self._located_pattern.sub(
+            lambda match: replace(match.group(0), self._keyword(match)), text
+        )
@@ -0,0 +1,106 @@
+"""
+MinHash 서명 계산
+
+문서를 단어 n-gram 집합으로 바꾼 뒤, 여러 개의 해시 순열에 대한 최솟값을
+NumPy 벡터 연산으로 한 번에 계산합니다. 두 서명의 일치 비율은 원본 문서의
+자카드 유사도 추정치가 되며, 서명을 밴드로 나눈 LSH 키로 후보를 빠르게 찾습니다.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from .simhash import normalize_text
+
+# 기본 순열 수와 LSH 밴드 수 (밴드당 8행 → 자카드 약 0.7 이상이 후보가 됨)
+DEFAULT_NUM_PERM = 128
+DEFAULT_NUM_BANDS = 16
+DEFAULT_SHINGLE_WORDS = 3
+
+# 메르센 소수 (2^31 - 1): 32비트 해시와 곱해도 uint64 범위를 넘지 않음
+_PRIME = np.uint64((1 << 31) - 1)
+_SEED = 1
+
+
+@lru_cache(maxsize=None)
+def _permutations(num_perm: int) -> tuple:
+    """고정 시드로 생성한 해시 순열 계수 (a, b)"""
+    generator = np.random.RandomState(_SEED)
+    a = generator.randint(1, (1 << 31) - 1, size=num_perm).astype(np.uint64)
+    b = generator.randint(0, (1 << 31) - 1, size=num_perm).astype(np.uint64)
+    return a, b
+
+
+def _shingle_hashes(text: str, shingle_words: int) -> np.ndarray:
+    """정규화된 텍스트의 단어 n-gram 32비트 해시 배열"""
+    words = normalize_text(text).split()
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+
+    if len(words) <= shingle_words:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {
+            ' '.join(words[i:i + shingle_words])
+            for i in range(len(words) - shingle_words + 1)
+        }
+
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+         for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+
+
+def minhash_signature(text: str, num_perm: int = DEFAULT_NUM_PERM,
+                      shingle_words: int = DEFAULT_SHINGLE_WORDS) -> np.ndarray:
+    """
+    텍스트의 MinHash 서명 계산
+
+    Args:
+        text: 원본 텍스트
+        num_perm: 해시 순열 수
+        shingle_words: 단어 n-gram 크기
+
+    Returns:
+        uint32 서명 배열 (빈 텍스트면 모든 값이 최댓값)
+    """
+    a, b = _permutations(num_perm)
+
+    hashes = _shingle_hashes(text, shingle_words)
+    if hashes.size == 0:
+        return np.full(num_perm, (1 << 31) - 1, dtype=np.uint32)
+
+    # (shingle 수, 순열 수) 행렬에서 순열별 최솟값
+    permuted = (np.outer(hashes, a) + b) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimate_jaccard(first: np.ndarray, second: np.ndarray) -> float:
+    """두 서명의 자카드 유사도 추정치"""
+    return float(np.mean(first == second))
+
+
+def lsh_band_keys(signature: np.ndarray, num_bands: int = DEFAULT_NUM_BANDS) -> List[int]:
+    """
+    서명을 밴드로 나눈 LSH 키 목록
+
+    Args:
+        signature: MinHash 서명
+        num_bands: 밴드 수 (서명 길이의 약수여야 함)
+
+    Returns:
+        밴드별 부호 있는 64비트 해시 (SQLite INTEGER에 그대로 저장 가능)
+    """
+    rows = len(signature) // num_bands
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[i * rows:(i + 1) * rows].tobytes(), digest_size=8).digest(),
+            'little',
+            signed=True
+        )
+        for i in range(num_bands)
+    ]
@@ -0,0 +1,239 @@
+"""
+SimHash 기반 유사 중복 문단 제거
+
+문단을 문자 n-gram 집합으로 바꿔 64비트 SimHash 지문을 만들고,
+해밍 거리가 임계값 이하인 문단을 중복으로 판단합니다.
+비둘기집 원리에 따라 지문을 (임계값 + 1)개 밴드로 나눠 버킷에 넣으므로
+전체 문단 수에 대해 선형 시간에 동작합니다.
+많은 문단은 simhash_many로 n-gram 추출과 비트 다수결을 한 번에 계산합니다.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FINGERPRINT_BITS = 64
+
+# 기본 문자 n-gram 크기와 중복 판정 해밍 거리
+DEFAULT_SHINGLE_SIZE = 4
+DEFAULT_MAX_DISTANCE = 8
+
+_NON_WORD = re.compile(r'[^\w가-힣]+')
+# 줄바꿈을 남기는 정규화 (여러 텍스트를 줄바꿈으로 이어 한 번에 정규화할 때 사용)
+_NON_WORD_KEEP_NEWLINE = re.compile(r'[^\w가-힣\n]+')
+
+
+def normalize_text(text: str) -> str:
+    """비교용 텍스트 정규화 (소문자, 구두점 제거, 공백 정리)"""
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+_MIX_SEED = np.uint64(0x9E3779B97F4A7C15)
+_MIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 마무리 함수 (uint64 배열, 곱셈은 2^64로 나눈 나머지)"""
+    values = (values ^ (values >> np.uint64(30))) * _MIX_MULTIPLIERS[0]
+    values = (values ^ (values >> np.uint64(27))) * _MIX_MULTIPLIERS[1]
+    return values ^ (values >> np.uint64(31))
+
+
+def _hash_windows(windows: np.ndarray) -> np.ndarray:
+    """
+    n-gram 코드 포인트 행렬의 행별 64비트 해시 (프로세스와 무관하게 고정, 열 단위로 벡터화)
+
+    Args:
+        windows: (n-gram 수, n-gram 길이) 코드 포인트 행렬
+
+    Returns:
+        n-gram별 해시 배열 (uint64)
+    """
+    hashes = np.full(len(windows), _MIX_SEED, dtype=np.uint64)
+    for column in range(windows.shape[1]):
+        hashes = _mix64(hashes + windows[:, column].astype(np.uint64))
+    return hashes
+
+
+def _codes(text: str) -> np.ndarray:
+    """텍스트의 유니코드 코드 포인트 배열"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+
+def simhash(text: str, shingle_size: int = DEFAULT_SHINGLE_SIZE) -> int:
+    """
+    텍스트의 64비트 SimHash 지문 계산
+
+    Args:
+        text: 원본 텍스트
+        shingle_size: 문자 n-gram 크기
+
+    Returns:
+        64비트 정수 지문 (정규화 후 빈 텍스트면 0)
+    """
+    normalized = normalize_text(text)
+    if not normalized:
+        return 0
+
+    codes = _codes(normalized)
+    if len(codes) <= shingle_size:
+        # 텍스트가 짧으면 전체를 하나의 특징으로 사용
+        windows = codes[None, :]
+    else:
+        windows = np.unique(np.lib.stride_tricks.sliding_window_view(codes, shingle_size), axis=0)
+    hashes = _hash_windows(windows).astype('<u8')
+    # 특징 해시를 비트 행렬로 풀어서 비트별 다수결
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(hashes)
+    packed = np.packbits(votes > 0, bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def simhash_many(texts: Sequence[str], shingle_size: int = DEFAULT_SHINGLE_SIZE) -> List[int]:
+    """
+    여러 텍스트의 SimHash 지문을 한 번에 계산 (simhash와 같은 값)
+
+    모든 텍스트를 이어 붙인 코드 포인트 배열에서 n-gram 창을 NumPy로 뽑아 중복을 없애고,
+    서로 다른 n-gram만 해시한 뒤 텍스트별 비트 다수결을 한 번에 계산합니다.
+
+    Args:
+        texts: 원본 텍스트 리스트
+        shingle_size: 문자 n-gram 크기
+
+    Returns:
+        입력 순서의 64비트 정수 지문 리스트
+    """
+    fingerprints = [0] * len(texts)
+    normalized_texts: List[str] = []
+    rows: List[int] = []
+    # 줄바꿈이 없는 텍스트는 이어 붙여 한 번에 정규화 (normalize_text와 같은 결과)
+    if not any('\n' in text for text in texts):
+        all_normalized = [line.strip() for line in
+                          _NON_WORD_KEEP_NEWLINE.sub(' ', '\n'.join(texts).lower()).split('\n')]
+    else:
+        all_normalized = [normalize_text(text) for text in texts]
+    for index, (text, normalized) in enumerate(zip(texts, all_normalized)):
+        if len(normalized) > shingle_size:
+            normalized_texts.append(normalized)
+            rows.append(index)
+        elif normalized:
+            # n-gram보다 짧은 텍스트는 전체가 하나의 특징
+            fingerprints[index] = simhash(text, shingle_size)
+    if not normalized_texts:
+        return fingerprints
+
+    codes = _codes(''.join(normalized_texts))
+    lengths = np.fromiter(map(len, normalized_texts), dtype=np.int64, count=len(normalized_texts))
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    # 텍스트 경계를 넘지 않는 창의 시작 위치와 텍스트 번호
+    windows_per_text = lengths - shingle_size + 1
+    window_texts = np.repeat(np.arange(len(normalized_texts), dtype=np.int64), windows_per_text)
+    window_starts = np.concatenate([[0], np.cumsum(windows_per_text)[:-1]])
+    positions = offsets[window_texts] + np.arange(len(window_texts)) - window_starts[window_texts]
+    windows = np.lib.stride_tricks.sliding_window_view(codes, shingle_size)[positions]
+
+    # 서로 다른 n-gram 번호 (BMP 문자만 있으면 16비트씩 묶은 정수로 빠르게 비교)
+    if shingle_size * 16 <= 64 and (not len(codes) or codes.max() < 0x10000):
+        packed = np.zeros(len(windows), dtype=np.uint64)
+        for column in range(shingle_size):
+            packed = (packed << np.uint64(16)) | windows[:, column].astype(np.uint64)
+        order = np.argsort(packed)
+        boundary = np.r_[True, packed[order][1:] != packed[order][:-1]]
+        inverse = np.empty(len(packed), dtype=np.int64)
+        inverse[order] = np.cumsum(boundary) - 1
+        first = order[boundary]
+    else:
+        _, first, inverse = np.unique(windows, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+    num_shingles = len(first)
+
+    # 서로 다른 n-gram만 해시
+    hashes = _hash_windows(windows[first]).astype('<u8')
+
+    # 텍스트 안에서 중복을 뺀 (텍스트, n-gram) 쌍
+    pairs = np.sort(window_texts * num_shingles + inverse)
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+    pair_texts, pair_shingles = np.divmod(pairs, num_shingles)
+    num_texts = len(normalized_texts)
+    counts = np.bincount(pair_texts, minlength=num_texts)
+
+    # 지문 바이트별로 (텍스트, 바이트 값) 빈도를 세고 바이트 값의 비트로 풀어 비트별 득표 계산
+    # (행렬 곱은 BLAS를 쓰도록 실수형, 득표 수는 정확히 표현됨)
+    byte_bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1,
+                              bitorder='little').astype(np.float64)
+    hash_bytes = hashes.view(np.uint8).reshape(-1, 8)[pair_shingles]
+    votes = np.empty((num_texts, FINGERPRINT_BITS), dtype=np.float64)
+    for lane in range(8):
+        histogram = np.bincount(pair_texts * 256 + hash_bytes[:, lane],
+                                minlength=num_texts * 256).reshape(num_texts, 256)
+        votes[:, lane * 8:(lane + 1) * 8] = histogram @ byte_bits
+
+    packed_bits = np.packbits(votes * 2 - counts[:, None] > 0, axis=1, bitorder='little')
+    for row, fingerprint in enumerate(packed_bits.view('<u8').reshape(-1).tolist()):
+        fingerprints[rows[row]] = fingerprint
+    return fingerprints
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 지문 사이의 해밍 거리"""
+    return bin(a ^ b).count('1')
+
+
+def _bands(fingerprint: int, num_bands: int) -> List[Tuple[int, int]]:
+    """지문을 밴드로 나눈 (밴드 번호, 밴드 값) 목록"""
+    width = FINGERPRINT_BITS // num_bands
+    bands = []
+    for band in range(num_bands):
+        shift = band * width
+        # 마지막 밴드는 남은 비트를 모두 포함
+        bits = FINGERPRINT_BITS - shift if band == num_bands - 1 else width
+        bands.append((band, (fingerprint >> shift) & ((1 << bits) - 1)))
+    return bands
+
+
+def dedupe_near_duplicates(texts: List[str], max_distance: int = DEFAULT_MAX_DISTANCE,
+                           shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                           fingerprints: Optional[List[int]] = None) -> List[str]:
+    """
+    유사 중복 문단 제거 (처음 등장한 문단 유지, 순서 보존)
+
+    Args:
+        texts: 문단 리스트
+        max_distance: 중복으로 판단할 최대 해밍 거리 (0이면 정규화 후 완전 일치만)
+        shingle_size: 문자 n-gram 크기
+        fingerprints: 미리 계산한 문단별 지문 (simhash_many 결과, None이면 여기서 계산)
+
+    Returns:
+        중복이 제거된 문단 리스트
+    """
+    num_bands = max(1, min(max_distance + 1, FINGERPRINT_BITS))
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    kept_fingerprints: List[int] = []
+    kept: List[str] = []
+
+    for position, text in enumerate(texts):
+        fingerprint = (fingerprints[position] if fingerprints is not None
+                       else simhash(text, shingle_size))
+        bands = _bands(fingerprint, num_bands)
+
+        duplicate = False
+        for key in bands:
+            for index in buckets.get(key, ()):
+                if hamming_distance(fingerprint, kept_fingerprints[index]) <= max_distance:
+                    duplicate = True
+                    break
+            if duplicate:
+                break
+
+        if duplicate:
+            continue
+
+        index = len(kept)
+        kept.append(text)
+        kept_fingerprints.append(fingerprint)
+        for key in bands:
+            buckets.setdefault(key, []).append(index)
+
+    return kept
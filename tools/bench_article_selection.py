@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+기사 본문 선택 속도 벤치마크
+
+합성 기사 페이지 묶음을 만들어 WebExtractor의 본문 요소 선택 경로별 페이지당 시간을 잽니다.
+- selector: 선택자마다 select_one을 호출하던 밀도 선택 도입 전 경로
+- select_article: 같은 선택자를 문서 한 번 순회로 평가하는 현재 선택자 경로
+- density: 모든 페이지에서 텍스트 밀도 점수를 계산하는 경로
+- find_article: 선택자 결과가 없거나 래퍼로 보일 때만 밀도 점수를 계산하는 현재 경로
+
+HTML 파싱 시간은 포함하지 않습니다.
+
+사용법:
+    python tools/bench_article_selection.py              # 1,000페이지
+    python tools/bench_article_selection.py -n 5000 -r 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractors.single.boilerplate import select_article_region
+from extractors.single.web_extractor import WebExtractor
+
+WORDS = ('market shares investors company revenue quarter growth analysts rate bank '
+         'inflation earnings stock index fund bond yield report outlook demand').split()
+
+
+# 밀도 선택 도입 전 WebExtractor._find_article의 선택자 목록
+LEGACY_SELECTORS = [
+    'article', '.article', '.articlePage', '.story-body', '.content', '.post-content',
+    '[class*="article"]', '[class*="content"]'
+]
+
+
+def legacy_select(soup: BeautifulSoup) -> Optional[Tag]:
+    """밀도 선택 도입 전 선택자 경로 (비교 기준)"""
+    for selector in LEGACY_SELECTORS:
+        element = soup.select_one(selector)
+        if element and isinstance(element, Tag):
+            return element
+    main = soup.find('main') or soup.find('div', {'role': 'main'})
+    return main if main and isinstance(main, Tag) else None
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _links(rng: random.Random, count: int) -> str:
+    return ''.join(f'<li><a href="/news/{rng.randrange(10 ** 6)}">{_sentence(rng, 6)}</a></li>'
+                   for _ in range(count))
+
+
+def make_page(rng: random.Random, layout: int) -> str:
+    """
+    합성 기사 페이지 생성
+
+    Args:
+        rng: 난수 생성기
+        layout: 0 깨끗한 <article>, 1 관련 기사 목록을 품은 .content 래퍼,
+                2 선택자에 걸리지 않는 본문, 3 <aside>를 품은 <article>
+
+    Returns:
+        HTML 문자열
+    """
+    body = ''.join(f'<p>{_sentence(rng, rng.randint(15, 40))}</p>'
+                   for _ in range(rng.randint(8, 30)))
+    header = f'<header><nav><ul>{_links(rng, rng.randint(30, 120))}</ul></nav></header>'
+    footer = f'<footer><ul>{_links(rng, rng.randint(20, 60))}</ul></footer>'
+    related = f'<div class="related"><ul>{_links(rng, rng.randint(20, 60))}</ul></div>'
+    title = f'<h1>{_sentence(rng, 8)}</h1>'
+
+    if layout == 0:
+        main = f'<article>{title}{body}</article>'
+    elif layout == 1:
+        main = f'<div class="content">{title}<div class="story">{body}</div>{related}</div>'
+    elif layout == 2:
+        main = f'<div id="story">{title}{body}</div>'
+    else:
+        main = f'<article>{title}{body}<aside>{related}</aside></article>'
+    return f'<html><head><title>t</title></head><body>{header}{main}{footer}</body></html>'
+
+
+def _time(select: Callable, soups: List[BeautifulSoup], repeat: int) -> float:
+    """가장 빠른 반복의 페이지당 시간 (ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for soup in soups:
+            select(soup)
+        best = min(best, time.perf_counter() - start)
+    return best / len(soups) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="기사 본문 선택 속도 벤치마크")
+    parser.add_argument('-n', '--pages', type=int, default=1000, help="페이지 수 (기본값: 1000)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="반복 횟수 (기본값: 3)")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    soups = [BeautifulSoup(make_page(rng, i % 4), 'html.parser') for i in range(args.pages)]
+    extractor = WebExtractor(save_to_file=False)
+
+    mismatched = sum(extractor._select_article(soup) is not legacy_select(soup) for soup in soups)
+
+    results = [
+        ('selector', _time(legacy_select, soups, args.repeat)),
+        ('select_article', _time(extractor._select_article, soups, args.repeat)),
+        ('density', _time(select_article_region, soups, args.repeat)),
+        ('find_article', _time(extractor._find_article, soups, args.repeat)),
+    ]
+    print(f"📊 {args.pages}페이지, 페이지당 시간 (최소 {args.repeat}회 중)")
+    for name, ms in results:
+        print(f"  {name:<15} {ms:7.3f} ms")
+    print(f"  선택자 결과 불일치: {mismatched}페이지")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
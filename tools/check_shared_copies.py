@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+루트와 백엔드가 함께 쓰는 모듈 사본 일치 검사
+
+백엔드(newsforge-pro/backend)는 따로 배포되므로 text_utils의 일부 모듈을 services에
+복사해 둡니다. 사본은 상대 임포트만 쓰므로 원본과 바이트 단위로 같아야 하며,
+한쪽만 고치면 이 스크립트가 0이 아닌 종료 코드로 실패합니다.
+
+사용법:
+    python tools/check_shared_copies.py          # 다른 파일이 있으면 종료 코드 1
+    python tools/check_shared_copies.py --fix    # 원본(text_utils)을 백엔드로 복사
+"""
+
+import argparse
+import difflib
+import shutil
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (원본, 백엔드 사본) 경로 쌍
+SHARED_FILES: List[Tuple[str, str]] = [
+    (f"text_utils/{name}", f"newsforge-pro/backend/services/{name}")
+    for name in ('keyword_matcher.py', 'ticker_linker.py', 'response_formatter.py', 'tickers.tsv')
+]
+
+
+def find_drift() -> List[Tuple[Path, Path]]:
+    """
+    내용이 다른 (원본, 사본) 쌍
+
+    Returns:
+        다르거나 한쪽이 없는 파일 쌍 리스트
+    """
+    drifted = []
+    for source, copy in SHARED_FILES:
+        source_path, copy_path = ROOT / source, ROOT / copy
+        if (not source_path.exists() or not copy_path.exists()
+                or source_path.read_bytes() != copy_path.read_bytes()):
+            drifted.append((source_path, copy_path))
+    return drifted
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="루트/백엔드 공유 모듈 사본 일치 검사")
+    parser.add_argument('--fix', action='store_true', help="원본(text_utils)을 백엔드 사본으로 복사")
+    args = parser.parse_args()
+
+    drifted = find_drift()
+    if not drifted:
+        print(f"✅ 공유 모듈 사본 {len(SHARED_FILES)}개가 모두 일치합니다")
+        return 0
+
+    failed = 0
+    for source_path, copy_path in drifted:
+        source_name, copy_name = source_path.relative_to(ROOT), copy_path.relative_to(ROOT)
+        if args.fix and source_path.exists():
+            shutil.copyfile(source_path, copy_path)
+            print(f"🔧 {source_name} → {copy_name} 복사")
+            continue
+        failed += 1
+        print(f"❌ {source_name}와 {copy_name}의 내용이 다릅니다")
+        if source_path.exists() and copy_path.exists():
+            sys.stdout.writelines(difflib.unified_diff(
+                source_path.read_text(encoding='utf-8').splitlines(keepends=True),
+                copy_path.read_text(encoding='utf-8').splitlines(keepends=True),
+                str(source_name), str(copy_name)
+            ))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())